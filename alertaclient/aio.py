@@ -0,0 +1,642 @@
+import logging
+import os
+import ssl
+import uuid
+from datetime import datetime
+from http import HTTPStatus
+from urllib.parse import urlencode
+
+import requests
+
+from alertaclient.api import get_auth
+from alertaclient.auth.utils import merge
+from alertaclient.exceptions import ConfigurationError, UnknownError
+from alertaclient.models.alert import Alert
+from alertaclient.models.blackout import Blackout
+from alertaclient.models.customer import Customer
+from alertaclient.models.enums import Scope
+from alertaclient.models.group import Group
+from alertaclient.models.heartbeat import Heartbeat
+from alertaclient.models.history import RichHistory
+from alertaclient.models.key import ApiKey
+from alertaclient.models.note import Note
+from alertaclient.models.permission import Permission
+from alertaclient.models.user import User
+from alertaclient.utils import DateTime, json_codec
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None  # type: ignore
+
+logger = logging.getLogger('alerta.client')
+
+
+class AsyncClient:
+    """
+    Asyncio version of alertaclient.api.Client.
+
+    Every method is a coroutine with the same arguments and return values as
+    the synchronous client. Requires the optional "aiohttp" package.
+
+        async with AsyncClient(endpoint='http://localhost:8080') as client:
+            id, alert, message = await client.send_alert(resource='web01', event='HttpError')
+    """
+
+    DEFAULT_ENDPOINT = 'http://localhost:8080'
+
+    def __init__(self, endpoint=None, key=None, secret=None, token=None, username=None, password=None, timeout=5.0,
+                 ssl_verify=True, ssl_cert=None, ssl_key=None, headers=None, debug=False,
+                 pool_maxsize=100, pool_maxsize_per_host=0):
+        self.endpoint = endpoint or os.environ.get('ALERTA_ENDPOINT', self.DEFAULT_ENDPOINT)
+
+        key = key or os.environ.get('ALERTA_API_KEY', '')
+        self.http = AsyncHTTPClient(self.endpoint, key, secret, token, username, password,
+                                    timeout, ssl_verify, ssl_cert, ssl_key, headers, debug,
+                                    pool_maxsize, pool_maxsize_per_host)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+    async def close(self):
+        await self.http.close()
+
+    # Alerts
+    async def send_alert(self, resource, event, **kwargs):
+        data = {
+            'id': kwargs.get('id'),
+            'resource': resource,
+            'event': event,
+            'environment': kwargs.get('environment'),
+            'severity': kwargs.get('severity'),
+            'correlate': kwargs.get('correlate', None) or list(),
+            'service': kwargs.get('service', None) or list(),
+            'group': kwargs.get('group'),
+            'value': kwargs.get('value'),
+            'text': kwargs.get('text'),
+            'tags': kwargs.get('tags', None) or list(),
+            'attributes': kwargs.get('attributes', None) or dict(),
+            'origin': kwargs.get('origin'),
+            'type': kwargs.get('type'),
+            'createTime': kwargs.get('create_time') or datetime.utcnow(),
+            'timeout': kwargs.get('timeout'),
+            'rawData': kwargs.get('raw_data'),
+            'customer': kwargs.get('customer')
+        }
+        r = await self.http.post('/alert', data)
+        alert = Alert.parse(r['alert']) if 'alert' in r else None
+        return r.get('id', '-'), alert, r.get('message', None)
+
+    async def send_alert_template(self, template, resource, event, **kwargs):
+        data = template.encode(resource, event, codec=self.http.codec, **kwargs)
+        r = await self.http.post('/alert', data)
+        alert = Alert.parse(r['alert']) if 'alert' in r else None
+        return r.get('id', '-'), alert, r.get('message', None)
+
+    async def get_alert(self, id):
+        return Alert.parse((await self.http.get('/alert/%s' % id))['alert'])
+
+    async def set_status(self, id, status, text='', timeout=None):
+        data = {
+            'status': status,
+            'text': text,
+            'timeout': timeout
+        }
+        return await self.http.put('/alert/%s/status' % id, data)
+
+    async def action(self, id, action, text='', timeout=None):
+        data = {
+            'action': action,
+            'text': text,
+            'timeout': timeout
+        }
+        return await self.http.put('/alert/%s/action' % id, data)
+
+    async def tag_alert(self, id, tags):
+        return await self.http.put('/alert/%s/tag' % id, {'tags': tags})
+
+    async def untag_alert(self, id, tags):
+        return await self.http.put('/alert/%s/untag' % id, {'tags': tags})
+
+    async def update_attributes(self, id, attributes):
+        data = {
+            'attributes': attributes
+        }
+        return await self.http.put('/alert/%s/attributes' % id, data)
+
+    async def delete_alert(self, id):
+        return await self.http.delete('/alert/%s' % id)
+
+    async def search(self, query=None, page=1, page_size=None):
+        return await self.get_alerts(query, page, page_size)
+
+    async def get_alerts(self, query=None, page=1, page_size=None):
+        r = await self.http.get('/alerts', query, page=page, page_size=page_size)
+        return [Alert.parse(a) for a in r['alerts']]
+
+    async def get_history(self, query=None, page=1, page_size=None):
+        r = await self.http.get('/alerts/history', query, page=page, page_size=page_size)
+        return [RichHistory.parse(a) for a in r['history']]
+
+    async def get_count(self, query=None):
+        counts = await self.http.get('/alerts/count', query)
+        return counts['total'], counts['severityCounts'], counts['statusCounts']
+
+    async def get_top10_count(self, query=None):
+        counts = await self.http.get('/alerts/top10/count', query)
+        return counts['top10']
+
+    async def get_top10_flapping(self, query=None):
+        counts = await self.http.get('/alerts/top10/flapping', query)
+        return counts['top10']
+
+    async def get_top10_standing(self, query=None):
+        counts = await self.http.get('/alerts/top10/standing', query)
+        return counts['top10']
+
+    async def get_environments(self, query=None):
+        r = await self.http.get('/environments', query)
+        return r['environments']
+
+    async def get_services(self, query=None):
+        r = await self.http.get('/services', query)
+        return r['services']
+
+    async def get_groups(self, query=None):
+        r = await self.http.get('/alerts/groups', query)
+        return r['groups']
+
+    async def get_tags(self, query=None):
+        r = await self.http.get('/alerts/tags', query)
+        return r['tags']
+
+    async def alert_note(self, id, text):
+        data = {
+            'text': text
+        }
+        r = await self.http.put(f'/alert/{id}/note', data)
+        return Note.parse(r['note'])
+
+    async def get_alert_notes(self, id, page=1, page_size=None):
+        r = await self.http.get(f'/alert/{id}/notes', page=page, page_size=page_size)
+        return [Note.parse(n) for n in r['notes']]
+
+    async def update_alert_note(self, id, note_id, text):
+        data = {
+            'text': text,
+        }
+        r = await self.http.put(f'/alert/{id}/note/{note_id}', data)
+        return Note.parse(r['note'])
+
+    async def delete_alert_note(self, id, note_id):
+        return await self.http.delete(f'/alert/{id}/note/{note_id}')
+
+    # Blackouts
+    async def create_blackout(self, environment, service=None, resource=None, event=None, group=None, tags=None,
+                              origin=None, customer=None, start=None, duration=None, text=None):
+        data = {
+            'environment': environment,
+            'service': service or list(),
+            'resource': resource,
+            'event': event,
+            'group': group,
+            'tags': tags or list(),
+            'origin': origin,
+            'customer': customer,
+            'startTime': start,
+            'duration': duration,
+            'text': text
+        }
+        r = await self.http.post('/blackout', data)
+        return Blackout.parse(r['blackout'])
+
+    async def get_blackout(self, id):
+        return Blackout.parse((await self.http.get('/blackout/%s' % id))['blackout'])
+
+    async def get_blackouts(self, query=None):
+        r = await self.http.get('/blackouts', query)
+        return [Blackout.parse(b) for b in r['blackouts']]
+
+    async def update_blackout(self, id, **kwargs):
+        data = {
+            'customer': kwargs.get('customer'),
+            'environment': kwargs.get('environment'),
+            'service': kwargs.get('service'),
+            'resource': kwargs.get('resource'),
+            'event': kwargs.get('event'),
+            'group': kwargs.get('group'),
+            'tags': kwargs.get('tags'),
+            'origin': kwargs.get('origin'),
+            'startTime': kwargs.get('startTime'),
+            'endTime': kwargs.get('endTime'),
+            'text': kwargs.get('text'),
+        }
+
+        r = await self.http.put(f'/blackout/{id}', data)
+        return Blackout.parse(r['blackout'])
+
+    async def delete_blackout(self, id):
+        return await self.http.delete('/blackout/%s' % id)
+
+    # Customers
+    async def create_customer(self, customer, match):
+        data = {
+            'customer': customer,
+            'match': match
+        }
+        r = await self.http.post('/customer', data)
+        return Customer.parse(r['customer'])
+
+    async def get_customer(self, id):
+        return Customer.parse((await self.http.get('/customer/%s' % id))['customer'])
+
+    async def get_customers(self, query=None):
+        r = await self.http.get('/customers', query)
+        return [Customer.parse(c) for c in r['customers']]
+
+    async def update_customer(self, id, **kwargs):
+        data = {
+            'match': kwargs.get('match'),
+            'customer': kwargs.get('customer')
+        }
+        r = await self.http.put(f'/customer/{id}', data)
+        return Customer.parse(r['customer'])
+
+    async def delete_customer(self, id):
+        return await self.http.delete('/customer/%s' % id)
+
+    # Heartbeats
+    async def heartbeat(self, origin, tags=None, attributes=None, timeout=None, customer=None):
+        data = {
+            'origin': origin,
+            'tags': tags or list(),
+            'attributes': attributes or dict(),
+            'timeout': timeout,
+            'createTime': datetime.utcnow(),
+            'customer': customer
+        }
+        r = await self.http.post('/heartbeat', data)
+        return Heartbeat.parse(r['heartbeat'])
+
+    async def get_heartbeat(self, id):
+        return Heartbeat.parse((await self.http.get('/heartbeat/%s' % id))['heartbeat'])
+
+    async def get_heartbeats(self, query=None):
+        r = await self.http.get('/heartbeats', query)
+        return [Heartbeat.parse(hb) for hb in r['heartbeats']]
+
+    async def delete_heartbeat(self, id):
+        return await self.http.delete('/heartbeat/%s' % id)
+
+    # API Keys
+    async def create_key(self, username, scopes=None, expires=None, text='', customer=None, **kwargs):
+        data = {
+            'user': username,
+            'scopes': scopes or list(),
+            'text': text,
+            'customer': customer,
+            'key': kwargs.get('key')
+        }
+        if expires:
+            data['expireTime'] = DateTime.iso8601(expires)
+        r = await self.http.post('/key', data)
+        return ApiKey.parse(r['data'])
+
+    async def get_key(self, id):
+        return ApiKey.parse((await self.http.get('/key/%s' % id))['key'])
+
+    async def get_keys(self, query=None):
+        r = await self.http.get('/keys', query)
+        return [ApiKey.parse(k) for k in r['keys']]
+
+    async def update_key(self, id, **kwargs):
+        data = {
+            'scopes': kwargs.get('scopes'),
+            'text': kwargs.get('text'),
+            'expireTime': kwargs.get('expireTime'),
+            'customer': kwargs.get('customer')
+        }
+        r = await self.http.put(f'/key/{id}', data)
+        return ApiKey.parse(r['key'])
+
+    async def delete_key(self, id):
+        return await self.http.delete('/key/%s' % id)
+
+    # Permissions
+    async def create_perm(self, role, scopes=None):
+        data = {
+            'match': role,
+            'scopes': scopes or list()
+        }
+        r = await self.http.post('/perm', data)
+        return Permission.parse(r['permission'])
+
+    async def get_perm(self, id):
+        return Permission.parse((await self.http.get('/perm/%s' % id))['perm'])
+
+    async def get_perms(self, query=None):
+        r = await self.http.get('/perms', query)
+        return [Permission.parse(p) for p in r['permissions']]
+
+    async def update_perm(self, id, **kwargs):
+        data = {
+            'match': kwargs.get('match'),  # role
+            'scopes': kwargs.get('scopes')
+        }
+        r = await self.http.put(f'/perm/{id}', data)
+        return Permission.parse(r['permission'])
+
+    async def delete_perm(self, id):
+        return await self.http.delete('/perm/%s' % id)
+
+    async def get_scopes(self):
+        r = await self.http.get('/scopes')
+        return [Scope(s) for s in r['scopes']]
+
+    # Users
+    async def signup(self, name, email, password, status, attributes=None, text=''):
+        data = {
+            'name': name,
+            'email': email,
+            'password': password,
+            'status': status,
+            'attributes': attributes or dict(),
+            'text': text
+        }
+        return await self.http.post('/auth/signup', data)
+
+    async def create_user(self, name, email, password, status, roles=None, attributes=None, text='', email_verified=False):
+        data = {
+            'name': name,
+            'email': email,
+            'password': password,
+            'status': status,
+            'roles': roles or list(),
+            'attributes': attributes or dict(),
+            'text': text,
+            'email_verified': email_verified
+        }
+        r = await self.http.post('/user', data)
+        return User.parse(r['user'])
+
+    async def get_user(self, id):
+        return User.parse((await self.http.get('/user/%s' % id))['user'])
+
+    async def get_user_groups(self, id):
+        r = await self.http.get(f'/user/{id}/groups')
+        return [Group.parse(g) for g in r['groups']]
+
+    async def get_me(self):
+        return User.parse((await self.http.get('/user/me'))['user'])
+
+    async def get_me_attributes(self):
+        return (await self.http.get('/user/me/attributes'))['attributes']
+
+    async def get_users(self, query=None):
+        r = await self.http.get('/users', query)
+        return [User.parse(u) for u in r['users']]
+
+    async def update_user(self, id, **kwargs):
+        data = {
+            'name': kwargs.get('name'),
+            'email': kwargs.get('email'),
+            'password': kwargs.get('password'),
+            'status': kwargs.get('status'),
+            'roles': kwargs.get('roles', None) or list(),
+            'attributes': kwargs.get('attributes', None) or dict(),
+            'text': kwargs.get('text'),
+            'email_verified': kwargs.get('email_verified')
+        }
+        r = await self.http.put(f'/user/{id}', data)
+        return User.parse(r['user'])
+
+    async def update_me(self, **kwargs):
+        data = {
+            'name': kwargs.get('name'),
+            'email': kwargs.get('email'),
+            'password': kwargs.get('password'),
+            'status': kwargs.get('status'),
+            'attributes': kwargs.get('attributes', None) or dict(),
+            'text': kwargs.get('text')
+        }
+        r = await self.http.put('/user/me', data)
+        return User.parse(r['user'])
+
+    async def update_user_attributes(self, id, attributes):
+        data = {
+            'attributes': attributes
+        }
+        return await self.http.put('/user/%s/attributes' % id, data)
+
+    async def update_me_attributes(self, attributes):
+        data = {
+            'attributes': attributes
+        }
+        return await self.http.put('/user/me/attributes', data)
+
+    async def delete_user(self, id):
+        return await self.http.delete('/user/%s' % id)
+
+    # Auth
+    async def login(self, username, password):
+        data = {
+            'username': username,
+            'password': password
+        }
+        return await self.http.post('/auth/login', data)
+
+    async def token(self, provider, data):
+        if provider in ['azure', 'github', 'gitlab', 'google', 'openid']:
+            return await self.http.post(f'/auth/{provider}', data)
+
+    async def userinfo(self):
+        return await self.http.get('/userinfo')
+
+    async def config(self):
+        return await self.http.get('/config')
+
+    # Groups
+    async def create_group(self, name, text):
+        data = {
+            'name': name,
+            'text': text
+        }
+        r = await self.http.post('/group', data)
+        return Group.parse(r['group'])
+
+    async def get_group(self, id):
+        return Group.parse((await self.http.get('/group/%s' % id))['group'])
+
+    async def get_group_users(self, id):
+        r = await self.http.get(f'/group/{id}/users')
+        return [User.parse(u) for u in r['users']]
+
+    async def get_users_groups(self, query=None):
+        r = await self.http.get('/groups', query)
+        return [Group.parse(g) for g in r['groups']]
+
+    async def update_group(self, id, **kwargs):
+        data = {
+            'name': kwargs.get('name'),
+            'text': kwargs.get('text')
+        }
+        r = await self.http.put(f'/group/{id}', data)
+        return Group.parse(r['group'])
+
+    async def add_user_to_group(self, group_id, user_id):
+        return await self.http.put(f'/group/{group_id}/user/{user_id}')
+
+    async def remove_user_from_group(self, group_id, user_id):
+        return await self.http.delete(f'/group/{group_id}/user/{user_id}')
+
+    async def delete_group(self, id):
+        return await self.http.delete('/group/%s' % id)
+
+    # Management
+    async def mgmt_status(self):
+        return await self.http.get('/management/status')
+
+    async def housekeeping(self, expired_delete_hours=None, info_delete_hours=None):
+        # This endpoint isn't currently JSON-encoded.
+        query = list()
+        if expired_delete_hours is not None:
+            query.append(('expired', expired_delete_hours))
+        if info_delete_hours is not None:
+            query.append(('info', info_delete_hours))
+        status, content = await self.http.request('GET', '/management/housekeeping', query)
+        if status != 200:
+            raise UnknownError(content.decode('utf-8', 'replace'))
+
+
+class AsyncHTTPClient:
+
+    DEFAULT_PAGE_NUMBER = 1
+    DEFAULT_PAGE_SIZE = 50
+
+    def __init__(
+        self,
+        endpoint,
+        key=None,
+        secret=None,
+        token=None,
+        username=None,
+        password=None,
+        timeout=30.0,
+        ssl_verify=True,
+        ssl_cert=None,
+        ssl_key=None,
+        headers=None,
+        debug=False,
+        pool_maxsize=100,
+        pool_maxsize_per_host=0,
+        codec=None,
+    ):
+        if aiohttp is None:
+            raise ConfigurationError('AsyncClient requires the "aiohttp" package. Install it with: pip install alerta[async]')
+
+        self.endpoint = endpoint
+        self.auth = get_auth(key, secret, token, username, password)
+        self.timeout = timeout
+
+        if isinstance(ssl_verify, str):
+            self.ssl = ssl.create_default_context(cafile=ssl_verify)
+        elif ssl_verify:
+            self.ssl = ssl.create_default_context()
+        else:
+            self.ssl = ssl._create_unverified_context()
+        if ssl_cert:
+            self.ssl.load_cert_chain(ssl_cert, ssl_key)
+
+        # upper bound on in-flight connections shared by every coroutine using this client
+        self.pool_maxsize = pool_maxsize
+        self.pool_maxsize_per_host = pool_maxsize_per_host
+        self.session = None
+
+        self.headers = dict(headers or {})
+        merge(self.headers, {'Content-Type': 'application/json'})
+
+        self.debug = debug
+        self.codec = codec or json_codec
+
+    def _get_session(self):
+        # aiohttp sessions must be created from within a running event loop
+        if self.session is None or self.session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.pool_maxsize,
+                limit_per_host=self.pool_maxsize_per_host,
+                ssl=self.ssl
+            )
+            self.session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.timeout)
+            )
+        return self.session
+
+    async def close(self):
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+
+    def _headers(self, method, url, body):
+        headers = dict(self.headers, **{'X-Request-ID': str(uuid.uuid4())})
+        if self.auth is None:
+            return headers
+        # let the "requests" auth classes (API key, bearer token, HMAC, basic) sign the request
+        prepared = requests.Request(method, url, data=body, headers=headers).prepare()
+        return self.auth(prepared).headers
+
+    async def request(self, method, path, query=None, data=None):
+        url = self.endpoint + path
+        if query:
+            url += '?' + urlencode(query, doseq=True)
+        if isinstance(data, bytes):
+            body = data
+        else:
+            body = self.codec.encode(data) if data is not None or method in ['POST', 'PUT'] else None
+
+        session = self._get_session()
+        async with session.request(method, url, data=body, headers=self._headers(method, url, body)) as response:
+            return response.status, await response.read()
+
+    async def get(self, path, query=None, **kwargs):
+        query = list(query or [])
+        if 'page' in kwargs:
+            query.append(('page', kwargs.get('page') or self.DEFAULT_PAGE_NUMBER))
+        if 'page_size' in kwargs:
+            query.append(('page-size', kwargs.get('page_size') or self.DEFAULT_PAGE_SIZE))
+
+        status, content = await self.request('GET', path, query)
+        return self._handle_error(status, content)
+
+    async def post(self, path, data=None):
+        status, content = await self.request('POST', path, data=data)
+        return self._handle_error(status, content)
+
+    async def put(self, path, data=None):
+        status, content = await self.request('PUT', path, data=data)
+        return self._handle_error(status, content)
+
+    async def delete(self, path):
+        status, content = await self.request('DELETE', path)
+        return self._handle_error(status, content)
+
+    def _handle_error(self, status_code, content):
+        if self.debug:
+            print(f'\nbody: {content.decode("utf-8", "replace")}')
+        try:
+            resp = self.codec.loads(content)
+        except ValueError:
+            try:
+                reason = HTTPStatus(status_code).phrase
+            except ValueError:
+                reason = ''
+            raise UnknownError(f'{status_code} {reason}: response is not a JSON object', status_code=status_code)
+        status = resp.get('status', None)
+        if status == 'ok':
+            return resp
+        if status == 'error':
+            raise UnknownError(resp['message'], status_code=status_code)
+        return resp
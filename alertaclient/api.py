@@ -1,17 +1,28 @@
-import json
+import gzip
 import logging
 import os
+import socket
+import threading
+import time
 import uuid
 from datetime import datetime
 from http.client import HTTPConnection
 from urllib.parse import urlencode
 
 import requests
+from requests.adapters import DEFAULT_POOLBLOCK, DEFAULT_POOLSIZE, HTTPAdapter
 from requests.auth import AuthBase, HTTPBasicAuth
 from requests_hawk import HawkAuth
+from urllib3.connection import HTTPConnection as PooledHTTPConnection
+from urllib3.connection import HTTPSConnection as PooledHTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
 
 from alertaclient.auth.utils import merge
+from alertaclient.balancer import Balancer, parse_endpoints
+from alertaclient.bulk import (DEFAULT_CONCURRENCY, BulkResult, BulkResults,
+                               imap_ordered)
 from alertaclient.exceptions import UnknownError
+from alertaclient.metrics import Hooks, RequestInfo
 from alertaclient.models.alert import Alert
 from alertaclient.models.blackout import Blackout
 from alertaclient.models.customer import Customer
@@ -23,7 +34,11 @@ from alertaclient.models.key import ApiKey
 from alertaclient.models.note import Note
 from alertaclient.models.permission import Permission
 from alertaclient.models.user import User
-from alertaclient.utils import CustomJsonEncoder, DateTime
+from alertaclient.pager import Pager
+from alertaclient.ratelimit import RateLimiter
+from alertaclient.retry import Retry, RetryStats
+from alertaclient.transport import Http2Session
+from alertaclient.utils import DateTime, json_codec
 
 logger = logging.getLogger('alerta.client')
 
@@ -33,15 +48,23 @@ class Client:
     DEFAULT_ENDPOINT = 'http://localhost:8080'
 
     def __init__(self, endpoint=None, key=None, secret=None, token=None, username=None, password=None, timeout=5.0,
-                 ssl_verify=True, ssl_cert=None, ssl_key=None, headers=None, debug=False):
-        self.endpoint = endpoint or os.environ.get('ALERTA_ENDPOINT', self.DEFAULT_ENDPOINT)
+                 ssl_verify=True, ssl_cert=None, ssl_key=None, headers=None, debug=False,
+                 pool_connections=DEFAULT_POOLSIZE, pool_maxsize=DEFAULT_POOLSIZE, pool_block=DEFAULT_POOLBLOCK,
+                 keepalive=None, retry=None, compression=False, compression_threshold=1024, circuit_breaker=None,
+                 balancer='round-robin', http2=False, rate_limit=None):
+        self.endpoints = parse_endpoints(endpoint or os.environ.get('ALERTA_ENDPOINT', self.DEFAULT_ENDPOINT))
+        self.endpoint = self.endpoints[0]
 
         if debug:
             HTTPConnection.debuglevel = 1
 
         key = key or os.environ.get('ALERTA_API_KEY', '')
-        self.http = HTTPClient(self.endpoint, key, secret, token, username, password,
-                               timeout, ssl_verify, ssl_cert, ssl_key, headers, debug)
+        self.http = HTTPClient(self.endpoints, key, secret, token, username, password,
+                               timeout, ssl_verify, ssl_cert, ssl_key, headers, debug,
+                               pool_connections, pool_maxsize, pool_block, keepalive, retry,
+                               compression=compression, compression_threshold=compression_threshold,
+                               circuit_breaker=circuit_breaker, balancer=balancer, http2=http2,
+                               rate_limit=rate_limit)
 
     # Alerts
     def send_alert(self, resource, event, **kwargs):
@@ -60,15 +83,62 @@ class Client:
             'attributes': kwargs.get('attributes', None) or dict(),
             'origin': kwargs.get('origin'),
             'type': kwargs.get('type'),
-            'createTime': datetime.utcnow(),
+            'createTime': kwargs.get('create_time') or datetime.utcnow(),
             'timeout': kwargs.get('timeout'),
             'rawData': kwargs.get('raw_data'),
             'customer': kwargs.get('customer')
         }
-        r = self.http.post('/alert', data)
+        r = self.http.post('/alert', data, idempotent=True)
+        alert = Alert.parse(r['alert']) if 'alert' in r else None
+        return r.get('id', '-'), alert, r.get('message', None)
+
+    def send_alert_template(self, template, resource, event, **kwargs):
+        """Send an alert using the pre-encoded static fields of an AlertTemplate."""
+        data = template.encode(resource, event, codec=self.http.codec, **kwargs)
+        r = self.http.post('/alert', data, idempotent=True)
         alert = Alert.parse(r['alert']) if 'alert' in r else None
         return r.get('id', '-'), alert, r.get('message', None)
 
+    def send_alerts(self, alerts, concurrency=DEFAULT_CONCURRENCY):
+        """
+        Send many alerts, either dicts of send_alert() arguments or Alert
+        objects, with up to concurrency requests in flight. Returns results
+        in input order; a failed alert is returned with an error, not raised.
+        """
+        def send(alert):
+            if isinstance(alert, Alert):
+                alert = {
+                    'id': alert.id,
+                    'resource': alert.resource,
+                    'event': alert.event,
+                    'environment': alert.environment,
+                    'severity': alert.severity,
+                    'correlate': alert.correlate,
+                    'service': alert.service,
+                    'group': alert.group,
+                    'value': alert.value,
+                    'text': alert.text,
+                    'tags': alert.tags,
+                    'attributes': alert.attributes,
+                    'origin': alert.origin,
+                    'type': alert.event_type,
+                    'create_time': alert.create_time,
+                    'timeout': alert.timeout,
+                    'raw_data': alert.raw_data,
+                    'customer': alert.customer
+                }
+            return self.send_alert(**alert)
+
+        results = BulkResults()
+        start = time.perf_counter()
+        for index, (item, r, error, latency) in enumerate(imap_ordered(send, alerts, concurrency)):
+            id, alert, message = r or (None, None, None)
+            result = BulkResult(index, item, id, alert, message, error, latency)
+            results.append(result)
+            results.stats.record(result)
+        results.stats.elapsed = time.perf_counter() - start
+        return results
+
     def get_alert(self, id):
         return Alert.parse(self.http.get('/alert/%s' % id)['alert'])
 
@@ -110,10 +180,25 @@ class Client:
         r = self.http.get('/alerts', query, page=page, page_size=page_size)
         return [Alert.parse(a) for a in r['alerts']]
 
+    def iter_alerts(self, query=None, page_size=None, read_ahead=0, reverse=False):
+        """
+        Yield every alert matching query, fetching page_size alerts at a time
+        as they are needed. See HTTPClient.get_pages() for read_ahead and
+        reverse.
+        """
+        for alerts in self.http.get_pages('/alerts', 'alerts', query, page_size, read_ahead, reverse):
+            for a in alerts:
+                yield Alert.parse(a)
+
     def get_history(self, query=None, page=1, page_size=None):
         r = self.http.get('/alerts/history', query, page=page, page_size=page_size)
         return [RichHistory.parse(a) for a in r['history']]
 
+    def iter_history(self, query=None, page_size=None, read_ahead=0):
+        for history in self.http.get_pages('/alerts/history', 'history', query, page_size, read_ahead):
+            for h in history:
+                yield RichHistory.parse(h)
+
     def get_count(self, query=None):
         counts = self.http.get('/alerts/count', query)
         return counts['total'], counts['severityCounts'], counts['statusCounts']
@@ -251,7 +336,7 @@ class Client:
             'createTime': datetime.utcnow(),
             'customer': customer
         }
-        r = self.http.post('/heartbeat', data)
+        r = self.http.post('/heartbeat', data, idempotent=True)
         return Heartbeat.parse(r['heartbeat'])
 
     def get_heartbeat(self, id):
@@ -261,6 +346,11 @@ class Client:
         r = self.http.get('/heartbeats', query)
         return [Heartbeat.parse(hb) for hb in r['heartbeats']]
 
+    def iter_heartbeats(self, query=None, page_size=None, read_ahead=0):
+        for heartbeats in self.http.get_pages('/heartbeats', 'heartbeats', query, page_size, read_ahead):
+            for hb in heartbeats:
+                yield Heartbeat.parse(hb)
+
     def delete_heartbeat(self, id):
         return self.http.delete('/heartbeat/%s' % id)
 
@@ -514,6 +604,80 @@ class TokenAuth(AuthBase):
         return r
 
 
+class KeepAliveAdapter(HTTPAdapter):
+    """
+    HTTP adapter that enables TCP keep-alive probes on pooled connections so
+    idle connections are not silently dropped by firewalls or load balancers.
+    """
+
+    __attrs__ = HTTPAdapter.__attrs__ + ['keepalive']
+
+    def __init__(self, keepalive=None, **kwargs):
+        self.keepalive = keepalive
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        if self.keepalive:
+            kwargs['socket_options'] = self.socket_options(self.keepalive)
+        super().init_poolmanager(*args, **kwargs)
+        # time DNS lookup, TCP connect and TLS handshake of new connections
+        self.poolmanager.pool_classes_by_scheme = {
+            'http': TimedHTTPConnectionPool,
+            'https': TimedHTTPSConnectionPool
+        }
+
+    @staticmethod
+    def socket_options(keepalive):
+        options = PooledHTTPConnection.default_socket_options + [(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)]
+        idle = int(keepalive)
+        if hasattr(socket, 'TCP_KEEPIDLE'):
+            options.append((socket.IPPROTO_TCP, socket.TCP_KEEPIDLE, idle))
+        elif hasattr(socket, 'TCP_KEEPALIVE'):  # macOS
+            options.append((socket.IPPROTO_TCP, socket.TCP_KEEPALIVE, idle))
+        if hasattr(socket, 'TCP_KEEPINTVL'):
+            options.append((socket.IPPROTO_TCP, socket.TCP_KEEPINTVL, max(1, idle // 3)))
+        return options
+
+
+connect_timer = threading.local()
+
+
+class TimedHTTPConnection(PooledHTTPConnection):
+
+    def connect(self):
+        start = time.perf_counter()
+        super().connect()
+        connect_timer.elapsed = getattr(connect_timer, 'elapsed', 0.0) + time.perf_counter() - start
+
+
+class TimedHTTPSConnection(PooledHTTPSConnection):
+
+    def connect(self):
+        start = time.perf_counter()
+        super().connect()
+        connect_timer.elapsed = getattr(connect_timer, 'elapsed', 0.0) + time.perf_counter() - start
+
+
+class TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = TimedHTTPConnection
+
+
+class TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = TimedHTTPSConnection
+
+
+def get_auth(key=None, secret=None, token=None, username=None, password=None):
+    if username:
+        return HTTPBasicAuth(username, password)
+    elif secret:
+        return HawkAuth(id=key, key=secret)  # HMAC
+    elif key:
+        return ApiKeyAuth(api_key=key)
+    elif token:
+        return TokenAuth(token)
+    return None
+
+
 class HTTPClient:
 
     DEFAULT_PAGE_NUMBER = 1
@@ -533,86 +697,245 @@ class HTTPClient:
         ssl_key=None,
         headers=None,
         debug=False,
+        pool_connections=DEFAULT_POOLSIZE,
+        pool_maxsize=DEFAULT_POOLSIZE,
+        pool_block=DEFAULT_POOLBLOCK,
+        keepalive=None,
+        retry=None,
+        codec=None,
+        compression=False,
+        compression_threshold=1024,
+        circuit_breaker=None,
+        balancer='round-robin',
+        http2=False,
+        rate_limit=None,
     ):
-        self.endpoint = endpoint
-        self.auth = None
-
-        if username:
-            self.auth = HTTPBasicAuth(username, password)
-        elif secret:
-            self.auth = HawkAuth(id=key, key=secret)  # HMAC
-        elif key:
-            self.auth = ApiKeyAuth(api_key=key)
-        elif token:
-            self.auth = TokenAuth(token)
+        endpoints = parse_endpoints(endpoint)
+        self.endpoint = endpoints[0]
+        self.auth = get_auth(key, secret, token, username, password)
 
         self.timeout = timeout
-        self.session = requests.Session()
-        self.session.verify = ssl_verify  # or use REQUESTS_CA_BUNDLE env var
-
-        if ssl_cert:
-            self.session.cert = (ssl_cert, ssl_key)
-
-        self.headers = headers or dict()
+        self.pool_maxsize = pool_maxsize
+        if http2:
+            # one multiplexed connection per host replaces the connection pool
+            self.session = Http2Session(
+                verify=ssl_verify,
+                cert=(ssl_cert, ssl_key) if ssl_cert else None,
+                max_connections=pool_maxsize,
+                keepalive_expiry=keepalive,
+                prior_knowledge=http2 == 'prior-knowledge'
+            )
+        else:
+            self.session = requests.Session()
+            self.session.verify = ssl_verify  # or use REQUESTS_CA_BUNDLE env var
+
+            # pool_connections is the number of per-host pools to cache, pool_maxsize the
+            # number of connections kept open to each host and pool_block whether to wait
+            # for a free connection instead of opening (and discarding) an extra one
+            adapter = KeepAliveAdapter(
+                keepalive=keepalive,
+                pool_connections=pool_connections,
+                pool_maxsize=pool_maxsize,
+                pool_block=pool_block
+            )
+            self.session.mount('http://', adapter)
+            self.session.mount('https://', adapter)
+
+            if ssl_cert:
+                self.session.cert = (ssl_cert, ssl_key)
+
+        self.retry = Retry.from_value(retry)
+        self.retry_stats = RetryStats()
+        self.circuit_breaker = circuit_breaker
+        self.rate_limiter = RateLimiter.from_value(rate_limit)
+
+        # spread requests across multiple endpoints, if configured
+        self.balancer = None
+        if len(endpoints) > 1:
+            if isinstance(balancer, Balancer):
+                self.balancer = balancer
+            else:
+                self.balancer = Balancer(endpoints, strategy=balancer, probe=self.health_check)
+
+        self.codec = codec or json_codec
+        self.hooks = Hooks()
+
+        # gzip request bodies of at least compression_threshold bytes
+        self.compression = compression
+        self.compression_threshold = compression_threshold
+
+        self.headers = dict(headers or {})
         merge(self.headers, self.default_headers())
 
         self.debug = debug
 
+    def health_check(self, url):
+        return self.session.get(url, auth=self.auth, timeout=self.timeout).status_code == 200
+
     @staticmethod
     def default_headers():
         return {
-            'X-Request-ID': str(uuid.uuid4()),
             'Content-Type': 'application/json'
         }
 
     def get(self, path, query=None, **kwargs):
-        query = query or []
+        query = list(query or [])
         if 'page' in kwargs:
             query.append(('page', kwargs.get('page') or self.DEFAULT_PAGE_NUMBER))
         if 'page_size' in kwargs:
             query.append(('page-size', kwargs.get('page_size') or self.DEFAULT_PAGE_SIZE))
 
-        url = self.endpoint + path + '?' + urlencode(query, doseq=True)
-        try:
-            response = self.session.get(url, headers=self.headers, auth=self.auth, timeout=self.timeout)
-        except requests.exceptions.RequestException:
-            raise
-        return self._handle_error(response)
+        return self.request('GET', path + '?' + urlencode(query, doseq=True))
 
-    def post(self, path, data=None):
-        url = self.endpoint + path
-        try:
-            response = self.session.post(url, data=json.dumps(data, cls=CustomJsonEncoder),
-                                         headers=self.headers, auth=self.auth, timeout=self.timeout)
-        except requests.exceptions.RequestException:
-            raise
-        return self._handle_error(response)
+    def get_pages(self, path, key, query=None, page_size=None, read_ahead=0, reverse=False):
+        """
+        Iterate over the list of items under key from each page of a paged
+        resource, fetching pages only as they are needed, so memory use does
+        not grow with the result set. read_ahead is the number of pages to
+        fetch in the background (True for one). See Pager for reverse.
+        """
+        return iter(Pager(self, path, key, query, page_size, prefetch=read_ahead, reverse=reverse))
+
+    def post(self, path, data=None, idempotent=False):
+        return self.request('POST', path, data, idempotent=idempotent)
 
     def put(self, path, data=None):
-        url = self.endpoint + path
+        return self.request('PUT', path, data)
+
+    def delete(self, path):
+        return self.request('DELETE', path)
+
+    def request(self, method, path, data=None, idempotent=None):
+        headers = dict(self.headers, **{'X-Request-ID': str(uuid.uuid4())})
+        info = RequestInfo(method, path, request_id=headers['X-Request-ID'])
+        if method in ['POST', 'PUT']:
+            body, headers = self._encode(data, headers)
+            info.bytes_sent = len(body)
+        else:
+            body = None
+        self.hooks.before_request(info)
+
+        start = time.perf_counter()
         try:
-            response = self.session.put(url, data=json.dumps(data, cls=CustomJsonEncoder),
-                                        headers=self.headers, auth=self.auth, timeout=self.timeout)
-        except requests.exceptions.RequestException:
+            response = self._checked_request(method, path, body, headers, idempotent, info)
+            resp = self._handle_error(response, info)
+        except Exception as e:
+            info.error = e
+            info.timings['total'] = time.perf_counter() - start
+            self.hooks.on_error(info)
             raise
-        return self._handle_error(response)
+        info.timings['total'] = time.perf_counter() - start
+        self.hooks.after_response(info)
+        return resp
 
-    def delete(self, path):
-        url = self.endpoint + path
+    def _encode(self, data, headers):
+        body = data if isinstance(data, bytes) else self.codec.encode(data)  # bytes are already encoded
+        if not self.compression or len(body) < self.compression_threshold:
+            return body, headers
 
+        compressed = gzip.compress(body, compresslevel=6)
+        if len(compressed) >= len(body):
+            return body, headers
+        if self.debug:
+            print('\nrequest body: {} bytes, {} bytes gzip on wire ({:.0%} saved)'.format(
+                len(body), len(compressed), 1 - len(compressed) / len(body)))
+        headers['Content-Encoding'] = 'gzip'
+        return compressed, headers
+
+    def _send(self, method, path, data, headers, info):
+        if self.rate_limiter:
+            info.timings['throttle'] += self.rate_limiter.acquire(method, path)
+        node = self.balancer.acquire() if self.balancer else None
+        info.url = (node.url if node else self.endpoint) + path
+
+        connect_timer.elapsed = 0.0
+        start = time.perf_counter()
         try:
-            response = self.session.delete(url, headers=self.headers, auth=self.auth, timeout=self.timeout)
+            response = self.session.request(method, info.url, data=data, headers=headers,
+                                            auth=self.auth, timeout=self.timeout, stream=True)
+            headers_received = time.perf_counter()
+            response.content  # read (and decompress) body so the connection is returned to the pool
         except requests.exceptions.RequestException:
+            if node:
+                self.balancer.release(node, failed=True)
             raise
-        return self._handle_error(response)
-
-    def _handle_error(self, response):
+        finished = time.perf_counter()
+        if node:
+            self.balancer.release(node, latency=finished - start, failed=response.status_code >= 500)
+
+        info.status = response.status_code
+        info.bytes_received = response.raw.tell() if response.raw is not None else len(response.content)
+        info.timings['connect'] = connect_timer.elapsed
+        info.timings['ttfb'] = headers_received - start - connect_timer.elapsed
+        info.timings['download'] = finished - headers_received
+        return response
+
+    def _checked_request(self, method, path, data=None, headers=None, idempotent=None, info=None):
+        if not self.circuit_breaker:
+            return self._request(method, path, data, headers, idempotent, info)
+
+        self.circuit_breaker.before_request()
+        try:
+            response = self._request(method, path, data, headers, idempotent, info)
+        except requests.exceptions.RequestException:
+            self.circuit_breaker.record_failure()
+            raise
+        if response.status_code >= 500:
+            self.circuit_breaker.record_failure()
+        else:
+            self.circuit_breaker.record_success()
+        return response
+
+    def _request(self, method, path, data=None, headers=None, idempotent=None, info=None):
+        info = info or RequestInfo(method, path)
+        retryable = idempotent or self.retry.is_retryable_method(method)
+        attempt = 0
+        while True:
+            info.attempts = attempt + 1
+            try:
+                response = self._send(method, path, data, headers or self.headers, info)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                if not retryable or attempt >= self.retry.total:
+                    self.retry_stats.record_request(attempt, exhausted=retryable and attempt > 0)
+                    raise
+                reason = type(e).__name__
+                delay = self.retry.backoff(attempt)
+            else:
+                delay = None
+                if retryable and attempt < self.retry.total and self.retry.is_retryable_status(response.status_code):
+                    delay = self.retry.sleep_time(attempt, response)
+                if delay is None:
+                    exhausted = attempt > 0 and self.retry.is_retryable_status(response.status_code)
+                    self.retry_stats.record_request(attempt, exhausted=exhausted)
+                    return response
+                reason = str(response.status_code)
+
+            attempt += 1
+            self.retry_stats.record_retry(reason)
+            logger.debug('Retrying %s %s in %.2fs (attempt %d of %d, reason %s)',
+                         method, info.url, delay, attempt, self.retry.total, reason)
+            time.sleep(delay)
+
+    def _handle_error(self, response, info=None):
         if self.debug:
             print(f'\nbody: {response.text}')
-        resp = response.json()
+            encoding = response.headers.get('Content-Encoding')
+            if encoding in ['gzip', 'deflate'] and info is not None:
+                wire, size = info.bytes_received, len(response.content)
+                print('response body: {} bytes {} on wire, {} bytes decoded ({:.0%} saved)'.format(
+                    wire, encoding, size, 1 - wire / size if size else 0))
+        start = time.perf_counter()
+        try:
+            resp = self.codec.loads(response.content)
+        except ValueError:
+            raise UnknownError(f'{response.status_code} {response.reason}: response is not a JSON object',
+                               status_code=response.status_code)
+        finally:
+            if info is not None:
+                info.timings['decode'] = time.perf_counter() - start
         status = resp.get('status', None)
         if status == 'ok':
             return resp
         if status == 'error':
-            raise UnknownError(resp['message'])
+            raise UnknownError(resp['message'], status_code=response.status_code)
         return resp
@@ -0,0 +1,188 @@
+import itertools
+import logging
+import random
+import threading
+import time
+
+logger = logging.getLogger('alerta.client')
+
+
+def parse_endpoints(endpoint):
+    """
+    Split a list or comma-separated string of API endpoints into a list of URLs.
+    """
+    if isinstance(endpoint, str):
+        endpoint = endpoint.split(',')
+    return [e.strip().rstrip('/') for e in endpoint or [] if e and e.strip()]
+
+
+class Node:
+
+    def __init__(self, url):
+        self.url = url
+        self.outstanding = 0
+        self.ewma = None  # seconds
+        self.consecutive_failures = 0
+        self.ejected_until = None
+        self.probing = False
+        self.requests = 0
+        self.failures = 0
+
+    def __repr__(self):
+        return 'Node(url={!r}, healthy={!r}, outstanding={!r}, ewma={!r})'.format(
+            self.url, self.healthy, self.outstanding, self.ewma)
+
+    @property
+    def healthy(self):
+        return self.ejected_until is None
+
+    def serialize(self):
+        return {
+            'url': self.url,
+            'healthy': self.healthy,
+            'outstanding': self.outstanding,
+            'ewma': self.ewma,
+            'requests': self.requests,
+            'failures': self.failures
+        }
+
+
+class RoundRobin:
+    name = 'round-robin'
+
+    def __init__(self):
+        self._counter = itertools.count()
+
+    def select(self, nodes):
+        return nodes[next(self._counter) % len(nodes)]
+
+
+class LeastOutstanding:
+    name = 'least-outstanding'
+
+    def select(self, nodes):
+        least = min(n.outstanding for n in nodes)
+        return random.choice([n for n in nodes if n.outstanding == least])
+
+
+class LatencyEWMA:
+    """
+    Pick the node with the lowest expected wait, ie. the exponentially
+    weighted moving average of its response time multiplied by the number
+    of requests it already has in flight. Nodes without a latency estimate
+    yet are tried first.
+    """
+    name = 'ewma'
+
+    def select(self, nodes):
+        untried = [n for n in nodes if n.ewma is None]
+        if untried:
+            return random.choice(untried)
+        return min(nodes, key=lambda n: n.ewma * (n.outstanding + 1))
+
+
+STRATEGIES = {
+    RoundRobin.name: RoundRobin,
+    LeastOutstanding.name: LeastOutstanding,
+    LatencyEWMA.name: LatencyEWMA
+}
+
+
+class Balancer:
+    """
+    Spread requests across several API endpoints.
+
+    A node is ejected after max_failures consecutive failures (connection
+    errors, timeouts and 5xx responses). After eject_time seconds it is
+    probed in the background with a GET of the health check path and
+    re-admitted when the probe succeeds. If every node is ejected, the
+    one that has been ejected the longest is used anyway.
+    """
+
+    HEALTH_CHECK_PATH = '/management/status'
+
+    def __init__(self, endpoints, strategy='round-robin', max_failures=3, eject_time=30.0, alpha=0.3, probe=None):
+        self.nodes = [Node(url) for url in parse_endpoints(endpoints)]
+        if not self.nodes:
+            raise ValueError('At least one endpoint is required')
+        if isinstance(strategy, str):
+            try:
+                strategy = STRATEGIES[strategy]()
+            except KeyError:
+                raise ValueError('Unknown load balancing strategy "{}". Must be one of {}'.format(
+                    strategy, ', '.join(STRATEGIES)))
+        self.strategy = strategy
+        self.max_failures = max_failures
+        self.eject_time = eject_time
+        self.alpha = alpha
+        self.probe = probe  # callable(url) -> bool
+
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return 'Balancer(strategy={!r}, nodes={!r})'.format(self.strategy.name, self.nodes)
+
+    @property
+    def healthy_nodes(self):
+        return [n for n in self.nodes if n.healthy]
+
+    def acquire(self):
+        self._start_probes()
+        with self._lock:
+            candidates = self.healthy_nodes or [min(self.nodes, key=lambda n: n.ejected_until)]
+            node = self.strategy.select(candidates)
+            node.outstanding += 1
+            node.requests += 1
+        return node
+
+    def release(self, node, latency=None, failed=False):
+        with self._lock:
+            node.outstanding -= 1
+            if latency is not None and not failed:
+                node.ewma = latency if node.ewma is None else self.alpha * latency + (1 - self.alpha) * node.ewma
+            if not failed:
+                node.consecutive_failures = 0
+                return
+            node.failures += 1
+            node.consecutive_failures += 1
+            if node.healthy and node.consecutive_failures >= self.max_failures:
+                node.ejected_until = time.monotonic() + self.eject_time
+                logger.warning('Ejected %s after %d consecutive failures', node.url, node.consecutive_failures)
+
+    def admit(self, node):
+        with self._lock:
+            node.ejected_until = None
+            node.consecutive_failures = 0
+            node.ewma = None
+        logger.info('Re-admitted %s', node.url)
+
+    def serialize(self):
+        with self._lock:
+            return {
+                'strategy': self.strategy.name,
+                'nodes': [n.serialize() for n in self.nodes]
+            }
+
+    def _start_probes(self):
+        if self.probe is None:
+            return
+        now = time.monotonic()
+        with self._lock:
+            due = [n for n in self.nodes if not n.healthy and not n.probing and n.ejected_until <= now]
+            for node in due:
+                node.probing = True
+        for node in due:
+            threading.Thread(target=self._probe, args=(node,), name=f'alerta-probe-{node.url}', daemon=True).start()
+
+    def _probe(self, node):
+        try:
+            ok = self.probe(node.url + self.HEALTH_CHECK_PATH)
+        except Exception as e:
+            logger.debug('Health check of %s failed: %s', node.url, e)
+            ok = False
+        if ok:
+            self.admit(node)
+        else:
+            with self._lock:
+                node.ejected_until = time.monotonic() + self.eject_time
+        node.probing = False
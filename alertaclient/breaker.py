@@ -0,0 +1,175 @@
+import logging
+import threading
+import time
+from collections import deque
+
+from alertaclient.exceptions import CircuitOpenError
+
+logger = logging.getLogger('alerta.client')
+
+
+class CircuitBreaker:
+    """
+    Fail fast when the API is down.
+
+    The circuit opens after failure_threshold consecutive failures, or when
+    at least min_requests requests in the last window seconds have an error
+    rate of error_rate or more. While open every request fails immediately
+    with CircuitOpenError. After reset_timeout seconds the circuit is
+    half-open and up to half_open_max probe requests are let through; a
+    successful probe closes the circuit and a failed probe opens it again.
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half-open'
+
+    def __init__(self, failure_threshold=5, error_rate=0.5, window=60.0, min_requests=20, reset_timeout=30.0,
+                 half_open_max=1):
+        self.failure_threshold = failure_threshold
+        self.error_rate_threshold = error_rate
+        self.window = window
+        self.min_requests = min_requests
+        self.reset_timeout = reset_timeout
+        self.half_open_max = half_open_max
+
+        self._lock = threading.Lock()
+        self._state = self.CLOSED
+        self._opened_at = None
+        self._probes = 0
+        self._buckets = deque()  # [second, requests, failures]
+        self._listeners = list()
+
+        self.consecutive_failures = 0
+        self.rejected = 0
+
+    def __repr__(self):
+        return 'CircuitBreaker(state={!r}, consecutive_failures={!r}, error_rate={:.2f})'.format(
+            self.state, self.consecutive_failures, self.error_rate)
+
+    @property
+    def state(self):
+        with self._lock:
+            return self._current_state()
+
+    @property
+    def is_open(self):
+        return self.state == self.OPEN
+
+    @property
+    def retry_in(self):
+        """Seconds until the circuit will be half-open, or zero if not open."""
+        with self._lock:
+            if self._current_state() != self.OPEN:
+                return 0.0
+            return max(0.0, self._opened_at + self.reset_timeout - time.monotonic())
+
+    @property
+    def error_rate(self):
+        with self._lock:
+            requests, failures = self._window_counts()
+        return failures / requests if requests else 0.0
+
+    def add_listener(self, callback):
+        """Call callback(old_state, new_state) on every state change."""
+        self._listeners.append(callback)
+
+    def before_request(self):
+        with self._lock:
+            state = self._current_state()
+            if state == self.CLOSED:
+                return
+            if state == self.HALF_OPEN and self._probes < self.half_open_max:
+                self._probes += 1
+                return
+            self.rejected += 1
+            retry_in = max(0.0, self._opened_at + self.reset_timeout - time.monotonic())
+        raise CircuitOpenError(f'Circuit breaker is {state}. Alerta API unavailable, retry in {retry_in:.1f}s')
+
+    def record_success(self):
+        with self._lock:
+            self._record(failed=False)
+            self.consecutive_failures = 0
+            if self._current_state() == self.HALF_OPEN:
+                self._buckets.clear()
+                transition = self._set_state(self.CLOSED)
+            else:
+                transition = None
+        self._notify(transition)
+
+    def record_failure(self):
+        with self._lock:
+            self._record(failed=True)
+            self.consecutive_failures += 1
+            state = self._current_state()
+            transition = None
+            if state == self.HALF_OPEN:
+                transition = self._set_state(self.OPEN)
+            elif state == self.CLOSED and self._should_trip():
+                transition = self._set_state(self.OPEN)
+        self._notify(transition)
+
+    def reset(self):
+        with self._lock:
+            self._buckets.clear()
+            self.consecutive_failures = 0
+            transition = self._set_state(self.CLOSED)
+        self._notify(transition)
+
+    def serialize(self):
+        with self._lock:
+            requests, failures = self._window_counts()
+        return {
+            'state': self.state,
+            'consecutiveFailures': self.consecutive_failures,
+            'requests': requests,
+            'failures': failures,
+            'errorRate': self.error_rate,
+            'rejected': self.rejected,
+            'retryIn': self.retry_in
+        }
+
+    def _current_state(self):
+        if self._state == self.OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+            self._state = self.HALF_OPEN
+            self._probes = 0
+        return self._state
+
+    def _set_state(self, state):
+        old, self._state = self._state, state
+        self._probes = 0
+        if state == self.OPEN:
+            self._opened_at = time.monotonic()
+        return (old, state) if old != state else None
+
+    def _notify(self, transition):
+        if not transition:
+            return
+        logger.warning('Circuit breaker %s -> %s', *transition)
+        for callback in self._listeners:
+            try:
+                callback(*transition)
+            except Exception as e:
+                logger.warning('Circuit breaker listener %r failed: %s', callback, e)
+
+    def _record(self, failed):
+        now = int(time.monotonic())
+        if self._buckets and self._buckets[-1][0] == now:
+            bucket = self._buckets[-1]
+        else:
+            bucket = [now, 0, 0]
+            self._buckets.append(bucket)
+        bucket[1] += 1
+        bucket[2] += int(failed)
+
+    def _window_counts(self):
+        oldest = time.monotonic() - self.window
+        while self._buckets and self._buckets[0][0] < oldest:
+            self._buckets.popleft()
+        return sum(b[1] for b in self._buckets), sum(b[2] for b in self._buckets)
+
+    def _should_trip(self):
+        if self.failure_threshold and self.consecutive_failures >= self.failure_threshold:
+            return True
+        requests, failures = self._window_counts()
+        return requests >= self.min_requests and failures / requests >= self.error_rate_threshold
@@ -0,0 +1,133 @@
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from alertaclient.concurrency import AdaptiveLimiter
+from alertaclient.metrics import LatencyHistogram
+
+DEFAULT_CONCURRENCY = 10
+
+
+def imap_ordered(func, iterable, concurrency=DEFAULT_CONCURRENCY):
+    """
+    Call func(item) for every item using up to concurrency threads and
+    yield (item, result, error, latency) tuples in input order.
+
+    Items are read from iterable lazily so that only a few more than
+    concurrency are buffered at any time, however long the input.
+
+    Concurrency can be an AdaptiveLimiter, in which case the number of
+    requests in flight follows its current limit.
+    """
+    limiter = concurrency if isinstance(concurrency, AdaptiveLimiter) else None
+
+    def call(item, start=None):
+        t0 = time.perf_counter()
+        error = result = None
+        try:
+            result = func(item)
+        except Exception as e:
+            error = e
+        latency = time.perf_counter() - t0
+        if limiter:
+            limiter.release(start, latency, error)
+        return item, result, error, latency
+
+    if limiter:
+        max_workers = limiter.max_limit
+    else:
+        concurrency = max_workers = max(1, int(concurrency))
+    executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='alerta-bulk')
+    pending = deque()
+    try:
+        for item in iterable:
+            if limiter:
+                pending.append(executor.submit(call, item, limiter.acquire()))
+                concurrency = limiter.current
+            else:
+                pending.append(executor.submit(call, item))
+            while len(pending) >= concurrency * 2:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+    finally:
+        for future in pending:
+            if future.cancel() and limiter:
+                limiter.release()
+        executor.shutdown(wait=True)
+
+
+class BulkResult:
+
+    def __init__(self, index, item, id=None, alert=None, message=None, error=None, latency=0.0):
+        self.index = index
+        self.item = item
+        self.id = id
+        self.alert = alert
+        self.message = message
+        self.error = error
+        self.latency = latency
+
+    def __repr__(self):
+        if self.error:
+            return f'BulkResult(index={self.index!r}, error={self.error!r})'
+        return f'BulkResult(index={self.index!r}, id={self.id!r}, message={self.message!r})'
+
+    @property
+    def ok(self):
+        return self.error is None
+
+
+class BulkStats:
+    """Throughput and per-request latency of a bulk operation."""
+
+    def __init__(self):
+        self.total = 0
+        self.succeeded = 0
+        self.failed = 0
+        self.elapsed = 0.0
+        self.latency = LatencyHistogram()
+
+    def __repr__(self):
+        return 'BulkStats(total={!r}, failed={!r}, elapsed={:.3f}s, rate={:.1f}/s)'.format(
+            self.total, self.failed, self.elapsed, self.rate)
+
+    def record(self, result):
+        self.total += 1
+        if result.ok:
+            self.succeeded += 1
+        else:
+            self.failed += 1
+        self.latency.record(result.latency)
+
+    @property
+    def rate(self):
+        return self.total / self.elapsed if self.elapsed else 0.0
+
+    def serialize(self):
+        return {
+            'total': self.total,
+            'succeeded': self.succeeded,
+            'failed': self.failed,
+            'elapsed': self.elapsed,
+            'rate': self.rate,
+            'latency': {
+                'mean': self.latency.mean,
+                'p50': self.latency.percentile(50),
+                'p95': self.latency.percentile(95),
+                'p99': self.latency.percentile(99),
+                'max': self.latency.max
+            }
+        }
+
+
+class BulkResults(list):
+    """List of BulkResult in input order with aggregate stats."""
+
+    def __init__(self, results=None, stats=None):
+        super().__init__(results or [])
+        self.stats = stats or BulkStats()
+
+    @property
+    def errors(self):
+        return [r for r in self if not r.ok]
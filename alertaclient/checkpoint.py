@@ -0,0 +1,139 @@
+import hashlib
+import json
+import os
+
+from alertaclient.pager import Pager
+
+VERSION = 1
+
+
+def selection(ids=None, query=None):
+    """Identify the alerts a bulk command was run on, to check a checkpoint is resumed by the same command."""
+    if ids:
+        return 'ids:' + hashlib.sha1('\n'.join(sorted(ids)).encode('utf-8')).hexdigest()
+    return [list(q) for q in query or []]
+
+
+class Checkpoint:
+    """
+    Progress of a bulk command, so that an interrupted run can be resumed.
+
+    The file is a JSON header followed by one line per alert updated
+    successfully and, when alerts are selected by query, lines ">N" where
+    N is the page to resume from. Pages are walked last to first, so every
+    alert on a later page has already been updated. The file is only
+    appended to while the command runs, so an interrupted write costs at
+    most the last line. Failed alerts are not recorded and are retried
+    when the command is resumed.
+
+    The header records the command, the alerts selected and the arguments
+    that change what is done to them eg. tags, so that a checkpoint can
+    only be resumed by the same command. With no path, progress is only
+    tracked in memory.
+    """
+
+    def __init__(self, path, command, selection, args=None):
+        self.path = os.path.expanduser(path) if path else None
+        self.command = command
+        self.selection = selection
+        self.args = json.loads(json.dumps(args or {}))  # as read back from the header eg. tuples as lists
+
+        self.completed = set()
+        self.page = None  # resume from this page
+        self.skipped = 0
+
+        self._file = None
+        self._pages = dict()  # id -> page, for ids handed out and not yet recorded
+        self._failed_page = None
+
+    def __repr__(self):
+        return 'Checkpoint(path={!r}, completed={}, page={!r})'.format(self.path, len(self.completed), self.page)
+
+    @staticmethod
+    def default_path(command, selection=None, args=None):
+        """A file in the home directory, unique to the command, selection and arguments."""
+        key = json.dumps([command, selection, args or {}], sort_keys=True)
+        return '~/.alerta.{}.{}.checkpoint'.format(command, hashlib.sha1(key.encode('utf-8')).hexdigest()[:12])
+
+    def _header(self):
+        return {'version': VERSION, 'command': self.command, 'selection': self.selection, 'args': self.args}
+
+    def load(self):
+        with open(self.path) as f:
+            try:
+                header = json.loads(f.readline())
+            except ValueError:
+                raise ValueError(f'{self.path} is not a checkpoint file')
+            if header.get('command') != self.command:
+                raise ValueError('Checkpoint {} is for "{}" not "{}"'.format(self.path, header.get('command'), self.command))
+            if header.get('selection') != self.selection:
+                raise ValueError(f'Checkpoint {self.path} is for different alert ids or query')
+            if header.get('args', {}) != self.args:
+                raise ValueError('Checkpoint {} is for different arguments: {}'.format(
+                    self.path, ' '.join(f'{k}={v!r}' for k, v in sorted(header.get('args', {}).items()))))
+            for line in f:
+                line = line.strip()
+                if line.startswith('>'):
+                    self.page = int(line[1:])
+                elif line:
+                    self.completed.add(line)
+        self._file = open(self.path, 'a')
+
+    def start(self):
+        if not self.path:
+            return
+        self._file = open(self.path, 'w')
+        self._file.write(json.dumps(self._header()) + '\n')
+        self._file.flush()
+
+    def _write(self, line):
+        if self._file:
+            self._file.write(line + '\n')
+
+    def skip_completed(self, ids):
+        """Yield the ids not completed yet."""
+        for id in ids:
+            if id in self.completed:
+                self.skipped += 1
+                continue
+            yield id
+
+    def alert_ids(self, client, query, read_ahead=1):
+        """Yield the ids of alerts matching query not completed yet, last page first."""
+        pager = Pager(client.http, '/alerts', 'alerts', query, prefetch=read_ahead, reverse=True, start_page=self.page)
+        for alerts in pager:
+            for alert in alerts:
+                if alert['id'] in self.completed:
+                    self.skipped += 1
+                    continue
+                self._pages[alert['id']] = pager.page
+                yield alert['id']
+
+    def record(self, id, ok):
+        """Record the result for an id, in the order the ids were handed out."""
+        page = self._pages.pop(id, None)
+        if ok:
+            self.completed.add(id)
+            self._write(id)
+        if page is None:
+            return
+        if not ok and self._failed_page is None:
+            self._failed_page = page  # pages are walked in descending order so keep the first
+        resume_page = self._failed_page or page
+        if resume_page != self.page:
+            self.page = resume_page
+            self._write(f'>{resume_page}')
+
+    def flush(self):
+        if self._file:
+            self._file.flush()
+
+    def close(self):
+        if self._file:
+            self._file.close()
+            self._file = None
+
+    def remove(self):
+        self.close()
+        if self.path and os.path.exists(self.path):
+            os.remove(self.path)
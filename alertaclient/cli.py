@@ -5,7 +5,10 @@ import click
 
 from alertaclient.api import Client
 from alertaclient.auth.utils import get_token
+from alertaclient.balancer import parse_endpoints
 from alertaclient.config import Config
+from alertaclient.ratelimit import RateLimiter
+from alertaclient.retry import Retry
 
 CONTEXT_SETTINGS = dict(
     auto_envvar_prefix='ALERTA',
@@ -39,13 +42,14 @@ class AlertaCLI(click.MultiCommand):
 @click.command(cls=AlertaCLI, context_settings=CONTEXT_SETTINGS)
 @click.option('--config-file', metavar='<FILE>', help='Configuration file.')
 @click.option('--profile', metavar='<PROFILE>', help='Configuration profile.')
-@click.option('--endpoint-url', metavar='<URL>', help='API endpoint URL.')
+@click.option('--endpoint-url', metavar='<URL>', help='API endpoint URL. Use commas to separate multiple URLs.')
 @click.option('--output', 'output', metavar='<FORMAT>', help='Output format. eg. plain, simple, grid, psql, presto, rst, html, json, json_lines')
 @click.option('--json', 'output', flag_value='json', help='Output in JSON format. Shortcut for "--output json"')
 @click.option('--color/--no-color', help='Color-coded output based on severity.')
+@click.option('--rate', type=float, metavar='<RATE>', help='Maximum API requests per second.')
 @click.option('--debug', is_flag=True, help='Debug mode.')
 @click.pass_context
-def cli(ctx, config_file, profile, endpoint_url, output, color, debug):
+def cli(ctx, config_file, profile, endpoint_url, output, color, rate, debug):
     """
     Alerta client unified command-line tool.
     """
@@ -58,18 +62,39 @@ def cli(ctx, config_file, profile, endpoint_url, output, color, debug):
     # override current options with command-line options or environment variables
     ctx.obj['output'] = output or config.options['output']
     ctx.obj['color'] = color or os.environ.get('CLICOLOR', None) or config.options['color']
-    endpoint = endpoint_url or config.options['endpoint']
+    ctx.obj['client'] = make_client(config.options, endpoint_url, rate, debug)
 
-    ctx.obj['client'] = Client(
+
+def make_client(options, endpoint_url=None, rate=None, debug=False):
+    """Create an API client from config options and global command-line options."""
+    endpoint = endpoint_url or options['endpoint']
+    read_rate = rate or options['read_rate']
+    write_rate = rate or options['write_rate']
+
+    return Client(
         endpoint=endpoint,
-        key=config.options['key'],
-        secret=config.options['secret'],
-        token=get_token(endpoint),
-        username=config.options.get('username', None),
-        password=config.options.get('password', None),
-        timeout=float(config.options['timeout']),
-        ssl_verify=config.options['sslverify'],
-        ssl_cert=config.options.get('sslcert', None),
-        ssl_key=config.options.get('sslkey', None),
-        debug=debug or os.environ.get('DEBUG', None) or config.options['debug']
+        key=options['key'],
+        secret=options['secret'],
+        token=get_token(parse_endpoints(endpoint)[0]),
+        username=options.get('username', None),
+        password=options.get('password', None),
+        timeout=float(options['timeout']),
+        ssl_verify=options['sslverify'],
+        ssl_cert=options.get('sslcert', None),
+        ssl_key=options.get('sslkey', None),
+        debug=debug or os.environ.get('DEBUG', None) or options['debug'],
+        pool_connections=int(options['pool_connections']),
+        pool_maxsize=int(options['pool_maxsize']),
+        pool_block=options['pool_block'],
+        keepalive=float(options['keepalive']) if options['keepalive'] else None,
+        retry=Retry(total=int(options['retries']), backoff_factor=float(options['backoff'])),
+        compression=options['compression'],
+        compression_threshold=int(options['compression_threshold']),
+        balancer=options['balancer'],
+        http2=options['http2'],
+        rate_limit=RateLimiter(
+            read=float(read_rate) if read_rate else None,
+            write=float(write_rate) if write_rate else None,
+            burst=float(options['rate_burst']) if options['rate_burst'] else None
+        )
     )
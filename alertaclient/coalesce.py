@@ -0,0 +1,164 @@
+import heapq
+import logging
+import threading
+import time
+from collections import OrderedDict
+
+logger = logging.getLogger('alerta.client')
+
+DEFAULT_KEY = ('environment', 'resource', 'event', 'severity', 'customer')
+
+
+class Coalescer:
+    """
+    Collapse repeats of the same alert into one send per time window.
+
+    Wraps anything with a send_alert() method, eg. a Client or a
+    BufferedSender. The first alert for a key (by default environment,
+    resource, event, severity and customer) is sent at once. Repeats within
+    the next window seconds are merged and, when the window closes, only
+    the latest one (ie. with the latest value and text) is sent.
+
+    At most max_keys keys are tracked; the least recently used key is
+    evicted when that limit is reached, sending its merged alert first.
+    If merge_attribute is set, the number of alerts merged into a send is
+    added to its attributes under that name.
+    """
+
+    def __init__(self, target, window=1.0, max_keys=10000, key=DEFAULT_KEY, merge_attribute=None):
+        self.target = target
+        self.window = window
+        self.max_keys = max_keys
+        self.key = key
+        self.merge_attribute = merge_attribute
+
+        self._entries = OrderedDict()  # key -> [window_end, latest alert, merged]
+        self._deadlines = list()  # heap of (window_end, seq, key, entry)
+        self._seq = 0
+        self._lock = threading.Lock()
+        self._wakeup = threading.Condition(self._lock)
+        self._closed = False
+
+        self.received = 0
+        self.sent = 0
+        self.merged = 0
+        self.evicted = 0
+
+        self._flusher = threading.Thread(target=self._run, name='alerta-coalescer', daemon=True)
+        self._flusher.start()
+
+    def __repr__(self):
+        return 'Coalescer(keys={!r}, received={!r}, sent={!r}, merged={!r})'.format(
+            len(self._entries), self.received, self.sent, self.merged)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def send_alert(self, resource, event, **kwargs):
+        """
+        Send an alert, or merge it with an alert sent within the window.
+        Returns the result of the target's send_alert(), or None if merged.
+        """
+        alert = dict(kwargs, resource=resource, event=event)
+        key = tuple(alert.get(k) for k in self.key)
+        now = time.monotonic()
+        evicted = None
+        with self._lock:
+            if self._closed:
+                raise RuntimeError('Coalescer is closed')
+            self.received += 1
+            entry = self._entries.get(key)
+            if entry and now < entry[0]:
+                entry[1] = alert
+                entry[2] += 1
+                self.merged += 1
+                self._entries.move_to_end(key)
+                return None
+            stale = entry if entry and entry[1] else None  # window closed but not flushed yet
+
+            entry = [now + self.window, None, 0]
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            self._schedule(key, entry)
+            if len(self._entries) > self.max_keys:
+                _, evicted = self._entries.popitem(last=False)
+                self.evicted += 1
+            self.sent += 1
+        for entry in (stale, evicted):
+            if entry and entry[1]:
+                self._send(entry)
+        return self.target.send_alert(**alert)
+
+    def flush(self):
+        """Send every merged alert now."""
+        with self._lock:
+            pending = [e for e in self._entries.values() if e[1]]
+            self._entries.clear()
+            self._deadlines.clear()
+        for entry in pending:
+            self._send(entry)
+
+    def close(self):
+        with self._lock:
+            self._closed = True
+            self._wakeup.notify()
+        self._flusher.join()
+        self.flush()
+
+    def serialize(self):
+        with self._lock:
+            return {
+                'keys': len(self._entries),
+                'received': self.received,
+                'sent': self.sent,
+                'merged': self.merged,
+                'evicted': self.evicted
+            }
+
+    def _schedule(self, key, entry):
+        # called with lock held
+        self._seq += 1
+        heapq.heappush(self._deadlines, (entry[0], self._seq, key, entry))
+        if self._deadlines[0][3] is entry:
+            self._wakeup.notify()
+
+    def _send(self, entry):
+        alert, merged = entry[1], entry[2]
+        if self.merge_attribute:
+            alert = dict(alert, attributes=dict(alert.get('attributes') or {}, **{self.merge_attribute: merged}))
+        with self._lock:
+            self.sent += 1
+        try:
+            self.target.send_alert(**alert)
+        except Exception as e:
+            logger.warning('Failed to send coalesced alert %s/%s: %s', alert.get('resource'), alert.get('event'), e)
+
+    def _run(self):
+        while True:
+            due = list()
+            with self._lock:
+                while not self._closed:
+                    now = time.monotonic()
+                    if self._deadlines and self._deadlines[0][0] <= now:
+                        break
+                    self._wakeup.wait(self._deadlines[0][0] - now if self._deadlines else None)
+                if self._closed:
+                    return
+                now = time.monotonic()
+                while self._deadlines and self._deadlines[0][0] <= now:
+                    _, _, key, entry = heapq.heappop(self._deadlines)
+                    if self._entries.get(key) is not entry:
+                        continue  # evicted
+                    if entry[1]:
+                        # send the latest repeat and start a new window for further repeats
+                        due.append([entry[0], entry[1], entry[2]])
+                        entry[0] += self.window
+                        entry[1], entry[2] = None, 0
+                        self._schedule(key, entry)
+                    else:
+                        del self._entries[key]
+            for entry in due:
+                self._send(entry)
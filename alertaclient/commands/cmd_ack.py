@@ -1,6 +1,9 @@
+import sys
+
 import click
 
-from alertaclient.utils import action_progressbar, build_query
+from alertaclient.utils import (CONCURRENCY, action_progressbar, build_query,
+                                open_checkpoint)
 
 
 @click.command('ack', short_help='Acknowledge alerts')
@@ -8,18 +11,25 @@ from alertaclient.utils import action_progressbar, build_query
 @click.option('--query', '-q', 'query', metavar='QUERY', help='severity:"warning" AND resource:web')
 @click.option('--filter', '-f', 'filters', metavar='FILTER', multiple=True, help='KEY=VALUE eg. serverity=warning resource=web')
 @click.option('--text', help='Message associated with status change')
+@click.option('--concurrency', '-c', metavar='NUM|auto', type=CONCURRENCY, default='auto', show_default=True,
+              help='Alerts updated in parallel, "auto" adapts to API latency and errors')
+@click.option('--resume', metavar='FILE', help='Continue an interrupted run from its checkpoint file')
 @click.pass_obj
-def cli(obj, ids, query, filters, text):
+def cli(obj, ids, query, filters, text, concurrency, resume):
     """Set alert status to 'ack'."""
     client = obj['client']
     if ids:
         total = len(ids)
+        checkpoint = open_checkpoint('ack', resume, ids=ids, text=text)
+        ids = checkpoint.skip_completed(ids)
     else:
         if query:
             query = [('q', query)]
         else:
             query = build_query(filters)
         total, _, _ = client.get_count(query)
-        ids = [a.id for a in client.get_alerts(query)]
+        checkpoint = open_checkpoint('ack', resume, query=query, text=text)
+        ids = checkpoint.alert_ids(client, query)
 
-    action_progressbar(client, action='ack', ids=ids, label=f'Acking {total} alerts', text=text)
+    if action_progressbar(client, action='ack', ids=ids, label=f'Acking {total} alerts', text=text, concurrency=concurrency, total=total, checkpoint=checkpoint):
+        sys.exit(1)
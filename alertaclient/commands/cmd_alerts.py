@@ -1,8 +1,8 @@
-import json
-
 import click
 from tabulate import tabulate
 
+from alertaclient.utils import json_codec
+
 
 @click.command('alerts', short_help='List environments, services, groups and tags')
 @click.option('--environments', '-E', is_flag=True, help='List alert environments.')
@@ -18,28 +18,28 @@ def cli(obj, environments, services, groups, tags):
     if environments:
         if obj['output'] == 'json':
             r = client.http.get('/environments')
-            click.echo(json.dumps(r['environments'], sort_keys=True, indent=4, ensure_ascii=False))
+            click.echo(json_codec.dumps(r['environments'], sort_keys=True, indent=4))
         else:
             headers = {'environment': 'ENVIRONMENT', 'count': 'COUNT', 'severityCounts': 'SEVERITY COUNTS', 'statusCounts': 'STATUS COUNTS'}
             click.echo(tabulate(client.get_environments(), headers=headers, tablefmt=obj['output']))
     elif services:
         if obj['output'] == 'json':
             r = client.http.get('/services')
-            click.echo(json.dumps(r['services'], sort_keys=True, indent=4, ensure_ascii=False))
+            click.echo(json_codec.dumps(r['services'], sort_keys=True, indent=4))
         else:
             headers = {'environment': 'ENVIRONMENT', 'service': 'SERVICE', 'count': 'COUNT', 'severityCounts': 'SEVERITY COUNTS', 'statusCounts': 'STATUS COUNTS'}
             click.echo(tabulate(client.get_services(), headers=headers, tablefmt=obj['output']))
     elif groups:
         if obj['output'] == 'json':
             r = client.http.get('/alerts/groups')
-            click.echo(json.dumps(r['groups'], sort_keys=True, indent=4, ensure_ascii=False))
+            click.echo(json_codec.dumps(r['groups'], sort_keys=True, indent=4))
         else:
             headers = {'environment': 'ENVIRONMENT', 'group': 'GROUP', 'count': 'COUNT', 'severityCounts': 'SEVERITY COUNTS', 'statusCounts': 'STATUS COUNTS'}
             click.echo(tabulate(client.get_groups(), headers=headers, tablefmt=obj['output']))
     elif tags:
         if obj['output'] == 'json':
             r = client.http.get('/alerts/tags')
-            click.echo(json.dumps(r['tags'], sort_keys=True, indent=4, ensure_ascii=False))
+            click.echo(json_codec.dumps(r['tags'], sort_keys=True, indent=4))
         else:
             headers = {'environment': 'ENVIRONMENT', 'tag': 'TAG', 'count': 'COUNT', 'severityCounts': 'SEVERITY COUNTS', 'statusCounts': 'STATUS COUNTS'}
             click.echo(tabulate(client.get_tags(), headers=headers, tablefmt=obj['output']))
@@ -1,8 +1,8 @@
-import json
-
 import click
 from tabulate import tabulate
 
+from alertaclient.utils import json_codec
+
 
 @click.command('blackouts', short_help='List alert suppressions')
 @click.option('--purge', is_flag=True, help='Delete all expired blackouts')
@@ -13,7 +13,7 @@ def cli(obj, purge):
 
     if obj['output'] == 'json':
         r = client.http.get('/blackouts')
-        click.echo(json.dumps(r['blackouts'], sort_keys=True, indent=4, ensure_ascii=False))
+        click.echo(json_codec.dumps(r['blackouts'], sort_keys=True, indent=4))
     else:
         timezone = obj['timezone']
         headers = {
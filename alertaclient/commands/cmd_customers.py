@@ -1,8 +1,8 @@
-import json
-
 import click
 from tabulate import tabulate
 
+from alertaclient.utils import json_codec
+
 
 @click.command('customers', short_help='List customer lookups')
 @click.pass_obj
@@ -12,7 +12,7 @@ def cli(obj):
 
     if obj['output'] == 'json':
         r = client.http.get('/customers')
-        click.echo(json.dumps(r['customers'], sort_keys=True, indent=4, ensure_ascii=False))
+        click.echo(json_codec.dumps(r['customers'], sort_keys=True, indent=4))
     else:
         headers = {'id': 'ID', 'customer': 'CUSTOMER', 'match': 'GROUP'}
         click.echo(tabulate([c.tabular() for c in client.get_customers()], headers=headers, tablefmt=obj['output']))
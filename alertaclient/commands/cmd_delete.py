@@ -1,18 +1,26 @@
+import sys
+
 import click
 
-from alertaclient.utils import build_query
+from alertaclient.utils import (CONCURRENCY, build_query, bulk_progressbar,
+                                open_checkpoint)
 
 
 @click.command('delete', short_help='Delete alerts')
 @click.option('--ids', '-i', metavar='ID', multiple=True, help='List of alert IDs (can use short 8-char id)')
 @click.option('--query', '-q', 'query', metavar='QUERY', help='severity:"warning" AND resource:web')
 @click.option('--filter', '-f', 'filters', metavar='FILTER', multiple=True, help='KEY=VALUE eg. serverity=warning resource=web')
+@click.option('--concurrency', '-c', metavar='NUM|auto', type=CONCURRENCY, default='auto', show_default=True,
+              help='Alerts deleted in parallel, "auto" adapts to API latency and errors')
+@click.option('--resume', metavar='FILE', help='Continue an interrupted run from its checkpoint file')
 @click.pass_obj
-def cli(obj, ids, query, filters):
+def cli(obj, ids, query, filters, concurrency, resume):
     """Delete alerts."""
     client = obj['client']
     if ids:
         total = len(ids)
+        checkpoint = open_checkpoint('delete', resume, ids=ids)
+        ids = checkpoint.skip_completed(ids)
     else:
         if not (query or filters):
             click.confirm('Deleting all alerts. Do you want to continue?', abort=True)
@@ -21,8 +29,9 @@ def cli(obj, ids, query, filters):
         else:
             query = build_query(filters)
         total, _, _ = client.get_count(query)
-        ids = [a.id for a in client.get_alerts(query)]
+        checkpoint = open_checkpoint('delete', resume, query=query)
+        ids = checkpoint.alert_ids(client, query)
 
-    with click.progressbar(ids, label=f'Deleting {total} alerts') as bar:
-        for id in bar:
-            client.delete_alert(id)
+    if bulk_progressbar(client.delete_alert, ids, f'Deleting {total} alerts', concurrency, total, checkpoint,
+                        client.http.pool_maxsize):
+        sys.exit(1)
@@ -1,8 +1,8 @@
-import json
-
 import click
 from tabulate import tabulate
 
+from alertaclient.utils import json_codec
+
 
 @click.command('groups', short_help='List user groups')
 @click.pass_obj
@@ -12,7 +12,7 @@ def cli(obj):
 
     if obj['output'] == 'json':
         r = client.http.get('/groups')
-        click.echo(json.dumps(r['groups'], sort_keys=True, indent=4, ensure_ascii=False))
+        click.echo(json_codec.dumps(r['groups'], sort_keys=True, indent=4))
     else:
         headers = {'id': 'ID', 'name': 'NAME', 'count': 'USERS', 'text': 'DESCRIPTION'}
         click.echo(tabulate([g.tabular() for g in client.get_users_groups()], headers=headers, tablefmt=obj['output']))
@@ -1,7 +1,11 @@
+import signal
 import sys
 
 import click
 
+from alertaclient.cli import make_client
+from alertaclient.config import Config
+from alertaclient.daemon import HeartbeatDaemon
 from alertaclient.utils import origin
 
 
@@ -15,14 +19,22 @@ from alertaclient.utils import origin
 @click.option('--timeout', metavar='SECONDS', type=int, help='Seconds before heartbeat is stale')
 @click.option('--customer', metavar='STRING', help='Customer')
 @click.option('--delete', '-D', metavar='ID', help='Delete hearbeat using ID')
-@click.pass_obj
-def cli(obj, origin, environment, severity, service, group, tags, timeout, customer, delete):
+@click.option('--interval', '-i', metavar='SECONDS', type=float, help='Keep running and send a heartbeat every interval')
+@click.pass_context
+def cli(ctx, origin, environment, severity, service, group, tags, timeout, customer, delete, interval):
     """
     Send or delete a heartbeat.
 
     Note: The "environment", "severity", "service" and "group" values are only
     used when heartbeat alerts are generated from slow or stale heartbeats.
+
+    With --interval, keep running and send heartbeats on a fixed schedule
+    over one persistent connection instead of starting a new process for
+    each one (eg. from cron). Failed heartbeats are retried with backoff
+    until the next one is due. Send SIGHUP to reload the configuration
+    file and SIGTERM or SIGINT to stop.
     """
+    obj = ctx.obj
     client = obj['client']
     if delete:
         client.delete_heartbeat(delete)
@@ -49,9 +61,47 @@ def cli(obj, origin, environment, severity, service, group, tags, timeout, custo
         if group:
             attributes['group'] = group
 
+        if interval:
+            run_daemon(ctx, interval, origin=origin, tags=tags, attributes=attributes, timeout=timeout,
+                       customer=customer)
+            return
+
         try:
             heartbeat = client.heartbeat(origin=origin, tags=tags, attributes=attributes, timeout=timeout, customer=customer)
         except Exception as e:
             click.echo(f'ERROR: {e}', err=True)
             sys.exit(1)
         click.echo(heartbeat.id)
+
+
+def run_daemon(ctx, interval, **heartbeat):
+    clients = [ctx.obj['client']]
+
+    def send():
+        clients[0].heartbeat(**heartbeat)
+
+    def reload():
+        # global options (eg. --endpoint-url) still override the config file
+        params = ctx.find_root().params
+        config = Config(params['config_file'])
+        config.get_config_for_profle(params['profile'])
+        client = make_client(config.options, params['endpoint_url'], params['rate'], params['debug'])
+        clients[0].http.session.close()
+        clients[0] = client
+        click.echo('Reloaded config', err=True)
+
+    def on_error(error, delay):
+        click.echo(f'ERROR: {error} (retry in {delay:.1f}s)', err=True)
+
+    daemon = HeartbeatDaemon(send, interval, on_reload=reload, on_error=on_error)
+    if hasattr(signal, 'SIGHUP'):
+        signal.signal(signal.SIGHUP, lambda signum, frame: daemon.reload())
+    signal.signal(signal.SIGTERM, lambda signum, frame: daemon.stop())
+
+    click.echo('Sending heartbeat for {} every {:g}s'.format(heartbeat['origin'], interval), err=True)
+    try:
+        daemon.run()
+    except KeyboardInterrupt:
+        pass
+    click.echo('Stopped after {sent} heartbeats ({failed} failed, {skipped} skipped)'.format(**daemon.serialize()),
+               err=True)
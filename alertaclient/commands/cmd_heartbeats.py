@@ -1,10 +1,8 @@
-import json
-
 import click
 from tabulate import tabulate
 
 from alertaclient.models.heartbeat import Heartbeat
-from alertaclient.utils import origin
+from alertaclient.utils import json_codec, origin
 
 
 @click.command('heartbeats', short_help='List heartbeats')
@@ -35,7 +33,7 @@ def cli(obj, alert, severity, timeout, purge):
     if obj['output'] == 'json':
         r = client.http.get('/heartbeats')
         heartbeats = [Heartbeat.parse(hb) for hb in r['heartbeats']]
-        click.echo(json.dumps(r['heartbeats'], sort_keys=True, indent=4, ensure_ascii=False))
+        click.echo(json_codec.dumps(r['heartbeats'], sort_keys=True, indent=4))
     else:
         timezone = obj['timezone']
         headers = {
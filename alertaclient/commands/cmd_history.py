@@ -1,9 +1,7 @@
-import json
-
 import click
 from tabulate import tabulate
 
-from alertaclient.utils import build_query
+from alertaclient.utils import build_query, json_codec
 
 
 @click.command('history', short_help='Show alert history')
@@ -17,7 +15,7 @@ def cli(obj, ids, query, filters):
 
     if obj['output'] == 'json':
         r = client.http.get('/alerts/history')
-        click.echo(json.dumps(r['history'], sort_keys=True, indent=4, ensure_ascii=False))
+        click.echo(json_codec.dumps(r['history'], sort_keys=True, indent=4))
     else:
         timezone = obj['timezone']
         if ids:
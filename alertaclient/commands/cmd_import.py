@@ -0,0 +1,177 @@
+import csv
+import gzip
+import hashlib
+import os
+import sys
+import time
+
+import click
+
+from alertaclient.bulk import BulkResult, BulkStats, imap_ordered
+from alertaclient.commands.cmd_send import alert_data
+from alertaclient.utils import json_codec
+
+FORMATS = ('ndjson', 'csv', 'json')
+LIST_FIELDS = ('correlate', 'service', 'tags')
+API_FIELDS = {'rawData': 'raw_data', 'createTime': 'create_time'}  # as output by "alerta query --output json"
+
+
+def guess_format(path):
+    name = path[:-3] if path.endswith('.gz') else path
+    ext = os.path.splitext(name)[1].lstrip('.').lower()
+    return {'jsonl': 'ndjson', 'json_lines': 'ndjson'}.get(ext, ext if ext in FORMATS else 'ndjson')
+
+
+def to_alert(record, mapping):
+    """Map a record (a JSON object or CSV row) onto send_alert() arguments."""
+    record = dict(record)
+    for field, key in mapping.items():
+        record[field] = record.pop(key, None)
+    for key, field in API_FIELDS.items():
+        if key in record:
+            record.setdefault(field, record.pop(key))
+    attributes = dict(record.get('attributes') or {})
+    for key in [k for k in record if k.startswith('attributes.')]:
+        attributes[key[len('attributes.'):]] = record.pop(key)
+    record['attributes'] = attributes
+    for field in LIST_FIELDS:
+        if isinstance(record.get(field), str):
+            record[field] = [v.strip() for v in record[field].split(',') if v.strip()]
+    if isinstance(record.get('timeout'), str):
+        record['timeout'] = int(record['timeout']) if record['timeout'] else None
+    return alert_data(**{k: v for k, v in record.items() if v != ''})
+
+
+def read_records(stream, format, offset=0):
+    """
+    Yield (offset, record) for every record in a binary stream, where offset
+    is the position just after the record. Reading restarts from offset,
+    which for a JSON array is a record count not a byte offset.
+    """
+    if format == 'json':
+        records = json_codec.loads(stream.read())
+        if not isinstance(records, list):
+            raise click.UsageError('JSON file must contain an array of alerts. Use --format ndjson for JSON lines.')
+        for n, record in enumerate(records[offset:], start=offset + 1):
+            yield n, record
+        return
+
+    position = [offset]
+
+    def lines():
+        while True:
+            line = stream.readline()
+            if not line:
+                return
+            position[0] += len(line)
+            yield line.decode('utf-8')
+
+    if format == 'csv':
+        header = next(csv.reader([stream.readline().decode('utf-8')]))
+        if offset:
+            stream.seek(offset)
+        else:
+            position[0] = stream.tell()
+        for row in csv.DictReader(lines(), fieldnames=header):
+            yield position[0], row
+    else:
+        if offset:
+            stream.seek(offset)
+        for line in lines():
+            if line.strip():
+                yield position[0], line  # parsed by sender so a bad line is just a failed record
+
+
+def default_checkpoint(file):
+    """A file in the home directory, unique to the file being imported."""
+    digest = hashlib.sha1(os.path.abspath(file).encode('utf-8')).hexdigest()[:12]
+    return os.path.expanduser(f'~/.alerta.import.{digest}.checkpoint')
+
+
+def save_checkpoint(path, offset):
+    tmp = path + '.tmp'
+    with open(tmp, 'w') as f:
+        f.write(str(offset))
+    os.replace(tmp, path)
+
+
+@click.command('import', short_help='Import alerts from file')
+@click.option('--format', '-f', 'format', type=click.Choice(FORMATS), help='File format [default: from file extension]')
+@click.option('--map', '-m', 'mappings', metavar='FIELD=KEY', multiple=True, help='Use column or key for alert field eg. resource=hostname')
+@click.option('--concurrency', '-c', metavar='NUM', type=int, default=10, show_default=True, help='Alerts sent in parallel')
+@click.option('--checkpoint', metavar='FILE', help='Checkpoint file [default: ~/.alerta.import.HASH.checkpoint]')
+@click.option('--resume', is_flag=True, help='Continue from the last checkpoint')
+@click.argument('file', type=click.Path(exists=True, dir_okay=False))
+@click.pass_obj
+def cli(obj, format, mappings, concurrency, checkpoint, resume, file):
+    """
+    Import alerts from a JSON lines, CSV or JSON array file, optionally gzip
+    compressed. Keys or columns with the same name as a "send" option are
+    used for that field; use --map for others.
+    """
+    client = obj['client']
+    format = format or guess_format(file)
+    mapping = dict(m.split('=', maxsplit=1) for m in mappings)
+    checkpoint = checkpoint or default_checkpoint(file)
+
+    offset = 0
+    if resume and os.path.exists(checkpoint):
+        with open(checkpoint) as f:
+            offset = int(f.read().strip() or 0)
+
+    def send(item):
+        _, record = item
+        if isinstance(record, str):
+            record = json_codec.loads(record)
+        return client.send_alert(**to_alert(record, mapping))
+
+    stats = BulkStats()
+    start = time.perf_counter()
+    last_saved = last_shown = start
+    done = offset
+
+    def save(offset):
+        nonlocal checkpoint
+        try:
+            save_checkpoint(checkpoint, offset)
+        except OSError as e:
+            click.echo(f'\nWARNING: Progress will not be saved, cannot write checkpoint: {e}', err=True)
+            checkpoint = None
+
+    def show_rate(item):
+        if stats.total:
+            return '{:.1f} alerts/s, {} failed'.format(stats.total / (time.perf_counter() - start), stats.failed)
+
+    with open(file, 'rb') as raw:
+        stream = gzip.GzipFile(fileobj=raw) if file.endswith('.gz') else raw
+        size = os.path.getsize(file)
+        label = f'Importing {os.path.basename(file)}' + (f' from {offset}' if offset else '')
+        with click.progressbar(length=size, label=label, item_show_func=show_rate) as bar:
+            try:
+                records = read_records(stream, format, offset)
+                for n, ((position, _), r, error, latency) in enumerate(imap_ordered(send, records, concurrency), start=1):
+                    stats.record(BulkResult(n, position, error=error, latency=latency))
+                    if error:
+                        click.echo(f'\nERROR: record {n}: {error}', err=True)
+                    done = position
+                    now = time.perf_counter()
+                    if now - last_shown >= 0.2:
+                        bar.update(raw.tell() - bar.pos)  # compressed bytes read for gzip files
+                        last_shown = now
+                    if checkpoint and now - last_saved >= 1.0:
+                        save(done)
+                        last_saved = now
+            except BaseException:
+                # progress is as last saved, up to a second ago; saving again here could fail the same way
+                if checkpoint and os.path.exists(checkpoint):
+                    click.echo(f'\nStopped. Use --resume to continue from checkpoint {checkpoint}', err=True)
+                raise
+            bar.update(size - bar.pos)
+
+    stats.elapsed = time.perf_counter() - start
+    if checkpoint and os.path.exists(checkpoint):
+        os.remove(checkpoint)
+    click.echo('{} alerts imported, {} failed in {:.1f}s ({:.1f} alerts/s, p95 latency {:.0f}ms)'.format(
+        stats.succeeded, stats.failed, stats.elapsed, stats.rate, stats.latency.percentile(95) * 1000))
+    if stats.failed:
+        sys.exit(1)
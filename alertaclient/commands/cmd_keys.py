@@ -1,8 +1,8 @@
-import json
-
 import click
 from tabulate import tabulate
 
+from alertaclient.utils import json_codec
+
 
 @click.command('keys', short_help='List API keys')
 @click.pass_obj
@@ -12,7 +12,7 @@ def cli(obj):
 
     if obj['output'] == 'json':
         r = client.http.get('/keys')
-        click.echo(json.dumps(r['keys'], sort_keys=True, indent=4, ensure_ascii=False))
+        click.echo(json_codec.dumps(r['keys'], sort_keys=True, indent=4))
     else:
         timezone = obj['timezone']
         headers = {
@@ -1,6 +1,9 @@
+import sys
+
 import click
 
-from alertaclient.utils import build_query
+from alertaclient.utils import (CONCURRENCY, build_query, bulk_progressbar,
+                                open_checkpoint)
 
 
 @click.command('note', short_help='Add note')
@@ -9,8 +12,11 @@ from alertaclient.utils import build_query
 @click.option('--filter', '-f', 'filters', metavar='FILTER', multiple=True, help='KEY=VALUE eg. serverity=warning resource=web')
 @click.option('--text', help='Note or message')
 @click.option('--delete', '-D', metavar='ID', nargs=2, help='Delete note, using alert ID and note ID')
+@click.option('--concurrency', '-c', metavar='NUM|auto', type=CONCURRENCY, default='auto', show_default=True,
+              help='Alerts updated in parallel, "auto" adapts to API latency and errors')
+@click.option('--resume', metavar='FILE', help='Continue an interrupted run from its checkpoint file')
 @click.pass_obj
-def cli(obj, alert_ids, query, filters, text, delete):
+def cli(obj, alert_ids, query, filters, text, delete, concurrency, resume):
     """
     Add or delete note to alerts.
 
@@ -34,14 +40,17 @@ def cli(obj, alert_ids, query, filters, text, delete):
     else:
         if alert_ids:
             total = len(alert_ids)
+            checkpoint = open_checkpoint('note', resume, ids=alert_ids, text=text)
+            alert_ids = checkpoint.skip_completed(alert_ids)
         else:
             if query:
                 query = [('q', query)]
             else:
                 query = build_query(filters)
             total, _, _ = client.get_count(query)
-            alert_ids = [a.id for a in client.get_alerts(query)]
+            checkpoint = open_checkpoint('note', resume, query=query, text=text)
+            alert_ids = checkpoint.alert_ids(client, query)
 
-        with click.progressbar(alert_ids, label=f'Add note to {total} alerts') as bar:
-            for id in bar:
-                client.alert_note(id, text=text)
+        if bulk_progressbar(lambda id: client.alert_note(id, text=text), alert_ids, f'Add note to {total} alerts', concurrency, total, checkpoint,
+                            client.http.pool_maxsize):
+            sys.exit(1)
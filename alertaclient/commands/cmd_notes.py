@@ -1,8 +1,8 @@
-import json
-
 import click
 from tabulate import tabulate
 
+from alertaclient.utils import json_codec
+
 
 @click.command('notes', short_help='List notes')
 @click.option('--alert-id', '-i', metavar='ID', help='alert IDs (can use short 8-char id)')
@@ -13,7 +13,7 @@ def cli(obj, alert_id):
     if alert_id:
         if obj['output'] == 'json':
             r = client.http.get(f'/alert/{alert_id}/notes')
-            click.echo(json.dumps(r['notes'], sort_keys=True, indent=4, ensure_ascii=False))
+            click.echo(json_codec.dumps(r['notes'], sort_keys=True, indent=4))
         else:
             timezone = obj['timezone']
             headers = {
@@ -1,8 +1,8 @@
-import json
-
 import click
 from tabulate import tabulate
 
+from alertaclient.utils import json_codec
+
 
 @click.command('perms', short_help='List role-permission lookups')
 @click.option('--scope', 'scopes', multiple=True, help='Filter roles by scope eg. admin:keys, write:alerts')
@@ -14,7 +14,7 @@ def cli(obj, scopes):
 
     if obj['output'] == 'json':
         r = client.http.get('/perms', query)
-        click.echo(json.dumps(r['permissions'], sort_keys=True, indent=4, ensure_ascii=False))
+        click.echo(json_codec.dumps(r['permissions'], sort_keys=True, indent=4))
     else:
         headers = {'id': 'ID', 'scopes': 'SCOPES', 'match': 'ROLE'}
         click.echo(tabulate([p.tabular() for p in client.get_perms(query)], headers=headers, tablefmt=obj['output']))
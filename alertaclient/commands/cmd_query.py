@@ -1,10 +1,8 @@
-import json
-
 import click
 from tabulate import tabulate
 
 from alertaclient.models.alert import Alert
-from alertaclient.utils import DateTime, build_query
+from alertaclient.utils import DateTime, build_query, json_codec
 
 COLOR_MAP = {
     'critical': {'fg': 'red'},
@@ -40,10 +38,10 @@ def cli(obj, ids, query, filters, display, from_date=None):
     r = client.http.get('/alerts', query, page=1, page_size=1000)
 
     if obj['output'] == 'json':
-        click.echo(json.dumps(r['alerts'], sort_keys=True, indent=4, ensure_ascii=False))
+        click.echo(json_codec.dumps(r['alerts'], sort_keys=True, indent=4))
     elif obj['output'] in ['json_lines', 'jsonl', 'ndjson']:
         for alert in r['alerts']:
-            click.echo(json.dumps(alert, ensure_ascii=False))
+            click.echo(json_codec.dumps(alert))
     else:
         alerts = [Alert.parse(a) for a in r['alerts']]
         last_time = r['lastTime']
@@ -1,8 +1,8 @@
-import json
-
 import click
 from tabulate import tabulate
 
+from alertaclient.utils import json_codec
+
 
 @click.command('scopes', short_help='List scopes')
 @click.pass_obj
@@ -12,7 +12,7 @@ def cli(obj):
 
     if obj['output'] == 'json':
         r = client.http.get('/scopes')
-        click.echo(json.dumps(r['scopes'], sort_keys=True, indent=4, ensure_ascii=False))
+        click.echo(json_codec.dumps(r['scopes'], sort_keys=True, indent=4))
     else:
         headers = {'scope': 'SCOPE'}
         click.echo(tabulate([s.tabular() for s in client.get_scopes()], headers=headers, tablefmt=obj['output']))
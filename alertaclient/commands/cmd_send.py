@@ -1,9 +1,16 @@
-import json
 import os
+import sqlite3
 import sys
+import time
+from datetime import datetime
 
 import click
 
+from alertaclient.bulk import BulkResult, BulkStats, imap_ordered
+from alertaclient.exceptions import is_transient
+from alertaclient.spool import Spool
+from alertaclient.utils import json_codec
+
 
 @click.command('send', short_help='Send an alert')
 @click.option('--resource', '-r', metavar='RESOURCE', required=False, help='Resource under alarm')
@@ -22,41 +29,30 @@ import click
 @click.option('--timeout', metavar='SECONDS', type=int, help='Seconds before an open alert will be expired')
 @click.option('--raw-data', metavar='STRING', help='Raw data of orignal alert eg. SNMP trap PDU. \'@\' to read from file, \'-\' to read from stdin')
 @click.option('--customer', metavar='STRING', help='Customer')
+@click.option('--concurrency', metavar='NUM', type=int, default=10, show_default=True, help='Alerts sent in parallel when reading from stdin')
+@click.option('--failed-file', metavar='FILE', type=click.Path(dir_okay=False, writable=True), help='Write input lines that could not be sent to file')
 @click.pass_obj
-def cli(obj, resource, event, environment, severity, correlate, service, group, value, text, tags, attributes, origin, type, timeout, raw_data, customer):
+def cli(obj, resource, event, environment, severity, correlate, service, group, value, text, tags, attributes, origin, type, timeout, raw_data, customer, concurrency, failed_file):
     """Send an alert."""
     client = obj['client']
 
     def send_alert(resource, event, **kwargs):
+        data = alert_data(resource, event, **kwargs)
         try:
-            id, alert, message = client.send_alert(
-                resource=resource,
-                event=event,
-                environment=kwargs.get('environment'),
-                severity=kwargs.get('severity'),
-                correlate=kwargs.get('correlate', None) or list(),
-                service=kwargs.get('service', None) or list(),
-                group=kwargs.get('group'),
-                value=kwargs.get('value'),
-                text=kwargs.get('text'),
-                tags=kwargs.get('tags', None) or list(),
-                attributes=kwargs.get('attributes', None) or dict(),
-                origin=kwargs.get('origin'),
-                type=kwargs.get('type'),
-                timeout=kwargs.get('timeout'),
-                raw_data=kwargs.get('raw_data'),
-                customer=kwargs.get('customer')
-            )
+            id, alert, message = client.send_alert(**data)
         except Exception as e:
             click.echo(f'ERROR: {e}', err=True)
+            if obj.get('spool_file') and is_transient(e):
+                # keep the alert to send later with "alerta spool replay"
+                try:
+                    with Spool(obj['spool_file']) as spool:
+                        spool.append(data)
+                except (sqlite3.Error, OSError) as e:
+                    click.echo(f"ERROR: Alert not spooled to {obj['spool_file']}: {e}", err=True)
+                else:
+                    click.echo(f'Alert spooled to {spool.path}', err=True)
             sys.exit(1)
-
-        if alert:
-            if alert.repeat:
-                message = f'{alert.duplicate_count} duplicates'
-            else:
-                message = f'{alert.previous_severity} -> {alert.severity}'
-        click.echo(f'{id} ({message})')
+        click.echo(f'{id} ({describe(alert, message)})')
 
     # read raw data from file or stdin
     if raw_data and raw_data.startswith('@') or raw_data == '-':
@@ -64,17 +60,11 @@ def cli(obj, resource, event, environment, severity, correlate, service, group,
         with click.open_file(raw_data_file, 'r') as f:
             raw_data = f.read()
 
-    # read entire alert object from terminal stdin
+    # read alert objects from terminal stdin, one per line
     elif not sys.stdin.isatty() and (os.environ.get('TERM', None) or os.environ.get('PS1', None)):
         with click.get_text_stream('stdin') as stdin:
-            for line in stdin.readlines():
-                try:
-                    payload = json.loads(line)
-                except Exception as e:
-                    click.echo(f"ERROR: JSON parse failure - input must be in 'json_lines' format: {e}", err=True)
-                    sys.exit(1)
-                send_alert(**payload)
-            sys.exit(0)
+            stats = send_lines(obj, stdin, concurrency, failed_file)
+        sys.exit(1 if stats.failed else 0)
 
     send_alert(
         resource=resource,
@@ -94,3 +84,92 @@ def cli(obj, resource, event, environment, severity, correlate, service, group,
         raw_data=raw_data,
         customer=customer
     )
+
+
+def alert_data(resource, event, **kwargs):
+    return dict(
+        resource=resource,
+        event=event,
+        environment=kwargs.get('environment'),
+        severity=kwargs.get('severity'),
+        correlate=kwargs.get('correlate', None) or list(),
+        service=kwargs.get('service', None) or list(),
+        group=kwargs.get('group'),
+        value=kwargs.get('value'),
+        text=kwargs.get('text'),
+        tags=kwargs.get('tags', None) or list(),
+        attributes=kwargs.get('attributes', None) or dict(),
+        origin=kwargs.get('origin'),
+        type=kwargs.get('type'),
+        create_time=kwargs.get('create_time') or datetime.utcnow(),
+        timeout=kwargs.get('timeout'),
+        raw_data=kwargs.get('raw_data'),
+        customer=kwargs.get('customer')
+    )
+
+
+def describe(alert, message):
+    if alert:
+        if alert.repeat:
+            return f'{alert.duplicate_count} duplicates'
+        return f'{alert.previous_severity} -> {alert.severity}'
+    return message
+
+
+def send_lines(obj, lines, concurrency, failed_file=None):
+    """
+    Send alerts read lazily from lines of JSON with up to concurrency requests
+    in flight. Results are printed in input order and failures do not stop
+    the run; failed lines are spooled (if the API was unreachable) or written
+    to failed_file. The spool is only opened on the first alert to spool, and
+    if it cannot be, lines are written to failed_file instead. Prints a
+    summary and returns the BulkStats.
+    """
+    client = obj['client']
+    spool_file = obj.get('spool_file')
+    spool = None
+    failed = click.open_file(failed_file, 'w') if failed_file else None
+
+    def send(item):
+        _, line = item
+        try:
+            data = alert_data(**json_codec.loads(line))
+        except (ValueError, TypeError) as e:
+            raise ValueError(f"JSON parse failure - input must be in 'json_lines' format: {e}")
+        try:
+            return data, client.send_alert(**data), None
+        except Exception as e:
+            return data, None, e
+
+    stats = BulkStats()
+    start = time.perf_counter()
+    try:
+        items = ((n, line) for n, line in enumerate(lines, start=1) if line.strip())
+        for (lineno, line), r, error, latency in imap_ordered(send, items, concurrency):
+            data, r, error = r if error is None else (None, None, error)
+            stats.record(BulkResult(lineno, line, error=error, latency=latency))
+            if error is None:
+                id, alert, message = r
+                click.echo(f'{id} ({describe(alert, message)})')
+                continue
+            click.echo(f'ERROR: line {lineno}: {error}', err=True)
+            if spool_file and is_transient(error):
+                try:
+                    spool = spool or Spool(spool_file)
+                    spool.append(data)
+                    continue
+                except (sqlite3.Error, OSError) as e:
+                    click.echo(f'ERROR: Alerts not spooled to {spool_file}: {e}', err=True)
+                    spool_file = None
+            if failed:
+                failed.write(line if line.endswith('\n') else line + '\n')
+    finally:
+        stats.elapsed = time.perf_counter() - start
+        if spool:
+            spool.close()
+        if failed:
+            failed.close()
+
+    click.echo('{} alerts sent, {} failed in {:.1f}s ({:.1f} alerts/s, p95 latency {:.0f}ms)'.format(
+        stats.succeeded, stats.failed, stats.elapsed, stats.rate, stats.latency.percentile(95) * 1000), err=True)
+    return stats
@@ -1,6 +1,9 @@
+import sys
+
 import click
 
-from alertaclient.utils import action_progressbar, build_query
+from alertaclient.utils import (CONCURRENCY, action_progressbar, build_query,
+                                open_checkpoint)
 
 
 @click.command('shelve', short_help='Shelve alerts')
@@ -9,19 +12,26 @@ from alertaclient.utils import action_progressbar, build_query
 @click.option('--filter', '-f', 'filters', metavar='FILTER', multiple=True, help='KEY=VALUE eg. serverity=warning resource=web')
 @click.option('--timeout', metavar='SECONDS', type=int, help='Seconds before alert auto-unshelved.', default=7200, show_default=True)
 @click.option('--text', help='Message associated with status change')
+@click.option('--concurrency', '-c', metavar='NUM|auto', type=CONCURRENCY, default='auto', show_default=True,
+              help='Alerts updated in parallel, "auto" adapts to API latency and errors')
+@click.option('--resume', metavar='FILE', help='Continue an interrupted run from its checkpoint file')
 @click.pass_obj
-def cli(obj, ids, query, filters, timeout, text):
+def cli(obj, ids, query, filters, timeout, text, concurrency, resume):
     """Set alert status to 'shelved'."""
     client = obj['client']
     if ids:
         total = len(ids)
+        checkpoint = open_checkpoint('shelve', resume, ids=ids, timeout=timeout, text=text)
+        ids = checkpoint.skip_completed(ids)
     else:
         if query:
             query = [('q', query)]
         else:
             query = build_query(filters)
         total, _, _ = client.get_count(query)
-        ids = [a.id for a in client.get_alerts(query)]
+        checkpoint = open_checkpoint('shelve', resume, query=query, timeout=timeout, text=text)
+        ids = checkpoint.alert_ids(client, query)
 
-    action_progressbar(client, action='shelve', ids=ids,
-                       label=f'Shelving {total} alerts', text=text, timeout=timeout)
+    if action_progressbar(client, action='shelve', ids=ids, label=f'Shelving {total} alerts', text=text,
+                          timeout=timeout, concurrency=concurrency, total=total, checkpoint=checkpoint):
+        sys.exit(1)
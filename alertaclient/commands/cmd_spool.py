@@ -0,0 +1,57 @@
+import sys
+
+import click
+
+from alertaclient.spool import Spool
+from alertaclient.utils import DateTime
+
+
+@click.group('spool', short_help='Manage undelivered alerts')
+@click.pass_obj
+def cli(obj):
+    """Show, replay or purge alerts spooled because the API was unreachable."""
+    if not obj.get('spool_file'):
+        raise click.UsageError('Alert spooling is disabled. Set "spool_file" in the configuration file.')
+
+
+@cli.command('status', short_help='Show spooled alerts')
+@click.pass_obj
+def status(obj):
+    """Show the number and age of spooled alerts."""
+    with Spool(obj['spool_file']) as spool:
+        status = spool.status()
+    timezone = obj['timezone']
+    click.echo('spool: {}'.format(status['path']))
+    click.echo('alerts: {}'.format(status['count']))
+    if status['count']:
+        click.echo('oldest: {}'.format(DateTime.localtime(status['oldest'], timezone)))
+        click.echo('newest: {}'.format(DateTime.localtime(status['newest'], timezone)))
+    click.echo('size: {:.1f} KB'.format(status['size'] / 1024))
+
+
+@cli.command('replay', short_help='Send spooled alerts')
+@click.option('--concurrency', '-c', type=int, default=10, show_default=True, help='Maximum requests in flight')
+@click.option('--rate', '-r', type=float, help='Maximum alerts per second')
+@click.option('--max-attempts', type=int, default=5, show_default=True, help='Discard alerts rejected this many times')
+@click.pass_obj
+def replay(obj, concurrency, rate, max_attempts):
+    """Send spooled alerts in order, stopping if the API is still unreachable."""
+    client = obj['client']
+    with Spool(obj['spool_file']) as spool:
+        total = len(spool)
+        with click.progressbar(length=total, label=f'Replaying {total} alerts') as bar:
+            stats = spool.replay(client, concurrency=concurrency, rate=rate, max_attempts=max_attempts,
+                                 callback=lambda alert, error: bar.update(1))
+    click.echo('{sent} sent, {failed} failed, {rejected} discarded, {remaining} remaining'.format(**stats))
+    if stats['remaining']:
+        sys.exit(1)
+
+
+@cli.command('purge', short_help='Delete spooled alerts')
+@click.confirmation_option(prompt='Deleting all spooled alerts. Do you want to continue?')
+@click.pass_obj
+def purge(obj):
+    """Delete all spooled alerts without sending them."""
+    with Spool(obj['spool_file']) as spool:
+        count = spool.purge()
+    click.echo(f'{count} spooled alerts deleted')
@@ -1,6 +1,9 @@
+import sys
+
 import click
 
-from alertaclient.utils import build_query
+from alertaclient.utils import (CONCURRENCY, build_query, bulk_progressbar,
+                                open_checkpoint)
 
 
 @click.command('untag', short_help='Untag alerts')
@@ -8,20 +11,26 @@ from alertaclient.utils import build_query
 @click.option('--query', '-q', 'query', metavar='QUERY', help='severity:"warning" AND resource:web')
 @click.option('--filter', '-f', 'filters', metavar='FILTER', multiple=True, help='KEY=VALUE eg. serverity=warning resource=web')
 @click.option('--tag', '-T', 'tags', required=True, multiple=True, help='List of tags')
+@click.option('--concurrency', '-c', metavar='NUM|auto', type=CONCURRENCY, default='auto', show_default=True,
+              help='Alerts updated in parallel, "auto" adapts to API latency and errors')
+@click.option('--resume', metavar='FILE', help='Continue an interrupted run from its checkpoint file')
 @click.pass_obj
-def cli(obj, ids, query, filters, tags):
+def cli(obj, ids, query, filters, tags, concurrency, resume):
     """Remove tags from alerts."""
     client = obj['client']
     if ids:
         total = len(ids)
+        checkpoint = open_checkpoint('untag', resume, ids=ids, tags=tags)
+        ids = checkpoint.skip_completed(ids)
     else:
         if query:
             query = [('q', query)]
         else:
             query = build_query(filters)
         total, _, _ = client.get_count(query)
-        ids = [a.id for a in client.get_alerts(query)]
+        checkpoint = open_checkpoint('untag', resume, query=query, tags=tags)
+        ids = checkpoint.alert_ids(client, query)
 
-    with click.progressbar(ids, label=f'Untagging {total} alerts') as bar:
-        for id in bar:
-            client.untag_alert(id, tags)
+    if bulk_progressbar(lambda id: client.untag_alert(id, tags), ids, f'Untagging {total} alerts', concurrency, total, checkpoint,
+                        client.http.pool_maxsize):
+        sys.exit(1)
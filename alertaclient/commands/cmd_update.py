@@ -1,6 +1,9 @@
+import sys
+
 import click
 
-from alertaclient.utils import build_query
+from alertaclient.utils import (CONCURRENCY, build_query, bulk_progressbar,
+                                open_checkpoint)
 
 
 @click.command('update', short_help='Update alert attributes')
@@ -8,20 +11,27 @@ from alertaclient.utils import build_query
 @click.option('--query', '-q', 'query', metavar='QUERY', help='severity:"warning" AND resource:web')
 @click.option('--filter', '-f', 'filters', metavar='FILTER', multiple=True, help='KEY=VALUE eg. serverity=warning resource=web')
 @click.option('--attributes', '-A', metavar='KEY=VALUE', multiple=True, required=True, help='List of attributes eg. priority=high')
+@click.option('--concurrency', '-c', metavar='NUM|auto', type=CONCURRENCY, default='auto', show_default=True,
+              help='Alerts updated in parallel, "auto" adapts to API latency and errors')
+@click.option('--resume', metavar='FILE', help='Continue an interrupted run from its checkpoint file')
 @click.pass_obj
-def cli(obj, ids, query, filters, attributes):
+def cli(obj, ids, query, filters, attributes, concurrency, resume):
     """Update alert attributes."""
     client = obj['client']
     if ids:
         total = len(ids)
+        checkpoint = open_checkpoint('update', resume, ids=ids, attributes=attributes)
+        ids = checkpoint.skip_completed(ids)
     else:
         if query:
             query = [('q', query)]
         else:
             query = build_query(filters)
         total, _, _ = client.get_count(query)
-        ids = [a.id for a in client.get_alerts(query)]
+        checkpoint = open_checkpoint('update', resume, query=query, attributes=attributes)
+        ids = checkpoint.alert_ids(client, query)
 
-    with click.progressbar(ids, label=f'Updating {total} alerts') as bar:
-        for id in bar:
-            client.update_attributes(id, dict(a.split('=') for a in attributes))
+    attributes = dict(a.split('=') for a in attributes)
+    if bulk_progressbar(lambda id: client.update_attributes(id, attributes), ids, f'Updating {total} alerts', concurrency, total, checkpoint,
+                        client.http.pool_maxsize):
+        sys.exit(1)
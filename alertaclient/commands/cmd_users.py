@@ -1,8 +1,8 @@
-import json
-
 import click
 from tabulate import tabulate
 
+from alertaclient.utils import json_codec
+
 
 @click.command('users', short_help='List users')
 @click.option('--role', 'roles', multiple=True, help='Filter users by role')
@@ -14,7 +14,7 @@ def cli(obj, roles):
 
     if obj['output'] == 'json':
         r = client.http.get('/users', query)
-        click.echo(json.dumps(r['users'], sort_keys=True, indent=4, ensure_ascii=False))
+        click.echo(json_codec.dumps(r['users'], sort_keys=True, indent=4))
     else:
         timezone = obj['timezone']
         headers = {'id': 'ID', 'name': 'USER', 'email': 'EMAIL', 'roles': 'ROLES', 'status': 'STATUS', 'text': 'TEXT',
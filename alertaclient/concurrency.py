@@ -0,0 +1,137 @@
+import logging
+import threading
+import time
+from collections import deque
+
+from alertaclient.exceptions import is_transient
+
+logger = logging.getLogger('alerta.client')
+
+AUTO = 'auto'
+
+
+class AdaptiveLimiter:
+    """
+    Concurrency limit that adapts to how the API is coping (AIMD).
+
+    The limit grows while latency is stable, by one for every request that
+    succeeds until the first decrease ("slow start") and by 1/limit after
+    that ie. about one per round of requests. It is multiplied by backoff
+    when the API is overloaded (429, 5xx or connection errors) or when the
+    p95 latency of recent requests rises above tolerance times the lowest
+    p95 seen. At min_limit a rise in latency is not caused by the load, so
+    it becomes the new lowest instead. Requests started before the last
+    decrease do not decrease it again, so a burst of errors from the same
+    round only counts once.
+
+    Call acquire() before each request, which waits until there are fewer
+    than the limit in flight, and release() with the value it returned
+    when the request completes.
+    """
+
+    def __init__(self, initial=4, min_limit=1, max_limit=64, backoff=0.5, tolerance=2.0, window=100, min_samples=10):
+        if not 1 <= min_limit <= max_limit:
+            raise ValueError('Limits must be 1 <= min_limit <= max_limit')
+        if not 0 < backoff < 1:
+            raise ValueError('Backoff must be between 0 and 1')
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.backoff = backoff
+        self.tolerance = tolerance
+        self.min_samples = min_samples
+
+        self._cond = threading.Condition()
+        self._limit = float(min(max(initial, min_limit), max_limit))
+        self._samples = deque(maxlen=window)
+        self._baseline = None  # lowest p95 latency, drifts up slowly
+        self._slow_start = True
+        self._decreased = 0.0  # time of last decrease
+
+        self.in_flight = 0
+        self.completed = 0
+        self.increases = 0
+        self.decreases = 0
+        self.overloads = 0
+        self.spikes = 0
+
+    def __repr__(self):
+        return 'AdaptiveLimiter(limit={}, in_flight={}, min_limit={!r}, max_limit={!r})'.format(
+            self.current, self.in_flight, self.min_limit, self.max_limit)
+
+    @property
+    def current(self):
+        """Requests allowed in flight now."""
+        return int(self._limit)
+
+    def acquire(self):
+        """Wait for a free slot. Returns the start time to pass to release()."""
+        with self._cond:
+            while self.in_flight >= int(self._limit):
+                self._cond.wait()
+            self.in_flight += 1
+            return time.monotonic()
+
+    def release(self, start=None, latency=None, error=None):
+        """
+        Free the slot taken by acquire() and adjust the limit for the result
+        of the request. A request that was never sent has no latency.
+        """
+        with self._cond:
+            self.in_flight -= 1
+            if latency is not None:
+                self.completed += 1
+                self._update(start, latency, error)
+            self._cond.notify_all()
+
+    def _update(self, start, latency, error):
+        if error is not None and is_transient(error):
+            self.overloads += 1
+            self._decrease(start, 'overloaded: {}'.format(error))
+            return
+
+        if start is None or start >= self._decreased:
+            self._samples.append(latency)  # requests from before the last decrease saw the old load
+        if len(self._samples) >= self.min_samples:
+            p95 = self._p95()
+            if self._baseline is None or p95 < self._baseline:
+                self._baseline = p95
+            else:
+                self._baseline += (p95 - self._baseline) * 0.01
+            if p95 > self._baseline * self.tolerance and self._limit <= self.min_limit:
+                self._baseline = p95  # not caused by our load, so is the new normal
+            elif p95 > self._baseline * self.tolerance:
+                self.spikes += 1
+                self._decrease(start, 'p95 latency {:.0f}ms'.format(p95 * 1000))
+                return
+
+        if error is None and self._limit < self.max_limit:
+            self._limit = min(self.max_limit, self._limit + (1 if self._slow_start else 1 / self._limit))
+            self.increases += 1
+
+    def _p95(self):
+        samples = sorted(self._samples)
+        return samples[min(len(samples) - 1, int(len(samples) * 0.95))]
+
+    def _decrease(self, start, reason):
+        if start is not None and start < self._decreased:
+            return
+        self._limit = max(self.min_limit, self._limit * self.backoff)
+        self._decreased = time.monotonic()
+        self._slow_start = False
+        self._samples.clear()
+        self.decreases += 1
+        logger.debug('Concurrency limit decreased to %d, %s', self._limit, reason)
+
+    def serialize(self):
+        with self._cond:
+            return {
+                'limit': self.current,
+                'inFlight': self.in_flight,
+                'minLimit': self.min_limit,
+                'maxLimit': self.max_limit,
+                'completed': self.completed,
+                'increases': self.increases,
+                'decreases': self.decreases,
+                'overloads': self.overloads,
+                'spikes': self.spikes
+            }
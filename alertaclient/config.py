@@ -4,6 +4,7 @@ import os
 
 import requests
 
+from alertaclient.balancer import parse_endpoints
 from alertaclient.exceptions import ClientException
 
 default_config = {
@@ -20,6 +21,20 @@ default_config = {
     'sslverify': True,
     'sslcert': None,
     'sslkey': None,
+    'pool_connections': 10,
+    'pool_maxsize': 10,
+    'pool_block': False,
+    'keepalive': None,
+    'retries': 3,
+    'backoff': 0.5,
+    'compression': False,
+    'compression_threshold': 1024,
+    'balancer': 'round-robin',
+    'http2': False,
+    'read_rate': None,
+    'write_rate': None,
+    'rate_burst': None,
+    'spool_file': '~/.alerta.spool',
     'output': 'simple',
     'color': True,
     'debug': False
@@ -56,16 +71,27 @@ class Config:
         self.options['profile'] = want_profile
         self.options['endpoint'] = os.environ.get('ALERTA_ENDPOINT', self.options['endpoint'])
         self.options['key'] = os.environ.get('ALERTA_API_KEY', self.options['key'])
+        self.options['pool_connections'] = os.environ.get('ALERTA_POOL_CONNECTIONS', self.options['pool_connections'])
+        self.options['pool_maxsize'] = os.environ.get('ALERTA_POOL_MAXSIZE', self.options['pool_maxsize'])
+        if 'ALERTA_POOL_BLOCK' in os.environ:
+            self.options['pool_block'] = self.parser.BOOLEAN_STATES.get(os.environ['ALERTA_POOL_BLOCK'].lower(), False)
+        self.options['keepalive'] = os.environ.get('ALERTA_KEEPALIVE', self.options['keepalive'])
 
     def get_remote_config(self, endpoint=None):
-        config_url = '{}/config'.format(endpoint or self.options['endpoint'])
-        try:
-            r = requests.get(config_url, verify=self.options['sslverify'], cert=(self.options['sslcert'], self.options['sslkey']))
-            r.raise_for_status()
-            remote_config = r.json()
-        except requests.RequestException as e:
-            raise ClientException(f'Failed to get config from {config_url}. Reason: {e}')
-        except json.decoder.JSONDecodeError:
-            raise ClientException(f'Failed to get config from {config_url}: Reason: not a JSON object')
+        # with multiple endpoints use the config of the first one that responds
+        endpoints = parse_endpoints(endpoint or self.options['endpoint'])
+        for i, endpoint in enumerate(endpoints):
+            config_url = f'{endpoint}/config'
+            try:
+                r = requests.get(config_url, verify=self.options['sslverify'], cert=(self.options['sslcert'], self.options['sslkey']))
+                r.raise_for_status()
+                remote_config = r.json()
+                break
+            except requests.RequestException as e:
+                if i + 1 < len(endpoints):
+                    continue
+                raise ClientException(f'Failed to get config from {config_url}. Reason: {e}')
+            except json.decoder.JSONDecodeError:
+                raise ClientException(f'Failed to get config from {config_url}: Reason: not a JSON object')
 
         self.options = {**remote_config, **self.options}
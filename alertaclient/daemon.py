@@ -0,0 +1,121 @@
+import logging
+import threading
+import time
+
+from alertaclient.retry import Retry
+
+logger = logging.getLogger('alerta.client')
+
+
+class HeartbeatDaemon:
+    """
+    Call send() every interval seconds until stopped.
+
+    Sends are scheduled at fixed offsets from the start time so that slow
+    sends do not make the schedule drift; if a send overruns one or more
+    intervals the missed sends are skipped, not made up. A failed send is
+    retried with exponential backoff (by default 1s, 2s, 4s... with jitter)
+    until the next scheduled send, and failures are passed to
+    on_error(exc, delay).
+
+    Call reload() (eg. from a SIGHUP handler) to have on_reload() called
+    from the run() thread before the next send, and stop() to return from
+    run().
+    """
+
+    def __init__(self, send, interval, backoff=None, on_reload=None, on_error=None):
+        if interval <= 0:
+            raise ValueError('Interval must be greater than zero')
+        self.send = send
+        self.interval = interval
+        self.backoff = backoff or Retry(backoff_factor=1.0, backoff_max=interval)
+        self.on_reload = on_reload
+        self.on_error = on_error
+
+        self._wakeup = threading.Event()
+        self._reload = False
+        self._stopped = False
+
+        self.sent = 0
+        self.failed = 0
+        self.skipped = 0
+        self.reloads = 0
+        self.failures = 0  # consecutive
+
+    def __repr__(self):
+        return 'HeartbeatDaemon(interval={!r}, sent={}, failed={}, skipped={})'.format(
+            self.interval, self.sent, self.failed, self.skipped)
+
+    def reload(self):
+        self._reload = True
+        self._wakeup.set()
+
+    def stop(self):
+        self._stopped = True
+        self._wakeup.set()
+
+    def _sleep_until(self, deadline):
+        while not self._stopped and not self._reload:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return
+            self._wakeup.wait(remaining)
+            self._wakeup.clear()
+
+    def _next_slot(self, slot):
+        slot += self.interval
+        now = time.monotonic()
+        if slot <= now:
+            missed = int((now - slot) // self.interval) + 1
+            logger.debug('Heartbeat overran schedule, skipping %d', missed)
+            self.skipped += missed
+            slot += missed * self.interval
+        return slot
+
+    def _do_reload(self):
+        self._reload = False
+        try:
+            self.on_reload()
+            self.reloads += 1
+        except Exception as e:
+            logger.warning('Reload failed, keeping current config: %s', e)
+
+    def run(self):
+        slot = due = time.monotonic()  # slot is the next scheduled send, due the next send or retry
+        while True:
+            self._sleep_until(due)
+            if self._stopped:
+                return
+            if self._reload:
+                if self.on_reload:
+                    self._do_reload()
+                else:
+                    self._reload = False
+                continue
+
+            if time.monotonic() >= slot:
+                slot = self._next_slot(slot)
+            try:
+                self.send()
+            except Exception as e:
+                self.failed += 1
+                self.failures += 1
+                delay = self.backoff.backoff(self.failures - 1)
+                due = min(time.monotonic() + delay, slot)
+                if self.on_error:
+                    self.on_error(e, due - time.monotonic())
+                else:
+                    logger.warning('Heartbeat failed: %s', e)
+            else:
+                self.sent += 1
+                self.failures = 0
+                due = slot
+
+    def serialize(self):
+        return {
+            'interval': self.interval,
+            'sent': self.sent,
+            'failed': self.failed,
+            'skipped': self.skipped,
+            'reloads': self.reloads
+        }
@@ -1,3 +1,5 @@
+import requests
+
 try:
     from click import ClickException as ClientException  # type: ignore
 except Exception:
@@ -22,4 +24,19 @@ class ApiError(AlertaException):
 
 
 class UnknownError(AlertaException):
+
+    def __init__(self, message, status_code=None):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+class CircuitOpenError(AlertaException):
     pass
+
+
+def is_transient(error):
+    """True if a failed request may succeed later ie. the API was unreachable or unavailable."""
+    if isinstance(error, (requests.exceptions.RequestException, CircuitOpenError)):
+        return True
+    status_code = getattr(error, 'status_code', None)
+    return status_code is not None and (status_code == 429 or status_code >= 500)
@@ -0,0 +1,116 @@
+import atexit
+import logging
+import platform
+from datetime import datetime
+
+from alertaclient.coalesce import Coalescer
+from alertaclient.sender import BLOCK, DROP_LOWEST_SEVERITY, BufferedSender
+
+# most severe first, a record gets the severity of the first level it is at or above
+LEVEL_SEVERITY = (
+    (logging.CRITICAL, 'critical'),
+    (logging.ERROR, 'major'),
+    (logging.WARNING, 'warning'),
+    (logging.INFO, 'informational'),
+    (logging.DEBUG, 'debug'),
+    (logging.NOTSET, 'trace')
+)
+
+# records about sending alerts must not become alerts themselves
+IGNORE_LOGGERS = ('alerta.client', 'urllib3', 'requests')
+
+
+class AlertaLogHandler(logging.Handler):
+    """
+    Logging handler that sends log records as alerts.
+
+    Records are mapped to alerts and queued without waiting for the API: a
+    Coalescer merges repeats of the same alert within window seconds and a
+    BufferedSender sends the rest from a background thread in batches. When
+    the queue is full the least severe alert is dropped ("drop_lowest_severity")
+    or the oldest ("drop_oldest"); logging calls never block. Flushing and
+    closing the handler, including at exit, wait at most shutdown_timeout
+    seconds for the API and then drop unsent alerts. Errors are reported
+    with Handler.handleError() and never raised.
+
+    The resource defaults to the host name and the event to the logger
+    name. Alert fields can be set for a single record with eg.
+    extra={'alerta': {'resource': 'db01', 'event': 'DiskFull'}}.
+    """
+
+    def __init__(self, client, level=logging.WARNING, resource=None, event=None, environment=None, service=None,
+                 group=None, tags=None, attributes=None, origin=None, type='logAlert', timeout=None, customer=None,
+                 window=60.0, maxsize=10000, batch_size=100, flush_interval=1.0, policy=DROP_LOWEST_SEVERITY,
+                 shutdown_timeout=5.0):
+        if policy == BLOCK:
+            raise ValueError('Policy "block" would block logging calls when the queue is full')
+        super().__init__(level)
+        self.resource = resource or platform.uname()[1]
+        self.event = event
+        self.static = dict(
+            environment=environment,
+            service=service,
+            group=group,
+            tags=tags,
+            origin=origin or f'python/{self.resource}',
+            type=type,
+            timeout=timeout,
+            customer=customer
+        )
+        self.attributes = attributes or dict()
+        self.shutdown_timeout = shutdown_timeout
+
+        self.sender = BufferedSender(client, maxsize=maxsize, batch_size=batch_size, flush_interval=flush_interval,
+                                     workers=1, policy=policy, shutdown_timeout=shutdown_timeout)
+        self.coalescer = Coalescer(self.sender, window=window, merge_attribute='repeats')
+
+        # registered after the sender's exit hook so runs first, flushing merged alerts into the queue
+        atexit.register(self.close)
+
+    @staticmethod
+    def severity(levelno):
+        for level, severity in LEVEL_SEVERITY:
+            if levelno >= level:
+                return severity
+
+    def map_record(self, record):
+        """Return the send_alert() arguments for a log record."""
+        alert = dict(
+            self.static,
+            resource=self.resource,
+            event=self.event or record.name,
+            severity=self.severity(record.levelno),
+            value=record.levelname,
+            text=record.getMessage(),
+            attributes=dict(self.attributes, logger=record.name, module=record.module,
+                            function=record.funcName, line=record.lineno, thread=record.threadName),
+            create_time=datetime.utcfromtimestamp(record.created)
+        )
+        if record.exc_info:
+            alert['raw_data'] = (self.formatter or logging.Formatter()).formatException(record.exc_info)
+        alert.update(getattr(record, 'alerta', None) or {})
+        return alert
+
+    def emit(self, record):
+        if any(record.name == name or record.name.startswith(name + '.') for name in IGNORE_LOGGERS):
+            return
+        try:
+            self.coalescer.send_alert(**self.map_record(record))
+        except Exception:
+            self.handleError(record)
+
+    def flush(self, timeout=None):
+        """
+        Send merged and queued alerts now. Returns False if not done within
+        timeout seconds, by default shutdown_timeout.
+        """
+        self.coalescer.flush()
+        return self.sender.flush(self.shutdown_timeout if timeout is None else timeout)
+
+    def close(self):
+        atexit.unregister(self.close)
+        try:
+            self.coalescer.close()
+            self.sender.close(self.shutdown_timeout)
+        finally:
+            super().close()
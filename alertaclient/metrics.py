@@ -0,0 +1,198 @@
+import bisect
+import logging
+import re
+import threading
+
+from tabulate import tabulate
+
+logger = logging.getLogger('alerta.client')
+
+ID_SEGMENT = re.compile(r'^([0-9a-fA-F]{8}(-[0-9a-fA-F]{4}){3}-[0-9a-fA-F]{12}|(?=.*\d)[\w.~-]{8,}|\d+)$')
+
+
+def path_template(path):
+    """
+    Replace alert, user, key, etc. ids in a request path with "{id}"
+    eg. /alert/d1340d76-2277-4d47-937f-571bc1da6411/action -> /alert/{id}/action
+    """
+    return '/'.join('{id}' if ID_SEGMENT.match(s) else s for s in path.split('?', 1)[0].split('/'))
+
+
+class RequestInfo:
+    """
+    Details of a single API request passed to every hook.
+
+    Timings are in seconds: "connect" is DNS lookup, TCP connect and TLS
+    handshake (zero for a pooled connection), "ttfb" is the time from
+    sending the request to receiving the response headers, "download" is
+    reading the response body and "decode" is JSON decoding. "throttle" is
+    time spent waiting for the rate limiter. "total" is the wall-clock time
+    including any retries.
+    """
+
+    def __init__(self, method, path, request_id=None):
+        self.method = method
+        self.path = path
+        self.path_template = path_template(path)
+        self.request_id = request_id
+        self.url = None
+        self.status = None
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.attempts = 0
+        self.timings = {'connect': 0.0, 'ttfb': 0.0, 'download': 0.0, 'decode': 0.0, 'throttle': 0.0, 'total': 0.0}
+        self.error = None
+
+    def __repr__(self):
+        return 'RequestInfo(method={!r}, path_template={!r}, status={!r}, total={:.3f}s)'.format(
+            self.method, self.path_template, self.status, self.timings['total'])
+
+    @property
+    def endpoint(self):
+        return f'{self.method} {self.path_template}'
+
+
+class Hooks:
+    """
+    Request lifecycle callbacks. Each callback is called with a RequestInfo
+    object. Exceptions raised by callbacks are logged and ignored.
+    """
+
+    EVENTS = ('before_request', 'after_response', 'on_error')
+
+    def __init__(self):
+        self._hooks = {event: list() for event in self.EVENTS}
+
+    def add(self, event, callback):
+        if event not in self._hooks:
+            raise ValueError('Unknown hook "{}". Must be one of {}'.format(event, ', '.join(self.EVENTS)))
+        self._hooks[event].append(callback)
+
+    def remove(self, event, callback):
+        self._hooks[event].remove(callback)
+
+    def register(self, listener):
+        """Add any "before_request", "after_response" and "on_error" methods of listener."""
+        for event in self.EVENTS:
+            if callable(getattr(listener, event, None)):
+                self.add(event, getattr(listener, event))
+        return listener
+
+    def __bool__(self):
+        return any(self._hooks.values())
+
+    def trigger(self, event, info):
+        for callback in list(self._hooks[event]):  # hooks may be added by other threads
+            try:
+                callback(info)
+            except Exception as e:
+                logger.warning('Hook %s %r failed: %s', event, callback, e)
+
+    def before_request(self, info):
+        self.trigger('before_request', info)
+
+    def after_response(self, info):
+        self.trigger('after_response', info)
+
+    def on_error(self, info):
+        self.trigger('on_error', info)
+
+
+class LatencyHistogram:
+    """
+    Fixed-size latency histogram with logarithmic buckets from 100us to
+    about 2 minutes. Percentiles are accurate to within 5%.
+    """
+
+    BOUNDS = [0.0001 * 1.05 ** n for n in range(290)]
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.counts = [0] * (len(self.BOUNDS) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def record(self, seconds):
+        i = bisect.bisect_left(self.BOUNDS, seconds)
+        with self._lock:
+            self.counts[i] += 1
+            self.count += 1
+            self.sum += seconds
+            self.max = max(self.max, seconds)
+
+    def percentile(self, p):
+        with self._lock:
+            if not self.count:
+                return 0.0
+            rank = p / 100 * self.count
+            seen = 0
+            for i, n in enumerate(self.counts):
+                seen += n
+                if seen >= rank and n:
+                    return min(self.BOUNDS[i] if i < len(self.BOUNDS) else self.max, self.max)
+            return self.max
+
+    @property
+    def mean(self):
+        return self.sum / self.count if self.count else 0.0
+
+
+class HistogramCollector:
+    """
+    Hook listener that records per-endpoint latency histograms.
+
+        collector = client.http.hooks.register(HistogramCollector())
+        ...
+        print(collector.format())
+    """
+
+    def __init__(self, timing='total'):
+        self.timing = timing
+        self._lock = threading.Lock()
+        self.histograms = dict()
+        self.errors = dict()
+
+    def _histogram(self, endpoint):
+        with self._lock:
+            if endpoint not in self.histograms:
+                self.histograms[endpoint] = LatencyHistogram()
+            return self.histograms[endpoint]
+
+    def after_response(self, info):
+        self._histogram(info.endpoint).record(info.timings[self.timing])
+
+    def on_error(self, info):
+        self._histogram(info.endpoint).record(info.timings[self.timing])
+        with self._lock:
+            self.errors[info.endpoint] = self.errors.get(info.endpoint, 0) + 1
+
+    def reset(self):
+        with self._lock:
+            self.histograms.clear()
+            self.errors.clear()
+
+    def report(self):
+        with self._lock:
+            histograms = sorted(self.histograms.items())
+            errors = dict(self.errors)
+        return [
+            {
+                'endpoint': endpoint,
+                'count': h.count,
+                'errors': errors.get(endpoint, 0),
+                'mean': h.mean,
+                'p50': h.percentile(50),
+                'p95': h.percentile(95),
+                'p99': h.percentile(99),
+                'max': h.max
+            } for endpoint, h in histograms
+        ]
+
+    def format(self, tablefmt='simple'):
+        headers = {'endpoint': 'ENDPOINT', 'count': 'COUNT', 'errors': 'ERRORS', 'mean': 'MEAN',
+                   'p50': 'P50', 'p95': 'P95', 'p99': 'P99', 'max': 'MAX'}
+        rows = [
+            {k: f'{v * 1000:.1f}ms' if isinstance(v, float) else v for k, v in r.items()} for r in self.report()
+        ]
+        return tabulate(rows, headers=headers, tablefmt=tablefmt)
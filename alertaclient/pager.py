@@ -0,0 +1,133 @@
+import itertools
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+
+class Pager:
+    """
+    Iterate over the pages of a paged resource, yielding the list of items
+    under key from each page.
+
+    With prefetch, up to that many of the following pages are fetched in
+    background threads while the current page is being processed. Page 1
+    is always fetched on its own first: most results fit on one page, and
+    once the server reports the number of pages no page past the last is
+    requested. Otherwise pages are requested speculatively and the walk
+    stops at the first short page (or "more" is false); any later pages
+    still in flight are discarded and counted as wasted. The walk never
+    goes past the last page implied by "total", and stops if a page has
+    the same items as the one before, as from a server that ignores page.
+
+    With reverse, the pages are walked last to first (then page 1), so that
+    items changed or deleted while walking do not shift later items onto
+    pages that have already been fetched. This needs the page count, so
+    falls back to page order if the server does not report it. A reverse
+    walk can start from start_page instead of the last page.
+
+    The page attribute is the number of the page last yielded.
+    """
+
+    def __init__(self, http, path, key, query=None, page_size=None, prefetch=0, reverse=False, start_page=None):
+        self.http = http
+        self.path = path
+        self.key = key
+        self.query = query
+        self.page_size = page_size or http.DEFAULT_PAGE_SIZE
+        self.prefetch = int(prefetch or 0)
+        self.reverse = reverse
+        self.start_page = start_page
+        self.page = None
+
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.wasted = 0
+
+    def __repr__(self):
+        return 'Pager(path={!r}, page_size={!r}, prefetch={!r}, requests={!r}, wasted={!r})'.format(
+            self.path, self.page_size, self.prefetch, self.requests, self.wasted)
+
+    def __iter__(self):
+        return self.pages()
+
+    def fetch(self, page):
+        with self._lock:
+            self.requests += 1
+        return self.http.get(self.path, self.query, page=page, page_size=self.page_size)
+
+    def more(self, r, page):
+        items = r.get(self.key) or []
+        if len(items) > self.page_size:
+            return False  # paging not supported, everything on one page
+        if r.get('total') is not None and page * self.page_size >= r['total']:
+            return False
+        if 'more' in r:
+            return bool(r['more'] and items)
+        if 'pages' in r:
+            return page < r['pages']
+        return len(items) == self.page_size
+
+    def last_page(self, r):
+        if r.get('pages'):
+            return r['pages']
+        if r.get('total'):
+            return -(-r['total'] // self.page_size)
+        return None
+
+    @staticmethod
+    def ids(items):
+        return [item.get('id') if isinstance(item, dict) else item for item in items]
+
+    def pages(self):
+        first = self.fetch(1)
+        if not self.more(first, 1):
+            self.page = 1
+            yield first.get(self.key) or []
+            return
+
+        last = self.last_page(first)
+        reverse = self.reverse and last is not None
+        if reverse:
+            numbers = iter(range(min(last, self.start_page or last), 1, -1))
+        else:
+            self.page = 1
+            yield first.get(self.key) or []
+            numbers = iter(range(2, last + 1)) if last else itertools.count(2)
+
+        executor = ThreadPoolExecutor(self.prefetch, thread_name_prefix='alerta-pager') if self.prefetch else None
+        pending = deque()  # (page, future) in page order; future is None if not prefetched
+
+        def fill():
+            # keep prefetch pages in flight beyond the one being processed
+            while len(pending) < max(1, self.prefetch):
+                page = next(numbers, None)
+                if page is None:
+                    return
+                pending.append((page, executor.submit(self.fetch, page) if executor else None))
+
+        previous = self.ids(first.get(self.key) or [])
+        try:
+            fill()
+            while pending:
+                page, future = pending.popleft()
+                r = future.result() if future else self.fetch(page)
+                ids = self.ids(r.get(self.key) or [])
+                if ids and ids == previous:
+                    break  # server ignores page and returns the same items every time
+                previous = ids
+                self.page = page
+                if not reverse and not self.more(r, page):
+                    yield r.get(self.key) or []
+                    break
+                fill()
+                yield r.get(self.key) or []
+        finally:
+            for _, future in pending:
+                if future and not future.cancel():
+                    self.wasted += 1
+            if executor:
+                executor.shutdown(wait=True)
+
+        if reverse:
+            self.page = 1
+            yield first.get(self.key) or []
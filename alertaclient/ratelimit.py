@@ -0,0 +1,127 @@
+import logging
+import threading
+import time
+
+logger = logging.getLogger('alerta.client')
+
+READ = 'read'
+WRITE = 'write'
+
+
+class TokenBucket:
+    """
+    Token bucket that smooths bursts by making callers wait for a token
+    instead of rejecting them. Tokens are added at rate per second up to
+    burst. Waiting callers are served in the order they arrived.
+    """
+
+    def __init__(self, rate, burst=None):
+        if rate <= 0:
+            raise ValueError('Rate must be greater than zero')
+        self.rate = float(rate)
+        self.burst = float(burst or max(1.0, self.rate))
+
+        self._lock = threading.Lock()
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+
+        self.acquired = 0
+        self.throttled = 0
+        self.waited = 0.0
+
+    def __repr__(self):
+        return 'TokenBucket(rate={!r}, burst={!r}, tokens={:.2f})'.format(self.rate, self.burst, self.tokens)
+
+    def _refill(self, now):
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    @property
+    def tokens(self):
+        """Tokens available now. Negative if callers are waiting."""
+        with self._lock:
+            self._refill(time.monotonic())
+            return self._tokens
+
+    @property
+    def wait_time(self):
+        """Seconds the next caller would have to wait for a token."""
+        with self._lock:
+            self._refill(time.monotonic())
+            return max(0.0, (1 - self._tokens) / self.rate)
+
+    def reserve(self, tokens=1):
+        """Take tokens, possibly on credit, and return the seconds to wait before using them."""
+        with self._lock:
+            self._refill(time.monotonic())
+            self._tokens -= tokens
+            wait = max(0.0, -self._tokens / self.rate)
+            self.acquired += 1
+            if wait:
+                self.throttled += 1
+                self.waited += wait
+            return wait
+
+    def acquire(self, tokens=1):
+        """Wait until tokens are available. Returns the seconds waited."""
+        wait = self.reserve(tokens)
+        if wait:
+            time.sleep(wait)
+        return wait
+
+    def serialize(self):
+        with self._lock:
+            self._refill(time.monotonic())
+            return {
+                'rate': self.rate,
+                'burst': self.burst,
+                'tokens': self._tokens,
+                'waitTime': max(0.0, (1 - self._tokens) / self.rate),
+                'acquired': self.acquired,
+                'throttled': self.throttled,
+                'waited': self.waited
+            }
+
+
+class RateLimiter:
+    """
+    Separate request rate budgets for reads (GET requests eg. /alerts,
+    /alerts/count) and writes (everything else eg. POST /alert,
+    PUT /alert/{id}/action, POST /heartbeat). A rate of None is unlimited.
+    """
+
+    def __init__(self, read=None, write=None, burst=None):
+        self.buckets = dict()
+        if read:
+            self.buckets[READ] = TokenBucket(read, burst)
+        if write:
+            self.buckets[WRITE] = TokenBucket(write, burst)
+
+    def __repr__(self):
+        return 'RateLimiter({})'.format(', '.join(f'{k}={v.rate!r}' for k, v in self.buckets.items()))
+
+    def __bool__(self):
+        return bool(self.buckets)
+
+    @classmethod
+    def from_value(cls, rate_limit):
+        if rate_limit is None or isinstance(rate_limit, RateLimiter):
+            return rate_limit
+        return cls(read=float(rate_limit), write=float(rate_limit))
+
+    @staticmethod
+    def operation(method):
+        return READ if method.upper() in ('GET', 'HEAD', 'OPTIONS') else WRITE
+
+    def acquire(self, method, path=None):
+        """Wait for a token for this request. Returns the seconds waited."""
+        bucket = self.buckets.get(self.operation(method))
+        if not bucket:
+            return 0.0
+        wait = bucket.acquire()
+        if wait:
+            logger.debug('Rate limited %s %s for %.3fs', method, path or '', wait)
+        return wait
+
+    def serialize(self):
+        return {op: bucket.serialize() for op, bucket in self.buckets.items()}
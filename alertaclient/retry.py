@@ -0,0 +1,111 @@
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+
+
+class Retry:
+    """
+    Retry policy with capped exponential backoff, optional full jitter
+    and support for the "Retry-After" response header.
+    """
+
+    DEFAULT_STATUS_FORCELIST = frozenset([429, 502, 503, 504])
+    DEFAULT_METHODS = frozenset(['GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE'])  # idempotent
+
+    def __init__(self, total=3, backoff_factor=0.5, backoff_max=30.0, jitter=True, status_forcelist=None,
+                 methods=None, respect_retry_after=True):
+        self.total = total
+        self.backoff_factor = backoff_factor
+        self.backoff_max = backoff_max
+        self.jitter = jitter
+        self.status_forcelist = frozenset(status_forcelist or self.DEFAULT_STATUS_FORCELIST)
+        self.methods = frozenset(m.upper() for m in (methods or self.DEFAULT_METHODS))
+        self.respect_retry_after = respect_retry_after
+
+    def __repr__(self):
+        return 'Retry(total={!r}, backoff_factor={!r}, backoff_max={!r}, jitter={!r})'.format(
+            self.total, self.backoff_factor, self.backoff_max, self.jitter)
+
+    @classmethod
+    def from_value(cls, retry):
+        if isinstance(retry, Retry):
+            return retry
+        if retry is None:
+            return cls()
+        return cls(total=int(retry))
+
+    def is_retryable_method(self, method):
+        return method.upper() in self.methods
+
+    def is_retryable_status(self, status_code):
+        return status_code in self.status_forcelist
+
+    def backoff(self, attempt):
+        delay = min(self.backoff_max, self.backoff_factor * (2 ** attempt))
+        if self.jitter:
+            return random.uniform(0, delay)
+        return delay
+
+    def get_retry_after(self, response):
+        value = response.headers.get('Retry-After') if response is not None else None
+        if not value:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+        except (TypeError, ValueError):
+            return None
+
+    def sleep_time(self, attempt, response=None):
+        """
+        Seconds to wait before the next attempt, or None if the server asked
+        for a longer pause than the policy allows.
+        """
+        if self.respect_retry_after:
+            retry_after = self.get_retry_after(response)
+            if retry_after is not None:
+                return retry_after if retry_after <= self.backoff_max else None
+        return self.backoff(attempt)
+
+
+class RetryStats:
+    """Thread-safe counters of retry activity for a HTTP client."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.retries = 0
+        self.retried_requests = 0
+        self.exhausted = 0
+        self.reasons = dict()
+
+    def __repr__(self):
+        return 'RetryStats(requests={!r}, retries={!r}, retried_requests={!r}, exhausted={!r})'.format(
+            self.requests, self.retries, self.retried_requests, self.exhausted)
+
+    def record_request(self, retries, exhausted=False):
+        with self._lock:
+            self.requests += 1
+            if retries:
+                self.retried_requests += 1
+            if exhausted:
+                self.exhausted += 1
+
+    def record_retry(self, reason):
+        with self._lock:
+            self.retries += 1
+            self.reasons[reason] = self.reasons.get(reason, 0) + 1
+
+    def serialize(self):
+        with self._lock:
+            return {
+                'requests': self.requests,
+                'retries': self.retries,
+                'retriedRequests': self.retried_requests,
+                'exhausted': self.exhausted,
+                'reasons': dict(self.reasons)
+            }
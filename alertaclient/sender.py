@@ -0,0 +1,263 @@
+import atexit
+import itertools
+import logging
+import threading
+import time
+from collections import deque
+
+logger = logging.getLogger('alerta.client')
+
+# same order as the default Alerta server severity map, most severe first
+SEVERITY_LEVELS = {
+    'security': 0,
+    'critical': 1,
+    'major': 2,
+    'minor': 3,
+    'warning': 4,
+    'indeterminate': 5,
+    'informational': 6,
+    'normal': 7,
+    'ok': 7,
+    'cleared': 7,
+    'debug': 8,
+    'trace': 9,
+    'unknown': 10
+}
+DEFAULT_LEVEL = SEVERITY_LEVELS['indeterminate']
+
+BLOCK = 'block'
+DROP_OLDEST = 'drop_oldest'
+DROP_LOWEST_SEVERITY = 'drop_lowest_severity'
+POLICIES = (BLOCK, DROP_OLDEST, DROP_LOWEST_SEVERITY)
+
+
+class BufferedSender:
+    """
+    Send alerts in the background so that callers never wait on the API.
+
+    Alerts are added to a bounded in-memory queue and sent by worker threads
+    as soon as batch_size alerts are waiting or the oldest has waited for
+    flush_interval seconds. Anything still queued is flushed at exit, for
+    up to shutdown_timeout seconds so that exit never hangs on an API that
+    is down; alerts still unsent after that are dropped.
+
+    When the queue is full the policy decides what happens to a new alert:
+    "block" waits up to block_timeout seconds (forever if None) for space
+    then drops it, "drop_oldest" discards the oldest queued alert and
+    "drop_lowest_severity" discards the oldest alert of the lowest queued
+    severity, or the new alert if it is less severe than all of them.
+
+    Alerts that fail to send are logged and passed to on_error(alert, exc),
+    as are alerts dropped by close() with a timeout (with a TimeoutError).
+    """
+
+    def __init__(self, client, maxsize=10000, batch_size=100, flush_interval=1.0, workers=2, policy=BLOCK,
+                 block_timeout=None, on_error=None, severity_map=None, shutdown_timeout=5.0):
+        if policy not in POLICIES:
+            raise ValueError('Unknown queue full policy "{}". Must be one of {}'.format(policy, ', '.join(POLICIES)))
+        self.client = client
+        self.maxsize = maxsize
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.policy = policy
+        self.block_timeout = block_timeout
+        self.on_error = on_error
+        self.severity_map = severity_map or SEVERITY_LEVELS
+        self.shutdown_timeout = shutdown_timeout
+
+        # one FIFO per severity level so the least severe alert can be found
+        # without a scan; a sequence number restores the overall order
+        self._queues = dict()
+        self._size = 0
+        self._seq = itertools.count()
+        self._lock = threading.Lock()
+        self._not_empty = threading.Condition(self._lock)
+        self._not_full = threading.Condition(self._lock)
+        self._idle = threading.Condition(self._lock)
+        self._flushing = 0
+        self._closed = False
+        self._abandoned = False
+        self._in_flight = 0
+
+        self.enqueued = 0
+        self.sent = 0
+        self.failed = 0
+        self.dropped = 0
+
+        self._workers = [
+            threading.Thread(target=self._run, name=f'alerta-sender-{i}', daemon=True) for i in range(workers)
+        ]
+        for worker in self._workers:
+            worker.start()
+        atexit.register(self._close_at_exit)
+
+    def __repr__(self):
+        return 'BufferedSender(queued={!r}, sent={!r}, failed={!r}, dropped={!r})'.format(
+            self.queued, self.sent, self.failed, self.dropped)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    @property
+    def queued(self):
+        return self._size
+
+    def send_alert(self, resource, event, **kwargs):
+        """Queue an alert. Takes the same arguments as Client.send_alert()."""
+        return self.enqueue(dict(kwargs, resource=resource, event=event))
+
+    def enqueue(self, alert):
+        """Queue a dict of send_alert() arguments. Returns False if it was dropped."""
+        level = self.severity_map.get(alert.get('severity'), DEFAULT_LEVEL)
+        with self._lock:
+            if self._closed:
+                raise RuntimeError('BufferedSender is closed')
+            if self._size >= self.maxsize and not self._make_room(level):
+                self.dropped += 1
+                return False
+            self._queues.setdefault(level, deque()).append((next(self._seq), time.monotonic(), alert))
+            self._size += 1
+            self.enqueued += 1
+            if self._size >= self.batch_size or self._size == 1:
+                self._not_empty.notify()
+            return True
+
+    def flush(self, timeout=None):
+        """Send everything queued now. Returns False if not done within timeout seconds."""
+        with self._lock:
+            self._flushing += 1
+            self._not_empty.notify_all()
+            try:
+                return self._idle.wait_for(lambda: not self._size and not self._in_flight, timeout)
+            finally:
+                self._flushing -= 1
+
+    def close(self, timeout=None):
+        """
+        Stop accepting alerts, flush the queue and stop the workers. Alerts
+        not sent within timeout seconds are dropped. Returns False if any were.
+        """
+        atexit.unregister(self._close_at_exit)
+        with self._lock:
+            if self._closed:
+                return True
+            self._closed = True
+            self._not_empty.notify_all()
+            self._not_full.notify_all()
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        for worker in self._workers:
+            worker.join(None if deadline is None else max(0.0, deadline - time.monotonic()))
+        if timeout is not None and any(worker.is_alive() for worker in self._workers):
+            self._abandon(timeout)
+            return False
+        return True
+
+    def _close_at_exit(self):
+        self.close(self.shutdown_timeout)
+
+    def _abandon(self, timeout):
+        # stop workers sending and drop everything unsent, including the rest of batches being sent
+        with self._lock:
+            self._abandoned = True
+            unsent = self._take(self._size)
+            self.dropped += len(unsent)
+        logger.warning('BufferedSender not flushed within %ss, dropping %d queued alerts', timeout, len(unsent))
+        for alert in unsent:
+            self._error(alert, TimeoutError('BufferedSender closed before alert was sent'))
+
+    def serialize(self):
+        with self._lock:
+            return {
+                'queued': self._size,
+                'maxsize': self.maxsize,
+                'inFlight': self._in_flight,
+                'enqueued': self.enqueued,
+                'sent': self.sent,
+                'failed': self.failed,
+                'dropped': self.dropped,
+                'policy': self.policy
+            }
+
+    def _make_room(self, level):
+        # called with lock held when the queue is full
+        if self.policy == BLOCK:
+            return self._not_full.wait_for(lambda: self._size < self.maxsize or self._closed, self.block_timeout) \
+                and not self._closed
+        if self.policy == DROP_OLDEST:
+            queue = min((q for q in self._queues.values() if q), key=lambda q: q[0][0])
+        else:
+            lowest = max(lv for lv, q in self._queues.items() if q)
+            if level > lowest:
+                return False
+            queue = self._queues[lowest]
+        queue.popleft()
+        self._size -= 1
+        self.dropped += 1
+        return True
+
+    def _take(self, n):
+        # called with lock held, oldest first across all severities
+        batch = list()
+        while self._size and len(batch) < n:
+            queue = min((q for q in self._queues.values() if q), key=lambda q: q[0][0])
+            batch.append(queue.popleft()[2])
+            self._size -= 1
+        self._not_full.notify(len(batch))
+        return batch
+
+    def _oldest(self):
+        return min(q[0][1] for q in self._queues.values() if q)
+
+    def _next_batch(self):
+        with self._lock:
+            while True:
+                if self._size >= self.batch_size or (self._size and (self._flushing or self._closed)):
+                    break
+                if self._size:
+                    wait = self._oldest() + self.flush_interval - time.monotonic()
+                    if wait <= 0:
+                        break
+                elif self._closed:
+                    return None
+                else:
+                    wait = None
+                self._not_empty.wait(wait)
+            batch = self._take(self.batch_size)
+            self._in_flight += len(batch)
+            return batch
+
+    def _run(self):
+        while True:
+            batch = self._next_batch()
+            if batch is None:
+                return
+            sent = failed = dropped = 0
+            for alert in batch:
+                if self._abandoned:
+                    dropped += 1
+                    self._error(alert, TimeoutError('BufferedSender closed before alert was sent'))
+                    continue
+                try:
+                    self.client.send_alert(**alert)
+                    sent += 1
+                except Exception as e:
+                    failed += 1
+                    logger.warning('Failed to send alert %s/%s: %s', alert.get('resource'), alert.get('event'), e)
+                    self._error(alert, e)
+            with self._lock:
+                self.sent += sent
+                self.failed += failed
+                self.dropped += dropped
+                self._in_flight -= len(batch)
+                if not self._size and not self._in_flight:
+                    self._idle.notify_all()
+
+    def _error(self, alert, e):
+        if self.on_error:
+            try:
+                self.on_error(alert, e)
+            except Exception as e:
+                logger.warning('BufferedSender on_error callback failed: %s', e)
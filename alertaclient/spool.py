@@ -0,0 +1,156 @@
+import itertools
+import logging
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime
+
+from alertaclient.bulk import DEFAULT_CONCURRENCY, imap_ordered
+from alertaclient.exceptions import is_transient
+from alertaclient.utils import DateTime, json_codec
+
+logger = logging.getLogger('alerta.client')
+
+DEFAULT_SPOOL_FILE = '~/.alerta.spool'
+
+
+class Spool:
+    """
+    Crash-safe local store for alerts that could not be delivered.
+
+    Alerts are dicts of send_alert() arguments and are appended to an SQLite
+    database in WAL mode, so a write is a single fast append and survives a
+    crash of the process. The time the alert was first sent is saved as
+    "create_time" so that it is preserved when the alert is replayed.
+    """
+
+    def __init__(self, path=None):
+        self.path = os.path.expanduser(path or DEFAULT_SPOOL_FILE)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, timeout=30, isolation_level=None, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')  # durable after a process crash, fsync at checkpoints
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS spool ('
+            'id INTEGER PRIMARY KEY AUTOINCREMENT, spooled REAL NOT NULL, attempts INTEGER NOT NULL DEFAULT 0, '
+            'alert TEXT NOT NULL)'
+        )
+
+    def __repr__(self):
+        return f'Spool(path={self.path!r})'
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute('SELECT COUNT(*) FROM spool').fetchone()[0]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def append(self, alert):
+        """Add a dict of send_alert() arguments to the end of the spool."""
+        alert = dict(alert)
+        create_time = alert.get('create_time') or datetime.utcnow()
+        alert['create_time'] = DateTime.iso8601(create_time) if isinstance(create_time, datetime) else create_time
+        data = json_codec.dumps(alert)
+        with self._lock:
+            return self._conn.execute('INSERT INTO spool (spooled, alert) VALUES (?, ?)', (time.time(), data)).lastrowid
+
+    def peek(self, limit=100, after=0):
+        """Oldest spooled alerts as (id, attempts, alert) tuples."""
+        with self._lock:
+            rows = self._conn.execute(
+                'SELECT id, attempts, alert FROM spool WHERE id > ? ORDER BY id LIMIT ?', (after, limit)
+            ).fetchall()
+        return [(id, attempts, json_codec.loads(alert)) for id, attempts, alert in rows]
+
+    def remove(self, ids):
+        with self._lock:
+            self._conn.executemany('DELETE FROM spool WHERE id = ?', [(id,) for id in ids])
+
+    def record_attempt(self, ids):
+        with self._lock:
+            self._conn.executemany('UPDATE spool SET attempts = attempts + 1 WHERE id = ?', [(id,) for id in ids])
+
+    def purge(self):
+        """Delete every spooled alert. Returns the number deleted."""
+        with self._lock:
+            count = self._conn.execute('DELETE FROM spool').rowcount
+            self._conn.execute('PRAGMA wal_checkpoint(TRUNCATE)')
+        return count
+
+    def status(self):
+        with self._lock:
+            count, oldest, newest = self._conn.execute('SELECT COUNT(*), MIN(spooled), MAX(spooled) FROM spool').fetchone()
+        size = sum(os.path.getsize(f) for f in (self.path, self.path + '-wal') if os.path.exists(f))
+        return {
+            'path': self.path,
+            'count': count,
+            'oldest': datetime.utcfromtimestamp(oldest) if oldest else None,
+            'newest': datetime.utcfromtimestamp(newest) if newest else None,
+            'size': size
+        }
+
+    def replay(self, client, concurrency=DEFAULT_CONCURRENCY, rate=None, batch_size=100, max_attempts=5,
+               callback=None):
+        """
+        Send spooled alerts oldest first with up to concurrency requests in
+        flight and at most rate alerts per second. Delivered alerts are
+        removed. Replay stops at the first transient error (the API is still
+        unreachable) leaving the rest for next time; an alert rejected by the
+        API max_attempts times is discarded. Calls callback(alert, error) for
+        every alert sent.
+        """
+        stats = {'sent': 0, 'failed': 0, 'rejected': 0, 'remaining': 0}
+        start = time.monotonic()
+        dispatched = itertools.count()
+        after = 0
+        down = False
+        while not down:
+            rows = self.peek(batch_size, after=after)
+            if not rows:
+                break
+            after = rows[-1][0]
+
+            def paced():
+                for row in rows:
+                    if down:
+                        return
+                    if rate:
+                        delay = start + next(dispatched) / rate - time.monotonic()
+                        if delay > 0:
+                            time.sleep(delay)
+                    yield row
+
+            def send(row):
+                return client.send_alert(**row[2])
+
+            sent, failed, rejected = [], [], []
+            for (id, attempts, alert), _, error, _ in imap_ordered(send, paced(), concurrency):
+                if error is None:
+                    sent.append(id)
+                elif is_transient(error):
+                    failed.append(id)
+                    down = True
+                elif attempts + 1 >= max_attempts:
+                    rejected.append(id)
+                    logger.warning('Discarding spooled alert %s/%s: %s', alert.get('resource'), alert.get('event'), error)
+                else:
+                    failed.append(id)
+                if callback:
+                    callback(alert, error)
+            stats['sent'] += len(sent)
+            stats['failed'] += len(failed)
+            stats['rejected'] += len(rejected)
+            self.remove(sent + rejected)
+            self.record_attempt(failed)
+
+        stats['remaining'] = len(self)
+        return stats
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,72 @@
+from datetime import datetime
+
+from alertaclient.utils import DateTime, json_codec
+
+STATIC_FIELDS = ('environment', 'correlate', 'service', 'group', 'tags', 'attributes', 'origin', 'type', 'timeout',
+                 'raw_data', 'customer')
+
+
+def iso8601(dt):
+    # same output as DateTime.iso8601() in a third of the time for naive UTC datetimes
+    if dt.tzinfo is None:
+        return dt.isoformat(timespec='milliseconds') + 'Z'
+    return DateTime.iso8601(dt)
+
+
+class AlertTemplate:
+    """
+    Alert payload with the fields that never change for an emitter (eg.
+    environment, service, group, origin, tags and type) encoded once.
+    Only resource, event, severity, value, text and createTime are encoded
+    for each alert and joined to the pre-encoded part, so the request body
+    is the same as for send_alert() with the same arguments.
+
+    The template is immutable and can be shared by threads. Send alerts
+    with Client.send_alert_template() or encode them with encode().
+    """
+
+    def __init__(self, **kwargs):
+        unknown = set(kwargs) - set(STATIC_FIELDS) - {'severity'}
+        if unknown:
+            raise ValueError('Not a static alert field: {}'.format(', '.join(sorted(unknown))))
+        self.severity = kwargs.get('severity')
+        self.static = {
+            'environment': kwargs.get('environment'),
+            'correlate': list(kwargs.get('correlate', None) or list()),
+            'service': list(kwargs.get('service', None) or list()),
+            'group': kwargs.get('group'),
+            'tags': list(kwargs.get('tags', None) or list()),
+            'attributes': dict(kwargs.get('attributes', None) or dict()),
+            'origin': kwargs.get('origin'),
+            'type': kwargs.get('type'),
+            'timeout': kwargs.get('timeout'),
+            'rawData': kwargs.get('raw_data'),
+            'customer': kwargs.get('customer')
+        }
+        self._encoded = dict()  # codec name -> static fields without the opening brace
+
+    def __repr__(self):
+        return 'AlertTemplate({})'.format(', '.join(
+            f'{k}={v!r}' for k, v in self.static.items() if v or v == 0))
+
+    def _static(self, codec):
+        try:
+            return self._encoded[codec.name]
+        except KeyError:
+            encoded = self._encoded[codec.name] = b',' + codec.encode(self.static)[1:]
+            return encoded
+
+    def encode(self, resource, event, severity=None, value=None, text=None, create_time=None, id=None, codec=None):
+        """Return the JSON request body for an alert as bytes."""
+        codec = codec or json_codec
+        create_time = create_time or datetime.utcnow()
+        varying = {
+            'id': id,
+            'resource': resource,
+            'event': event,
+            'severity': severity or self.severity,
+            'value': value,
+            'text': text,
+            'createTime': iso8601(create_time) if isinstance(create_time, datetime) else create_time
+        }
+        return codec.encode(varying)[:-1] + self._static(codec)
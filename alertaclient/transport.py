@@ -0,0 +1,83 @@
+import ssl
+from datetime import timedelta
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from alertaclient.exceptions import ConfigurationError
+
+try:
+    import httpx
+except ImportError:
+    httpx = None  # type: ignore
+
+
+class Http2Session:
+    """
+    HTTP/2 transport with the same request() interface as requests.Session.
+
+    Many concurrent requests are multiplexed over one connection per host.
+    Requests are prepared (and signed by the usual auth classes) by the
+    "requests" package and sent using "httpx"; responses are returned as
+    requests.Response objects and httpx errors are re-raised as the
+    equivalent requests exceptions. Requires the optional "httpx[http2]"
+    package.
+
+    HTTP/2 is negotiated using TLS ALPN. Use prior_knowledge=True to talk
+    HTTP/2 to a cleartext (http://) endpoint.
+    """
+
+    def __init__(self, verify=True, cert=None, max_connections=10, max_keepalive_connections=None,
+                 keepalive_expiry=None, prior_knowledge=False):
+        if httpx is None:
+            raise ConfigurationError('HTTP/2 requires the "httpx" package. Install it with: pip install alerta[http2]')
+
+        if isinstance(verify, str):
+            verify = ssl.create_default_context(cafile=verify)
+        if cert:
+            if not isinstance(verify, ssl.SSLContext):
+                verify = ssl.create_default_context() if verify else ssl._create_unverified_context()
+            if isinstance(cert, tuple):
+                verify.load_cert_chain(*cert)
+            else:
+                verify.load_cert_chain(cert)
+
+        limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry or 5.0
+        )
+        self.client = httpx.Client(http1=not prior_knowledge, http2=True, verify=verify, limits=limits)
+
+    def request(self, method, url, params=None, data=None, headers=None, auth=None, timeout=None, **kwargs):
+        prepared = requests.Request(method, url, params=params, data=data, headers=headers, auth=auth).prepare()
+        prepared.headers.pop('Content-Length', None)  # recalculated by httpx
+        try:
+            r = self.client.request(method, prepared.url, content=prepared.body, headers=dict(prepared.headers),
+                                    timeout=timeout)
+        except httpx.ConnectTimeout as e:
+            raise requests.exceptions.ConnectTimeout(e, request=prepared)
+        except httpx.ReadTimeout as e:
+            raise requests.exceptions.ReadTimeout(e, request=prepared)
+        except httpx.TimeoutException as e:
+            raise requests.exceptions.Timeout(e, request=prepared)
+        except httpx.TransportError as e:
+            raise requests.exceptions.ConnectionError(e, request=prepared)
+
+        response = requests.Response()
+        response._content = r.content  # decompressed
+        response.status_code = r.status_code
+        response.reason = r.reason_phrase
+        response.headers = CaseInsensitiveDict(r.headers)
+        response.url = str(r.url)
+        response.encoding = r.encoding
+        response.elapsed = getattr(r, '_elapsed', timedelta(0))
+        response.request = prepared
+        response.http_version = r.http_version
+        return response
+
+    def get(self, url, **kwargs):
+        return self.request('GET', url, **kwargs)
+
+    def close(self):
+        self.client.close()
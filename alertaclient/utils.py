@@ -2,11 +2,22 @@ import datetime
 import json
 import os
 import platform
+import re
 import sys
+import time
 
 import click
 import pytz
 
+from alertaclient.bulk import DEFAULT_CONCURRENCY, imap_ordered
+from alertaclient.checkpoint import Checkpoint, selection
+from alertaclient.concurrency import AUTO, AdaptiveLimiter
+
+try:
+    import orjson
+except ImportError:
+    orjson = None  # type: ignore
+
 
 class CustomJsonEncoder(json.JSONEncoder):
     def default(self, o):  # pylint: disable=method-hidden
@@ -18,6 +29,91 @@ class CustomJsonEncoder(json.JSONEncoder):
             return json.JSONEncoder.default(self, o)
 
 
+class JsonCodec:
+    """
+    Standard library JSON codec. Non-ASCII characters are not escaped.
+    """
+
+    name = 'json'
+
+    def dumps(self, obj, sort_keys=False, indent=None):
+        return json.dumps(obj, cls=CustomJsonEncoder, sort_keys=sort_keys, indent=indent, ensure_ascii=False)
+
+    def encode(self, obj):
+        return self.dumps(obj).encode('utf-8')
+
+    def loads(self, s):
+        return json.loads(s)
+
+
+class OrjsonCodec(JsonCodec):
+    """
+    Fast JSON codec using "orjson". Dates and times are passed through to
+    CustomJsonEncoder so they are encoded exactly as by the stdlib codec.
+    Anything orjson cannot encode (eg. integers over 64 bits) falls back
+    to the stdlib.
+    """
+
+    name = 'orjson'
+
+    _indent = re.compile(r'^( +)', flags=re.MULTILINE)
+
+    def __init__(self):
+        self._default = CustomJsonEncoder().default
+
+    def _dumpb(self, obj, sort_keys=False, indent=None):
+        option = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=self._default, option=option)
+
+    def dumps(self, obj, sort_keys=False, indent=None):
+        if indent and indent % 2:
+            return super().dumps(obj, sort_keys, indent)
+        try:
+            s = self._dumpb(obj, sort_keys, indent).decode('utf-8')
+        except (TypeError, orjson.JSONEncodeError):
+            return super().dumps(obj, sort_keys, indent)
+        if indent and indent != 2:
+            # orjson only supports 2-space indents and never emits raw newlines inside strings
+            s = self._indent.sub(lambda m: m.group(1) * (indent // 2), s)
+        return s
+
+    def encode(self, obj):
+        try:
+            return self._dumpb(obj)
+        except (TypeError, orjson.JSONEncodeError):
+            return super().encode(obj)
+
+    def loads(self, s):
+        return orjson.loads(s)
+
+
+JSON_CODECS = {
+    'json': JsonCodec,
+    'orjson': OrjsonCodec
+}
+
+
+def get_json_codec(name=None):
+    """
+    Return the named JSON codec, or the fastest one installed. Use the
+    ALERTA_JSON_CODEC environment variable to force a codec.
+    """
+    name = name or os.environ.get('ALERTA_JSON_CODEC') or ('orjson' if orjson is not None else 'json')
+    if name == 'orjson' and orjson is None:
+        raise ImportError('JSON codec "orjson" is not installed. Install it with: pip install alerta[fast]')
+    try:
+        return JSON_CODECS[name]()
+    except KeyError:
+        raise ValueError('Unknown JSON codec "{}". Must be one of {}'.format(name, ', '.join(JSON_CODECS)))
+
+
+json_codec = get_json_codec()
+
+
 class DateTime:
     @staticmethod
     def parse(date_str):
@@ -45,19 +141,124 @@ def build_query(filters):
     return [tuple(f.split('=', 1)) for f in filters if '=' in f]
 
 
-def action_progressbar(client, action, ids, label, text=None, timeout=None):
-    skipped = 0
+class ConcurrencyType(click.ParamType):
+    """A number of requests in parallel or "auto" to adapt to the API."""
+    name = 'concurrency'
+
+    def convert(self, value, param, ctx):
+        if value == AUTO or isinstance(value, int):
+            return value
+        try:
+            value = int(value)
+        except ValueError:
+            self.fail(f'{value!r} is not a number or "{AUTO}"', param, ctx)
+        if value < 1:
+            self.fail(f'{value} is less than 1', param, ctx)
+        return value
+
+
+CONCURRENCY = ConcurrencyType()
+
+
+def open_checkpoint(command, resume=None, ids=None, query=None, **args):
+    """
+    Start a checkpoint for a bulk command, or load the one given with
+    --resume. Without --resume progress is saved to a default file that
+    is removed when the command completes without failures, or only kept
+    in memory if that file cannot be written.
+    """
+    selected = selection(ids, query)
+    if resume:
+        checkpoint = Checkpoint(resume, command, selected, args)
+        try:
+            checkpoint.load()
+        except (OSError, ValueError) as e:
+            raise click.UsageError(str(e))
+        return checkpoint
+
+    checkpoint = Checkpoint(Checkpoint.default_path(command, selected, args), command, selected, args)
+    try:
+        checkpoint.start()
+    except OSError as e:
+        click.echo(f'WARNING: Progress will not be saved, cannot write checkpoint: {e}', err=True)
+        checkpoint = Checkpoint(None, command, selected, args)
+    return checkpoint
+
+
+def bulk_progressbar(func, ids, label, concurrency=DEFAULT_CONCURRENCY, total=None, checkpoint=None,
+                     max_concurrency=None):
+    """
+    Call func(id) for every alert id with up to concurrency requests in
+    flight, then print a summary of failures grouped by error message.
+    Returns the number of failures. If ids is an iterator, total is the
+    expected number of ids.
+
+    If concurrency is "auto" an AdaptiveLimiter sets the requests in
+    flight, up to max_concurrency, and the current limit is shown in the
+    progress bar. Pass the client's pool_maxsize as max_concurrency so that
+    every request in flight can reuse a pooled connection.
+
+    Results are recorded in checkpoint, if given, which is saved every
+    second and removed when every id succeeds.
+    """
+    total = len(ids) if total is None else total
+    errors = dict()
+    done = 0
+    if concurrency == AUTO:
+        concurrency = AdaptiveLimiter(max_limit=max_concurrency) if max_concurrency else AdaptiveLimiter()
+
+    def show_status(item):
+        status = list()
+        if isinstance(concurrency, AdaptiveLimiter):
+            status.append(f'concurrency {concurrency.current}')
+        failed = sum(errors.values())
+        if failed:
+            status.append(f'{failed} failed')
+        if status:
+            return '({})'.format(', '.join(status))
+
+    if checkpoint and checkpoint.completed:
+        click.echo(f'Resuming, {len(checkpoint.completed)} alerts already done', err=True)
+    with click.progressbar(length=total, label=label, show_eta=True, item_show_func=show_status) as bar:
+        saved = time.monotonic()
+        try:
+            for id, _, error, _ in imap_ordered(func, ids, concurrency):
+                done += 1
+                if error:
+                    message = str(error) or type(error).__name__
+                    errors[message] = errors.get(message, 0) + 1
+                if checkpoint:
+                    checkpoint.record(id, ok=error is None)
+                    if time.monotonic() - saved >= 1.0:
+                        checkpoint.flush()
+                        saved = time.monotonic()
+                bar.update(done + (checkpoint.skipped if checkpoint else 0) - bar.pos)
+        except BaseException:
+            if checkpoint:
+                checkpoint.close()
+                if checkpoint.path:
+                    click.echo(f'\nStopped. Use --resume {checkpoint.path} to continue', err=True)
+            raise
+
+    failed = sum(errors.values())
+    if failed:
+        click.echo(f'{failed} of {done} alerts failed:', err=True)
+        for message, count in sorted(errors.items(), key=lambda e: e[1], reverse=True):
+            click.echo(f'{count:>8}  {message}', err=True)
+    if checkpoint:
+        if failed:
+            checkpoint.close()
+            if checkpoint.path:
+                click.echo(f'Use --resume {checkpoint.path} to retry failed alerts', err=True)
+        else:
+            checkpoint.remove()
+    return failed
 
-    def show_skipped(id):
-        if not id and skipped:
-            return f'(skipped {skipped})'
 
-    with click.progressbar(ids, label=label, show_eta=True, item_show_func=show_skipped) as bar:
-        for id in bar:
-            try:
-                client.action(id, action=action, text=text, timeout=timeout)
-            except Exception:
-                skipped += 1
+def action_progressbar(client, action, ids, label, text=None, timeout=None, concurrency=DEFAULT_CONCURRENCY,
+                       total=None, checkpoint=None):
+    return bulk_progressbar(lambda id: client.action(id, action=action, text=text, timeout=timeout),
+                            ids, label, concurrency, total, checkpoint, client.http.pool_maxsize)
 
 
 def origin():
@@ -0,0 +1,96 @@
+#!/usr/bin/env python
+"""
+Compare the per-alert CPU cost of building and encoding the request body
+with send_alert() and with an AlertTemplate, and show how much of a complete
+send_alert() call (through a stub transport, so no network) that is.
+
+    python benchmarks/alert_template.py --alerts 100000
+    ALERTA_JSON_CODEC=json python benchmarks/alert_template.py
+"""
+import argparse
+import time
+from datetime import datetime
+
+from requests.adapters import HTTPAdapter
+from requests.models import Response
+
+from alertaclient.api import Client
+from alertaclient.template import AlertTemplate
+
+STATIC = dict(environment='Production', service=['Web', 'Platform'], group='Performance', tags=['london', 'linux'],
+              attributes={'region': 'EU', 'team': 'sre'}, origin='monitor/web01', type='performanceAlert',
+              timeout=3600, customer='Alerta IO')
+
+RESPONSE = b'{"status": "ok", "id": "6c1a3a4c-2b5e-4ad8-9a6c-3f1c2b6a7e10"}'
+
+
+class StubAdapter(HTTPAdapter):
+
+    def send(self, request, **kwargs):
+        response = Response()
+        response.status_code = 201
+        response._content = RESPONSE
+        response.request = request
+        response.url = request.url
+        return response
+
+
+def encode_alert(codec, resource, event, severity, value, text):
+    # the same payload send_alert() builds for every call
+    data = {
+        'id': None,
+        'resource': resource,
+        'event': event,
+        'environment': STATIC['environment'],
+        'severity': severity,
+        'correlate': list(),
+        'service': STATIC['service'],
+        'group': STATIC['group'],
+        'value': value,
+        'text': text,
+        'tags': STATIC['tags'],
+        'attributes': STATIC['attributes'],
+        'origin': STATIC['origin'],
+        'type': STATIC['type'],
+        'createTime': datetime.utcnow(),
+        'timeout': STATIC['timeout'],
+        'rawData': None,
+        'customer': STATIC['customer']
+    }
+    return codec.encode(data)
+
+
+def cpu_per_alert(func, alerts, repeat=5):
+    best = None
+    for _ in range(repeat):
+        start = time.process_time()
+        for i in range(alerts):
+            func(f'web{i % 100:02d}', 'HighLatency', 'major', f'{i % 1000}ms', 'Response time above threshold')
+        elapsed = time.process_time() - start
+        best = min(best or elapsed, elapsed)
+    return best / alerts * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--alerts', type=int, default=100000, help='alerts per measurement (best of 5)')
+    args = parser.parse_args()
+
+    client = Client(endpoint='http://alerta.invalid')
+    client.http.session.mount('http://', StubAdapter())
+    codec = client.http.codec
+    template = AlertTemplate(**STATIC)
+
+    before = cpu_per_alert(lambda *a: encode_alert(codec, *a), args.alerts)
+    after = cpu_per_alert(lambda r, e, s, v, t: template.encode(r, e, s, v, t, codec=codec), args.alerts)
+    total = cpu_per_alert(lambda r, e, s, v, t: client.send_alert(
+        r, e, severity=s, value=v, text=t, **STATIC), args.alerts // 10)
+
+    print(f'codec: {codec.name}')
+    print(f'send_alert() payload:   {before:8.2f} us per alert')
+    print(f'AlertTemplate payload:  {after:8.2f} us per alert ({1 - after / before:.0%} less CPU)')
+    print(f'send_alert() total:     {total:8.2f} us per alert with stub transport ({before / total:.0%} is payload)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,101 @@
+#!/usr/bin/env python
+"""
+Compare the HTTP/1.1 (requests) and HTTP/2 (httpx) transports of HTTPClient
+against a local hypercorn server that speaks both protocols over cleartext.
+
+    pip install alerta[http2] hypercorn
+    python benchmarks/http2.py --requests 5000 --threads 50 --latency 0.005
+"""
+import argparse
+import asyncio
+import json
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from hypercorn.asyncio import serve
+from hypercorn.config import Config
+
+from alertaclient.api import Client
+
+BODY = json.dumps({'status': 'ok', 'total': 0, 'alerts': []}).encode('utf-8')
+
+
+def make_app(latency):
+
+    async def app(scope, receive, send):
+        if scope['type'] != 'http':
+            return
+        await asyncio.sleep(latency)
+        await send({'type': 'http.response.start', 'status': 200,
+                    'headers': [(b'content-type', b'application/json')]})
+        await send({'type': 'http.response.body', 'body': BODY})
+
+    return app
+
+
+def start_server(latency):
+    sock = socket.socket()
+    sock.bind(('127.0.0.1', 0))
+    port = sock.getsockname()[1]
+    sock.close()
+
+    config = Config()
+    config.bind = [f'127.0.0.1:{port}']
+    config.loglevel = 'WARNING'
+    config.keep_alive_max_requests = 1000000
+    server = serve(make_app(latency), config, shutdown_trigger=lambda: asyncio.Future())  # no signal handlers
+    threading.Thread(target=asyncio.run, args=(server,), daemon=True).start()
+    for _ in range(50):
+        try:
+            socket.create_connection(('127.0.0.1', port), timeout=0.1).close()
+            break
+        except OSError:
+            time.sleep(0.1)
+    return f'http://127.0.0.1:{port}'
+
+
+def run(client, requests, threads):
+    latencies = []
+
+    def task(_):
+        start = time.perf_counter()
+        client.http.get('/alerts', page=1)
+        latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        list(executor.map(task, range(requests)))
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        'req/s': requests / elapsed,
+        'p50': latencies[len(latencies) // 2] * 1000,
+        'p99': latencies[int(len(latencies) * 0.99)] * 1000
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--threads', type=int, default=50)
+    parser.add_argument('--latency', type=float, default=0.005, help='server response delay in seconds')
+    args = parser.parse_args()
+
+    endpoint = start_server(args.latency)
+    transports = [
+        ('HTTP/1.1', dict(pool_maxsize=args.threads)),
+        ('HTTP/2', dict(http2='prior-knowledge', pool_maxsize=1))
+    ]
+    print(f'{args.requests} requests, {args.threads} threads, {args.latency * 1000:.0f}ms server latency')
+    for name, kwargs in transports:
+        client = Client(endpoint=endpoint, **kwargs)
+        run(client, min(100, args.requests), args.threads)  # warm up
+        r = run(client, args.requests, args.threads)
+        print('{:<10} {:>8.0f} req/s   p50 {:>6.1f}ms   p99 {:>6.1f}ms'.format(name, r['req/s'], r['p50'], r['p99']))
+
+
+if __name__ == '__main__':
+    main()
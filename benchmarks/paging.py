@@ -0,0 +1,79 @@
+#!/usr/bin/env python
+"""
+Measure the wall-clock time to walk every page of a large result set with
+Client.iter_alerts() at different read-ahead levels, against a local fake
+Alerta API that adds a fixed latency to every request.
+
+    python benchmarks/paging.py --pages 100 --page-size 100 --latency 0.05 --work 0.01
+"""
+import argparse
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from alertaclient.api import Client
+
+
+def make_handler(total, latency):
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+        disable_nagle_algorithm = True
+
+        def do_GET(self):
+            params = parse_qs(urlparse(self.path).query)
+            page, page_size = int(params['page'][0]), int(params['page-size'][0])
+            pages = -(-total // page_size)
+            alerts = [
+                {'id': f'{i:08d}', 'resource': f'web{i % 100:02d}', 'event': 'HighLatency', 'severity': 'major'}
+                for i in range((page - 1) * page_size, min(total, page * page_size))
+            ]
+            body = json.dumps({'status': 'ok', 'alerts': alerts, 'total': total, 'page': page,
+                               'pageSize': page_size, 'pages': pages, 'more': page < pages}).encode('utf-8')
+            time.sleep(latency)
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--pages', type=int, default=100, help='pages in the result set')
+    parser.add_argument('--page-size', type=int, default=100, help='alerts per page')
+    parser.add_argument('--latency', type=float, default=0.05, help='seconds added to every request by the server')
+    parser.add_argument('--work', type=float, default=0.01, help='seconds spent by the consumer on each page')
+    parser.add_argument('--read-ahead', type=int, nargs='+', default=[0, 1, 2, 4, 8], help='read-ahead levels')
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), make_handler(args.pages * args.page_size, args.latency))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    client = Client(endpoint='http://127.0.0.1:{}'.format(server.server_address[1]), pool_maxsize=16)
+
+    print('{} pages of {} alerts, {:.0f}ms latency, {:.0f}ms work per page'.format(
+        args.pages, args.page_size, args.latency * 1000, args.work * 1000))
+    baseline = None
+    for read_ahead in args.read_ahead:
+        start = time.perf_counter()
+        count = 0
+        for page in client.http.get_pages('/alerts', 'alerts', page_size=args.page_size, read_ahead=read_ahead):
+            count += len(page)
+            time.sleep(args.work)
+        elapsed = time.perf_counter() - start
+        baseline = baseline or elapsed
+        print('read_ahead={:<3d} {:>7.2f}s  {:>8.0f} alerts/s  {:>5.1f}x'.format(
+            read_ahead, elapsed, count / elapsed, baseline / elapsed))
+    server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -27,6 +27,11 @@ setuptools.setup(
         'tabulate',
         'pytz'
     ],
+    extras_require={
+        'async': ['aiohttp'],
+        'fast': ['orjson'],
+        'http2': ['httpx[http2]']
+    },
     include_package_data=True,
     zip_safe=False,
     entry_points={
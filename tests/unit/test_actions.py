@@ -0,0 +1,185 @@
+import glob
+import os
+import re
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+from unittest import mock
+from urllib.parse import parse_qs, urlparse
+
+import requests_mock
+from click.testing import CliRunner
+
+from alertaclient.api import Client
+from alertaclient.commands.cmd_ack import cli as ack_cmd
+from alertaclient.commands.cmd_tag import cli as tag_cmd
+from alertaclient.config import Config
+from alertaclient.retry import Retry
+from alertaclient.utils import bulk_progressbar
+
+
+class BulkActionsTestCase(unittest.TestCase):
+
+    def setUp(self):
+        config = Config(config_file=None)
+        self.obj = config.options
+        self.obj['client'] = Client(retry=Retry(total=0))
+        self.runner = CliRunner(mix_stderr=False)
+
+        # default checkpoint files are written to the home directory
+        self.home = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.home)
+        patcher = mock.patch.dict(os.environ, {'HOME': self.home})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    @staticmethod
+    def callback(request, context):
+        n = int(request.path.split('/')[2])
+        if n % 10 == 3:
+            context.status_code = 404
+            return {'status': 'error', 'message': 'not found'}
+        if n == 7:
+            context.status_code = 500
+            return {'status': 'error', 'message': 'database unavailable'}
+        return {'status': 'ok'}
+
+    @requests_mock.mock()
+    def test_ack_failures(self, m):
+        m.put(re.compile(r'http://localhost:8080/alert/\d+/action'), json=self.callback)
+        ids = [str(n) for n in range(40)]
+
+        result = self.runner.invoke(ack_cmd, sum((['-i', id] for id in ids), []) + ['-c', '8'], obj=self.obj)
+
+        self.assertEqual(result.exit_code, 1, result.stderr)
+        self.assertEqual(m.call_count, 40)
+        self.assertEqual(m.request_history[0].json(), {'action': 'ack', 'text': None, 'timeout': None})
+        checkpoint, = glob.glob(os.path.join(self.home, '.alerta.ack.*.checkpoint'))
+        self.assertEqual(result.stderr.splitlines(), [
+            '5 of 40 alerts failed:',
+            '       4  not found',
+            '       1  database unavailable',
+            f'Use --resume {checkpoint} to retry failed alerts'
+        ])
+
+    @requests_mock.mock()
+    def test_home_not_writable(self, m):
+        m.put(re.compile(r'http://localhost:8080/alert/\d+/action'), json={'status': 'ok'})
+
+        with mock.patch.dict(os.environ, {'HOME': os.path.join(self.home, 'missing')}):
+            result = self.runner.invoke(ack_cmd, ['-i', '1', '-i', '2'], obj=self.obj)
+
+        self.assertEqual(result.exit_code, 0, result.stderr)
+        self.assertEqual(m.call_count, 2)
+        self.assertIn('WARNING: Progress will not be saved', result.stderr)
+
+    @requests_mock.mock()
+    def test_tag(self, m):
+        m.put(re.compile(r'http://localhost:8080/alert/\d+/tag'), json={'status': 'ok'})
+
+        result = self.runner.invoke(tag_cmd, ['-i', '1', '-i', '2', '-T', 'london'], obj=self.obj)
+
+        self.assertEqual(result.exit_code, 0, result.stderr)
+        self.assertEqual([r.json() for r in m.request_history], [{'tags': ['london']}] * 2)
+
+    def test_concurrency(self):
+        lock = threading.Lock()
+        active = [0, 0]  # current, max
+
+        def action(id):
+            with lock:
+                active[0] += 1
+                active[1] = max(active)
+            time.sleep(0.01)
+            with lock:
+                active[0] -= 1
+
+        start = time.monotonic()
+        self.assertEqual(bulk_progressbar(action, list(range(100)), 'Acking', concurrency=10), 0)
+        self.assertLess(time.monotonic() - start, 0.5)
+        self.assertEqual(active[1], 10)
+
+
+class ResumeTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmpdir)
+        self.checkpoint = os.path.join(self.tmpdir, 'tag.checkpoint')
+
+        config = Config(config_file=None)
+        self.obj = config.options
+        self.obj['client'] = Client(retry=Retry(total=0))
+        self.runner = CliRunner(mix_stderr=False)
+
+        self.ids = [f'{i:05d}' for i in range(120)]
+        self.failing = set()
+        self.tagged = []
+        self.pages_fetched = []
+
+    def alerts(self, request, context):
+        params = parse_qs(urlparse(request.url).query)
+        page, page_size = int(params['page'][0]), int(params['page-size'][0])
+        self.pages_fetched.append(page)
+        pages = -(-len(self.ids) // page_size)
+        return {'status': 'ok', 'total': len(self.ids), 'pages': pages, 'more': page < pages,
+                'alerts': [{'id': id} for id in self.ids[(page - 1) * page_size:page * page_size]]}
+
+    def tag(self, request, context):
+        id = request.path.split('/')[2]
+        if id in self.failing:
+            context.status_code = 503
+            return {'status': 'error', 'message': 'service unavailable'}
+        self.tagged.append(id)
+        return {'status': 'ok'}
+
+    def run_tag(self, *args):
+        with mock.patch.dict(os.environ, {'HOME': self.tmpdir}):
+            return self.runner.invoke(tag_cmd, ['-f', 'group=Web', '-T', 'storm'] + list(args), obj=self.obj)
+
+    @requests_mock.mock()
+    def test_resume(self, m):
+        m.get('http://localhost:8080/alerts', json=self.alerts)
+        m.get('http://localhost:8080/alerts/count', json={'status': 'ok', 'total': 120, 'severityCounts': {},
+                                                          'statusCounts': {}})
+        m.put(re.compile(r'http://localhost:8080/alert/\d+/tag'), json=self.tag)
+
+        self.failing = {'00007', '00042'}
+        result = self.run_tag()
+        self.assertEqual(result.exit_code, 1, result.stderr)
+        self.assertEqual(len(self.tagged), 118)
+        default, = glob.glob(os.path.join(self.tmpdir, '.alerta.tag.*.checkpoint'))
+        self.assertIn(f'Use --resume {default} to retry', result.stderr)
+
+        os.rename(default, self.checkpoint)
+        self.failing, self.tagged, self.pages_fetched = set(), [], []
+        result = self.run_tag('--resume', self.checkpoint)
+
+        self.assertEqual(result.exit_code, 0, result.stderr)
+        self.assertEqual(sorted(self.tagged), ['00007', '00042'])
+        self.assertEqual(self.pages_fetched, [1])  # pages 2 and 3 were done
+        self.assertFalse(os.path.exists(self.checkpoint))
+
+    @requests_mock.mock()
+    def test_resume_other_query(self, m):
+        m.get('http://localhost:8080/alerts/count', json={'status': 'ok', 'total': 0, 'severityCounts': {},
+                                                          'statusCounts': {}})
+        with open(self.checkpoint, 'w') as f:
+            f.write('{"version": 1, "command": "tag", "selection": [["group", "Database"]]}\n')
+
+        result = self.run_tag('--resume', self.checkpoint)
+        self.assertEqual(result.exit_code, 2)
+        self.assertIn('is for different alert ids or query', result.stderr)
+
+    @requests_mock.mock()
+    def test_resume_other_tags(self, m):
+        m.get('http://localhost:8080/alerts/count', json={'status': 'ok', 'total': 0, 'severityCounts': {},
+                                                          'statusCounts': {}})
+        with open(self.checkpoint, 'w') as f:
+            f.write('{"version": 1, "command": "tag", "selection": [["group", "Web"]], "args": {"tags": ["other"]}}\n')
+
+        result = self.run_tag('--resume', self.checkpoint)
+        self.assertEqual(result.exit_code, 2)
+        self.assertIn("is for different arguments: tags=['other']", result.stderr)
@@ -0,0 +1,109 @@
+import asyncio
+import unittest
+
+from alertaclient.aio import AsyncClient, aiohttp
+from alertaclient.exceptions import UnknownError, is_transient
+
+if aiohttp is not None:
+    from aiohttp import web
+
+# IsolatedAsyncioTestCase is new in Python 3.8
+AsyncioTestCase = getattr(unittest, 'IsolatedAsyncioTestCase', unittest.TestCase)
+
+
+@unittest.skipIf(aiohttp is None, 'aiohttp not installed')
+@unittest.skipIf(AsyncioTestCase is unittest.TestCase, 'requires Python 3.8 or later')
+class AsyncClientTestCase(AsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.requests = []
+
+        self.alert = {
+            'id': 'e7020428-5dad-4a41-9bfe-78e9d55cda06',
+            'resource': 'web01',
+            'event': 'HttpError',
+            'environment': 'Production',
+            'severity': 'major',
+            'service': ['Web'],
+            'status': 'open',
+            'createTime': '2017-10-03T09:12:27.283Z',
+            'receiveTime': '2017-10-03T09:12:27.289Z',
+            'lastReceiveTime': '2017-10-03T09:12:27.289Z',
+            'duplicateCount': 0,
+            'repeat': False,
+            'previousSeverity': 'indeterminate',
+            'trendIndication': 'moreSevere',
+            'history': []
+        }
+
+        async def post_alert(request):
+            self.requests.append(request)
+            body = await request.json()
+            self.assertEqual(body['resource'], 'web01')
+            return web.json_response({'status': 'ok', 'id': self.alert['id'], 'alert': self.alert})
+
+        async def get_alerts(request):
+            self.requests.append(request)
+            return web.json_response({'status': 'ok', 'alerts': [self.alert] * int(request.query['page-size'])})
+
+        async def put_action(request):
+            self.requests.append(request)
+            body = await request.json()
+            self.assertEqual(body['action'], 'ack')
+            return web.json_response({'status': 'ok'})
+
+        async def error(request):
+            return web.json_response({'status': 'error', 'message': 'not found'}, status=404)
+
+        async def bad_gateway(request):
+            return web.Response(status=502, text='<html><body>502 Bad Gateway</body></html>', content_type='text/html')
+
+        app = web.Application()
+        app.router.add_post('/alert', post_alert)
+        app.router.add_get('/alerts', get_alerts)
+        app.router.add_put('/alert/{id}/action', put_action)
+        app.router.add_get('/alert/{id}', error)
+        app.router.add_get('/alerts/count', bad_gateway)
+
+        self.runner = web.AppRunner(app)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, '127.0.0.1', 0)
+        await site.start()
+        port = self.runner.addresses[0][1]
+
+        self.client = AsyncClient(endpoint=f'http://127.0.0.1:{port}', key='demo-key')
+
+    async def asyncTearDown(self):
+        await self.client.close()
+        await self.runner.cleanup()
+
+    async def test_send_alert(self):
+        id, alert, message = await self.client.send_alert(resource='web01', event='HttpError', severity='major')
+        self.assertEqual(id, 'e7020428-5dad-4a41-9bfe-78e9d55cda06')
+        self.assertEqual(alert.resource, 'web01')
+        self.assertEqual(alert.previous_severity, 'indeterminate')
+        self.assertEqual(self.requests[0].headers['Authorization'], 'Key demo-key')
+
+    async def test_get_alerts(self):
+        query = [('environment', 'Production')]
+        alerts = await self.client.get_alerts(query, page_size=3)
+        self.assertEqual(len(alerts), 3)
+        self.assertEqual(alerts[0].event, 'HttpError')
+        self.assertEqual(self.requests[0].query['environment'], 'Production')
+        self.assertEqual(query, [('environment', 'Production')])
+
+    async def test_concurrent_actions(self):
+        results = await asyncio.gather(*[self.client.action(str(i), 'ack') for i in range(20)])
+        self.assertEqual(len(results), 20)
+        self.assertEqual(len({r.headers['X-Request-ID'] for r in self.requests}), 20)
+
+    async def test_error(self):
+        with self.assertRaises(UnknownError) as cm:
+            await self.client.get_alert('foo')
+        self.assertEqual(cm.exception.status_code, 404)
+
+    async def test_not_json(self):
+        with self.assertRaises(UnknownError) as cm:
+            await self.client.get_count()
+        self.assertEqual(str(cm.exception), '502 Bad Gateway: response is not a JSON object')
+        self.assertTrue(is_transient(cm.exception))
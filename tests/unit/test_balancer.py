@@ -0,0 +1,82 @@
+import unittest
+from unittest import mock
+
+import requests
+import requests_mock
+
+from alertaclient.api import Client
+from alertaclient.balancer import (Balancer, LatencyEWMA, LeastOutstanding,
+                                   parse_endpoints)
+from alertaclient.retry import Retry
+
+
+class BalancerTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.endpoints = ['http://api1:8080', 'http://api2:8080', 'http://api3:8080']
+
+    def test_parse_endpoints(self):
+        self.assertEqual(parse_endpoints('http://api1:8080/, http://api2:8080'), ['http://api1:8080', 'http://api2:8080'])
+        self.assertEqual(parse_endpoints(['http://api1:8080']), ['http://api1:8080'])
+
+    @mock.patch('alertaclient.api.time.sleep')
+    @requests_mock.mock()
+    def test_round_robin_failover(self, sleep, m):
+        client = Client(endpoint=','.join(self.endpoints), retry=Retry(total=2))
+        self.assertEqual(client.endpoint, 'http://api1:8080')
+
+        m.get('http://api1:8080/alerts/count', text='{"status": "ok", "total": 1, "severityCounts": {}, "statusCounts": {}}')
+        m.get('http://api2:8080/alerts/count', exc=requests.exceptions.ConnectionError)
+        m.get('http://api3:8080/alerts/count', text='{"status": "ok", "total": 3, "severityCounts": {}, "statusCounts": {}}')
+
+        totals = [client.get_count()[0] for _ in range(6)]
+        self.assertEqual(totals[:4], [1, 3, 1, 3])
+        self.assertEqual(set(totals), {1, 3})
+
+        balancer = client.http.balancer
+        self.assertEqual(balancer.nodes[1].failures, 3)
+        self.assertFalse(balancer.nodes[1].healthy)
+        self.assertEqual([n.url for n in balancer.healthy_nodes], ['http://api1:8080', 'http://api3:8080'])
+
+    def test_readmit_after_probe(self):
+        probes = []
+        balancer = Balancer(self.endpoints, max_failures=1, eject_time=30, probe=lambda url: probes.append(url) or True)
+        node = balancer.acquire()
+        balancer.release(node, failed=True)
+        self.assertFalse(node.healthy)
+
+        balancer._probe(node)
+        self.assertTrue(node.healthy)
+        self.assertEqual(probes, ['http://api1:8080/management/status'])
+
+        balancer.probe = lambda url: False
+        balancer.release(balancer.acquire(), failed=True)
+        balancer._probe(balancer.nodes[1])
+        self.assertFalse(balancer.nodes[1].healthy)
+
+    def test_least_outstanding(self):
+        balancer = Balancer(self.endpoints, strategy='least-outstanding')
+        self.assertIsInstance(balancer.strategy, LeastOutstanding)
+        nodes = [balancer.acquire() for _ in range(3)]
+        self.assertEqual(sorted(n.url for n in nodes), self.endpoints)
+        balancer.release(nodes[0])
+        self.assertIs(balancer.acquire(), nodes[0])
+
+    def test_ewma(self):
+        balancer = Balancer(self.endpoints, strategy='ewma')
+        self.assertIsInstance(balancer.strategy, LatencyEWMA)
+        for node, latency in zip(balancer.nodes, [0.05, 0.01, 0.2]):
+            node.outstanding += 1
+            balancer.release(node, latency=latency)
+        self.assertEqual(balancer.acquire().url, 'http://api2:8080')
+
+    def test_all_ejected(self):
+        balancer = Balancer(self.endpoints[:2], max_failures=1)
+        for _ in range(2):
+            balancer.release(balancer.acquire(), failed=True)
+        self.assertEqual(balancer.healthy_nodes, [])
+        self.assertEqual(balancer.acquire().url, 'http://api1:8080')
+
+    def test_unknown_strategy(self):
+        with self.assertRaises(ValueError):
+            Balancer(self.endpoints, strategy='random')
@@ -0,0 +1,91 @@
+import json
+import threading
+import time
+import unittest
+
+import requests_mock
+
+from alertaclient.api import Client
+from alertaclient.bulk import imap_ordered
+from alertaclient.exceptions import UnknownError
+from alertaclient.models.alert import Alert
+
+
+class BulkTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.client = Client()
+
+    def callback(self, request, context):
+        body = json.loads(request.body)
+        if body['event'] == 'bad':
+            context.status_code = 400
+            return {'status': 'error', 'message': 'bad event'}
+        context.status_code = 201
+        id = 'id-' + body['resource']
+        return {'status': 'ok', 'id': id, 'alert': dict(body, id=id, status='open', repeat=False)}
+
+    @requests_mock.mock()
+    def test_send_alerts(self, m):
+        m.post('http://localhost:8080/alert', json=self.callback)
+
+        alerts = [{'resource': f'web{i}', 'event': 'node_down', 'environment': 'Production'} for i in range(48)]
+        alerts[7]['event'] = 'bad'
+        alerts.append(Alert(resource='web48', event='node_up', environment='Production', tags=['london']))
+
+        results = self.client.send_alerts(iter(alerts), concurrency=4)
+
+        self.assertEqual(len(results), 49)
+        self.assertEqual([r.index for r in results], list(range(49)))
+        self.assertEqual([r.id for r in results if r.ok], [f'id-web{i}' for i in range(49) if i != 7])
+        self.assertIs(results[0].item, alerts[0])
+        self.assertEqual(results[0].alert.resource, 'web0')
+        self.assertEqual(results[48].alert.event, 'node_up')
+        self.assertEqual(results[48].alert.tags, ['london'])
+
+        self.assertEqual(len(results.errors), 1)
+        self.assertIsInstance(results[7].error, UnknownError)
+        self.assertEqual(str(results[7].error), 'bad event')
+
+        stats = results.stats.serialize()
+        self.assertEqual(stats['total'], 49)
+        self.assertEqual(stats['succeeded'], 48)
+        self.assertEqual(stats['failed'], 1)
+        self.assertGreater(stats['rate'], 0)
+        self.assertGreaterEqual(stats['latency']['max'], stats['latency']['p50'])
+
+    def test_imap_ordered(self):
+        lock = threading.Lock()
+        in_flight = [0, 0]  # current, max
+
+        def double(i):
+            with lock:
+                in_flight[0] += 1
+                in_flight[1] = max(in_flight)
+            time.sleep(0.001 * (i % 5))  # complete out of order
+            with lock:
+                in_flight[0] -= 1
+            if i == 3:
+                raise ValueError(i)
+            return i * 2
+
+        results = list(imap_ordered(double, range(40), concurrency=4))
+        self.assertEqual([r[0] for r in results], list(range(40)))
+        self.assertEqual([r[1] for r in results if r[2] is None], [i * 2 for i in range(40) if i != 3])
+        self.assertIsInstance(results[3][2], ValueError)
+        self.assertLessEqual(in_flight[1], 4)
+        self.assertGreater(in_flight[1], 1)
+
+    def test_imap_ordered_is_lazy(self):
+        consumed = []
+
+        def items():
+            for i in range(100):
+                consumed.append(i)
+                yield i
+
+        results = imap_ordered(lambda i: i * 2, items(), concurrency=3)
+        self.assertEqual(next(results)[1], 0)
+        self.assertLessEqual(len(consumed), 7)
+        results.close()
+        self.assertLess(len(consumed), 100)
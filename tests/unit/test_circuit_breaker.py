@@ -0,0 +1,77 @@
+import unittest
+from unittest import mock
+
+import requests
+import requests_mock
+
+from alertaclient.api import Client
+from alertaclient.breaker import CircuitBreaker
+from alertaclient.exceptions import CircuitOpenError, UnknownError
+from alertaclient.retry import Retry
+
+
+class CircuitBreakerTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.breaker = CircuitBreaker(failure_threshold=3, reset_timeout=30.0)
+        self.client = Client(retry=Retry(total=0), circuit_breaker=self.breaker)
+        self.transitions = []
+        self.breaker.add_listener(lambda old, new: self.transitions.append((old, new)))
+
+    @requests_mock.mock()
+    def test_open_after_consecutive_failures(self, m):
+        m.post('http://localhost:8080/heartbeat', exc=requests.exceptions.ConnectTimeout)
+
+        for _ in range(3):
+            with self.assertRaises(requests.exceptions.ConnectTimeout):
+                self.client.heartbeat(origin='app/web01')
+        self.assertEqual(self.breaker.state, CircuitBreaker.OPEN)
+        self.assertEqual(self.transitions, [('closed', 'open')])
+
+        with self.assertRaises(CircuitOpenError):
+            self.client.heartbeat(origin='app/web01')
+        self.assertEqual(m.call_count, 3)
+        self.assertEqual(self.breaker.rejected, 1)
+
+    @requests_mock.mock()
+    def test_half_open_probe(self, m):
+        m.get('http://localhost:8080/management/status', [
+            {'status_code': 503, 'text': 'Service Unavailable'},
+            {'status_code': 503, 'text': 'Service Unavailable'},
+            {'status_code': 503, 'text': 'Service Unavailable'},
+            {'status_code': 503, 'text': 'Service Unavailable'},
+            {'status_code': 200, 'text': '{"status": "ok"}'}
+        ])
+        for _ in range(3):
+            with self.assertRaises(UnknownError):
+                self.client.mgmt_status()
+        self.assertTrue(self.breaker.is_open)
+        self.assertGreater(self.breaker.retry_in, 0)
+
+        with mock.patch('alertaclient.breaker.time.monotonic', return_value=self.breaker._opened_at + 31):
+            self.assertEqual(self.breaker.state, CircuitBreaker.HALF_OPEN)
+            with self.assertRaises(UnknownError):
+                self.client.mgmt_status()  # failed probe
+            self.assertEqual(self.breaker.state, CircuitBreaker.OPEN)
+
+        with mock.patch('alertaclient.breaker.time.monotonic', return_value=self.breaker._opened_at + 31):
+            self.assertEqual(self.client.mgmt_status()['status'], 'ok')
+            self.assertEqual(self.breaker.state, CircuitBreaker.CLOSED)
+
+        self.assertEqual(self.transitions, [('closed', 'open'), ('half-open', 'open'), ('half-open', 'closed')])
+
+    def test_error_rate(self):
+        breaker = CircuitBreaker(failure_threshold=0, error_rate=0.5, min_requests=10)
+        for _ in range(5):
+            breaker.record_success()
+            breaker.record_failure()
+        self.assertEqual(breaker.state, CircuitBreaker.OPEN)
+        self.assertEqual(breaker.serialize()['errorRate'], 0.5)
+
+    @requests_mock.mock()
+    def test_client_errors_are_not_failures(self, m):
+        m.get('http://localhost:8080/alert/foo', status_code=404, text='{"status": "error", "message": "not found"}')
+        for _ in range(5):
+            with self.assertRaises(UnknownError):
+                self.client.get_alert('foo')
+        self.assertEqual(self.breaker.state, CircuitBreaker.CLOSED)
@@ -0,0 +1,65 @@
+import threading
+import time
+import unittest
+
+from alertaclient.coalesce import Coalescer
+
+
+class FakeClient:
+
+    def __init__(self):
+        self.alerts = []
+        self.lock = threading.Lock()
+
+    def send_alert(self, resource, event, **kwargs):
+        with self.lock:
+            self.alerts.append(dict(kwargs, resource=resource, event=event))
+        return resource
+
+
+class CoalescerTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.client = FakeClient()
+
+    def test_coalesce(self):
+        with Coalescer(self.client, window=0.2, merge_attribute='merged') as coalescer:
+            self.assertEqual(coalescer.send_alert('web01', 'cpu', environment='Production', severity='major', value='91%'), 'web01')
+            for i in range(92, 100):
+                self.assertIsNone(coalescer.send_alert('web01', 'cpu', environment='Production', severity='major',
+                                                       value=f'{i}%', text=f'cpu {i}%'))
+            coalescer.send_alert('web01', 'cpu', environment='Production', severity='critical', value='100%')
+            coalescer.send_alert('web02', 'cpu', environment='Production', severity='major', value='95%')
+            self.assertEqual(len(self.client.alerts), 3)
+
+            time.sleep(0.3)
+            self.assertEqual(len(self.client.alerts), 4)
+            latest = self.client.alerts[3]
+            self.assertEqual((latest['severity'], latest['value'], latest['text']), ('major', '99%', 'cpu 99%'))
+            self.assertEqual(latest['attributes'], {'merged': 8})
+
+            # a trailing send starts a new window, which expires if there are no more repeats
+            self.assertIsNone(coalescer.send_alert('web01', 'cpu', environment='Production', severity='major', value='50%'))
+            time.sleep(0.5)
+            self.assertEqual(len(self.client.alerts), 5)
+            self.assertEqual(self.client.alerts[4]['attributes'], {'merged': 1})
+            self.assertEqual(coalescer.serialize(), {'keys': 0, 'received': 12, 'sent': 5, 'merged': 9, 'evicted': 0})
+
+    def test_lru_eviction(self):
+        coalescer = Coalescer(self.client, window=60, max_keys=2)
+        coalescer.send_alert('web01', 'cpu')
+        coalescer.send_alert('web01', 'cpu', value='latest')
+        coalescer.send_alert('web02', 'cpu')
+        coalescer.send_alert('web01', 'cpu', value='newer')  # web01 is now most recently used
+        coalescer.send_alert('web03', 'cpu')
+        self.assertEqual(coalescer.evicted, 1)
+        self.assertEqual([a['resource'] for a in self.client.alerts], ['web01', 'web02', 'web03'])
+
+        coalescer.send_alert('web04', 'cpu')  # evicts web01, sending its merged alert
+        self.assertEqual(self.client.alerts[3]['value'], 'newer')
+        self.assertEqual(coalescer.serialize()['keys'], 2)
+
+        coalescer.send_alert('web04', 'cpu', value='pending')
+        coalescer.close()
+        self.assertEqual(self.client.alerts[-1]['value'], 'pending')
+        self.assertEqual(coalescer.serialize()['sent'], 6)
@@ -0,0 +1,168 @@
+import json
+import os
+import tempfile
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from socketserver import ThreadingMixIn
+from unittest import mock
+
+from click.testing import CliRunner
+
+from alertaclient.api import Client
+from alertaclient.bulk import imap_ordered
+from alertaclient.commands.cmd_ack import cli as ack_cmd
+from alertaclient.concurrency import AdaptiveLimiter
+from alertaclient.config import Config
+from alertaclient.exceptions import UnknownError
+
+
+class AdaptiveLimiterTestCase(unittest.TestCase):
+
+    def complete(self, limiter, n, latency=0.01, error=None):
+        for _ in range(n):
+            limiter.release(limiter.acquire(), latency, error)
+
+    def test_slow_start(self):
+        limiter = AdaptiveLimiter(initial=4, max_limit=20)
+        self.complete(limiter, 10)
+        self.assertEqual(limiter.current, 14)
+        self.complete(limiter, 10)
+        self.assertEqual(limiter.current, 20)
+        self.assertEqual(limiter.in_flight, 0)
+
+    def test_decrease_on_overload(self):
+        limiter = AdaptiveLimiter(initial=16)
+        self.complete(limiter, 1, error=UnknownError('Service Unavailable', status_code=503))
+        self.assertEqual(limiter.current, 8)
+        self.complete(limiter, 1, error=UnknownError('Too Many Requests', status_code=429))
+        self.assertEqual(limiter.current, 4)
+        self.assertEqual(limiter.overloads, 2)
+
+        # after a decrease the limit grows by about one per round of requests
+        self.complete(limiter, 4)
+        self.assertEqual(limiter.current, 4)
+        self.complete(limiter, 1)
+        self.assertEqual(limiter.current, 5)
+
+    def test_client_errors_do_not_decrease(self):
+        limiter = AdaptiveLimiter(initial=8)
+        self.complete(limiter, 5, error=UnknownError('Not Found', status_code=404))
+        self.assertEqual(limiter.current, 8)
+        self.assertEqual(limiter.decreases, 0)
+
+    def test_decrease_once_per_round(self):
+        limiter = AdaptiveLimiter(initial=16)
+        starts = [limiter.acquire() for _ in range(10)]
+        for start in starts:
+            limiter.release(start, 0.01, UnknownError('Bad Gateway', status_code=502))
+        self.assertEqual(limiter.current, 8)
+        self.assertEqual(limiter.decreases, 1)
+
+    def test_decrease_on_latency_spike(self):
+        limiter = AdaptiveLimiter(initial=8, max_limit=8)
+        self.complete(limiter, 20, latency=0.01)
+        self.assertEqual(limiter.current, 8)
+        self.complete(limiter, 2, latency=0.05)
+        self.assertEqual(limiter.current, 4)
+        self.assertEqual(limiter.spikes, 1)
+
+    def test_latency_at_min_limit(self):
+        limiter = AdaptiveLimiter(initial=2, min_limit=2, max_limit=2)
+        self.complete(limiter, 20, latency=0.01)
+        self.complete(limiter, 20, latency=0.05)
+        self.assertEqual(limiter.spikes, 0)
+        self.assertEqual(limiter.current, 2)
+
+    def test_min_limit(self):
+        limiter = AdaptiveLimiter(initial=4, min_limit=2)
+        for _ in range(5):
+            self.complete(limiter, 1, error=UnknownError('Service Unavailable', status_code=503))
+        self.assertEqual(limiter.current, 2)
+
+    def test_cancelled(self):
+        limiter = AdaptiveLimiter(initial=4)
+        limiter.acquire()
+        limiter.release()
+        self.assertEqual(limiter.serialize()['inFlight'], 0)
+        self.assertEqual(limiter.current, 4)
+
+    def test_imap_ordered(self):
+        limiter = AdaptiveLimiter(initial=2, max_limit=16)
+        lock = threading.Lock()
+        active = [0, 0]  # current, max
+
+        def call(i):
+            with lock:
+                active[0] += 1
+                active[1] = max(active)
+            time.sleep(0.005)
+            with lock:
+                active[0] -= 1
+            if i == 100:
+                raise UnknownError('Service Unavailable', status_code=503)
+            return i
+
+        results = list(imap_ordered(call, range(200), concurrency=limiter))
+
+        self.assertEqual([r[0] for r in results], list(range(200)))
+        self.assertEqual(limiter.overloads, 1)
+        self.assertGreater(active[1], 2)
+        self.assertLessEqual(active[1], 16)
+        self.assertEqual(limiter.in_flight, 0)
+
+
+class ThreadingHTTPServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+
+class ActionHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+
+    def do_PUT(self):
+        self.rfile.read(int(self.headers['Content-Length']))
+        with self.server.lock:
+            self.server.connections.add(self.client_address)
+        time.sleep(0.002)
+        body = json.dumps({'status': 'ok'}).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class ConcurrencyOptionTestCase(unittest.TestCase):
+
+    def setUp(self):
+        config = Config(config_file=None)
+        self.obj = config.options
+        self.obj['client'] = Client()
+        self.runner = CliRunner(mix_stderr=False)
+
+    def test_invalid(self):
+        for value in ('none', '0'):
+            result = self.runner.invoke(ack_cmd, ['-i', '1', '-c', value], obj=self.obj)
+            self.assertEqual(result.exit_code, 2)
+            self.assertIn('Invalid value for', result.stderr)
+
+    def test_auto_reuses_pooled_connections(self):
+        server = ThreadingHTTPServer(('127.0.0.1', 0), ActionHandler)
+        server.lock = threading.Lock()
+        server.connections = set()
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+
+        self.obj['client'] = Client(endpoint='http://127.0.0.1:{}'.format(server.server_address[1]), pool_maxsize=6)
+        ids = sum((['-i', f'{i:05d}'] for i in range(300)), [])
+        with tempfile.TemporaryDirectory() as home, mock.patch.dict(os.environ, {'HOME': home}):
+            result = self.runner.invoke(ack_cmd, ids + ['-c', 'auto'], obj=self.obj)
+
+        self.assertEqual(result.exit_code, 0, result.stderr)
+        self.assertLessEqual(len(server.connections), 6)
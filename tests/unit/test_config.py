@@ -54,6 +54,9 @@ class CommandsTestCase(unittest.TestCase):
                 ALERTA_DEFAULT_PROFILE='test-profile',
                 ALERTA_ENDPOINT='http://foo/bar/baz',
                 ALERTA_API_KEY='test-key',
+                ALERTA_POOL_MAXSIZE='50',
+                ALERTA_POOL_BLOCK='yes',
+                ALERTA_KEEPALIVE='60',
                 REQUESTS_CA_BUNDLE='',
                 CLICOLOR='',
                 DEBUG='1'
@@ -76,3 +79,8 @@ class CommandsTestCase(unittest.TestCase):
 
             # api key
             self.assertEqual(config.options['key'], 'test-key')
+
+            # connection pool
+            self.assertEqual(config.options['pool_maxsize'], '50')
+            self.assertEqual(config.options['pool_block'], True)
+            self.assertEqual(config.options['keepalive'], '60')
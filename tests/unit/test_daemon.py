@@ -0,0 +1,80 @@
+import threading
+import time
+import unittest
+
+from alertaclient.daemon import HeartbeatDaemon
+from alertaclient.retry import Retry
+
+
+class HeartbeatDaemonTestCase(unittest.TestCase):
+
+    def start(self, daemon):
+        thread = threading.Thread(target=daemon.run, daemon=True)
+        thread.start()
+        self.addCleanup(thread.join, 5)
+        self.addCleanup(daemon.stop)
+        return thread
+
+    def test_no_drift(self):
+        sends = []
+
+        def send():
+            sends.append(time.monotonic())
+            time.sleep(0.02)  # a slow send must not delay the next one
+
+        daemon = HeartbeatDaemon(send, interval=0.05)
+        self.start(daemon)
+        time.sleep(0.52)
+        daemon.stop()
+
+        self.assertGreaterEqual(len(sends), 10)
+        self.assertAlmostEqual(sends[-1] - sends[0], (len(sends) - 1) * 0.05, delta=0.03)
+        self.assertEqual((daemon.failed, daemon.skipped), (0, 0))
+
+    def test_skip_missed(self):
+        daemon = HeartbeatDaemon(lambda: time.sleep(0.12), interval=0.05)
+        self.start(daemon)
+        time.sleep(0.3)
+        daemon.stop()
+
+        self.assertGreater(daemon.skipped, 0)
+
+    def test_backoff(self):
+        sends = []
+        errors = []
+
+        def send():
+            sends.append(time.monotonic())
+            if len(sends) <= 3:
+                raise ConnectionError('connection refused')
+
+        daemon = HeartbeatDaemon(send, interval=10, backoff=Retry(backoff_factor=0.02, jitter=False),
+                                 on_error=lambda e, delay: errors.append(delay))
+        self.start(daemon)
+        time.sleep(0.3)
+
+        self.assertEqual((daemon.sent, daemon.failed, daemon.failures), (1, 3, 0))
+        self.assertEqual([round(d, 2) for d in errors], [0.02, 0.04, 0.08])
+        self.assertGreaterEqual(sends[3] - sends[0], 0.14)
+
+    def test_backoff_until_next_send(self):
+        daemon = HeartbeatDaemon(lambda: 1 / 0, interval=0.1, backoff=Retry(backoff_factor=1.0, jitter=False))
+        self.start(daemon)
+        time.sleep(0.35)
+        daemon.stop()
+
+        self.assertEqual(daemon.failed, 4)  # never waits past the next scheduled send
+
+    def test_reload(self):
+        reloaded = threading.Event()
+        daemon = HeartbeatDaemon(lambda: None, interval=10, on_reload=reloaded.set)
+        thread = self.start(daemon)
+        time.sleep(0.05)
+        daemon.reload()
+
+        self.assertTrue(reloaded.wait(1))
+        daemon.stop()
+        thread.join(1)
+        self.assertFalse(thread.is_alive())
+        self.assertEqual(daemon.serialize()['reloads'], 1)
+        self.assertEqual(daemon.sent, 1)
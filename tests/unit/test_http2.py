@@ -0,0 +1,64 @@
+import json
+import unittest
+from unittest import mock
+
+from alertaclient.api import Client
+from alertaclient.retry import Retry
+from alertaclient.transport import Http2Session, httpx
+
+
+@unittest.skipIf(httpx is None, 'httpx not installed')
+class Http2TestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.requests = []
+        self.failures = 0
+
+        def handler(request):
+            self.requests.append(request)
+            if request.url.path == '/heartbeat' and self.failures:
+                self.failures -= 1
+                raise httpx.ConnectError('connection refused')
+            if request.url.path == '/heartbeat':
+                body = json.loads(request.content)
+                return httpx.Response(201, json={'status': 'ok', 'heartbeat': {
+                    'id': '4a0b87cd-9786-48f8-9994-59a9209ff0b2', 'origin': body['origin'], 'timeout': body['timeout'],
+                    'createTime': '2017-10-02T23:54:05.214Z', 'receiveTime': '2017-10-02T23:54:05.214Z'}})
+            return httpx.Response(200, json={'status': 'ok', 'alerts': [], 'page': request.url.params.get('page')})
+
+        self.transport = httpx.MockTransport(handler)
+
+    def client(self, **kwargs):
+        client = Client(endpoint='https://api.alerta.io', http2=True, **kwargs)
+        self.assertIsInstance(client.http.session, Http2Session)
+        client.http.session.client = httpx.Client(transport=self.transport)
+        return client
+
+    def test_api_key(self):
+        client = self.client(key='demo-key')
+        r = client.http.get('/alerts', [('status', 'open')], page=2)
+        self.assertEqual(r['page'], '2')
+        self.assertEqual(str(self.requests[0].url), 'https://api.alerta.io/alerts?status=open&page=2')
+        self.assertEqual(self.requests[0].headers['Authorization'], 'Key demo-key')
+
+    def test_hawk(self):
+        client = self.client(key='demo-key', secret='secret')
+        client.heartbeat(origin='app/web01', timeout=10)
+        auth = self.requests[0].headers['Authorization']
+        self.assertTrue(auth.startswith('Hawk '))
+        self.assertIn('id="demo-key"', auth)
+
+    def test_basic_auth(self):
+        client = self.client(username='admin', password='alerta')
+        client.get_alerts()
+        self.assertEqual(self.requests[0].headers['Authorization'], 'Basic YWRtaW46YWxlcnRh')
+
+    @mock.patch('alertaclient.api.time.sleep')
+    def test_retry_connection_error(self, sleep):
+        client = self.client(token='demo-token', retry=Retry(total=2))
+        self.failures = 2
+        hb = client.heartbeat(origin='app/web01', timeout=10)
+        self.assertEqual(hb.origin, 'app/web01')
+        self.assertEqual(len(self.requests), 3)
+        self.assertEqual(self.requests[2].headers['Authorization'], 'Bearer demo-token')
+        self.assertEqual(client.http.retry_stats.reasons, {'ConnectionError': 2})
@@ -1,3 +1,6 @@
+import gzip
+import json
+import socket
 import unittest
 
 import requests_mock
@@ -45,3 +48,31 @@ class HttpClientTestCase(unittest.TestCase):
 
         self.http.delete(path='/delete')
         self.assertEqual(history[10].url, 'https://httpbin.org/delete')
+
+    def test_connection_pool(self):
+        http = HTTPClient(endpoint='https://httpbin.org', pool_connections=4, pool_maxsize=32, pool_block=True, keepalive=60)
+
+        adapter = http.session.get_adapter('https://httpbin.org')
+        self.assertEqual(adapter.poolmanager.connection_pool_kw['maxsize'], 32)
+        self.assertEqual(adapter.poolmanager.connection_pool_kw['block'], True)
+        self.assertIn((socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1), adapter.poolmanager.connection_pool_kw['socket_options'])
+        self.assertIs(http.session.get_adapter('http://localhost:8080'), adapter)
+
+    @requests_mock.mock()
+    def test_compression(self, m):
+        http = HTTPClient(endpoint='https://httpbin.org', compression=True, compression_threshold=1024)
+
+        m.post('https://httpbin.org/alert', text='{"status": "ok"}')
+        m.get('https://httpbin.org/alerts', content=gzip.compress(b'{"status": "ok", "alerts": []}'),
+              headers={'Content-Encoding': 'gzip'})
+
+        http.post('/alert', data={'rawData': 'x' * 100})
+        http.post('/alert', data={'rawData': 'x' * 10000})
+        r = http.get('/alerts')
+
+        history = m.request_history
+        self.assertNotIn('Content-Encoding', history[0].headers)
+        self.assertEqual(history[1].headers['Content-Encoding'], 'gzip')
+        self.assertEqual(json.loads(gzip.decompress(history[1].body))['rawData'], 'x' * 10000)
+        self.assertIn('gzip', history[2].headers['Accept-Encoding'])
+        self.assertEqual(r['alerts'], [])
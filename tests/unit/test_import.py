@@ -0,0 +1,141 @@
+import gzip
+import itertools
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+import requests_mock
+from click.testing import CliRunner
+
+from alertaclient.api import Client
+from alertaclient.commands.cmd_import import cli as import_cmd
+from alertaclient.commands.cmd_import import default_checkpoint
+from alertaclient.config import Config
+from alertaclient.retry import Retry
+
+
+class ImportTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        config = Config(config_file=None)
+        self.obj = config.options
+        self.obj['client'] = Client(retry=Retry(total=0))
+        self.runner = CliRunner(mix_stderr=False)
+        self.received = []
+
+        # default checkpoint files are written to the home directory
+        patcher = mock.patch.dict(os.environ, {'HOME': self.tmpdir})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def callback(self, request, context):
+        body = json.loads(request.body)
+        self.received.append(body)
+        context.status_code = 201
+        return {'status': 'ok', 'id': body['resource'], 'alert': dict(body, id=body['resource'])}
+
+    def write(self, name, content):
+        path = os.path.join(self.tmpdir, name)
+        opener = gzip.open if name.endswith('.gz') else open
+        with opener(path, 'wt') as f:
+            f.write(content)
+        return path
+
+    @requests_mock.mock()
+    def test_import_ndjson_gzip(self, m):
+        m.post('http://localhost:8080/alert', json=self.callback)
+        lines = [json.dumps({'host': f'web{i:02d}', 'event': 'node_down', 'rawData': 'trap'}) for i in range(25)]
+        lines[3] = '{bad json'
+        path = self.write('alerts.ndjson.gz', '\n'.join(lines) + '\n')
+
+        result = self.runner.invoke(import_cmd, ['--map', 'resource=host', '-c', '4', path], obj=self.obj)
+
+        self.assertEqual(result.exit_code, 1, result.stderr)
+        self.assertIn('ERROR: record 4:', result.stderr)
+        self.assertIn('24 alerts imported, 1 failed', result.stdout)
+        self.assertEqual(sorted(a['resource'] for a in self.received), [f'web{i:02d}' for i in range(25) if i != 3])
+        self.assertEqual(self.received[0]['rawData'], 'trap')
+        self.assertFalse(os.path.exists(default_checkpoint(path)))
+
+    @requests_mock.mock()
+    def test_import_csv(self, m):
+        m.post('http://localhost:8080/alert', json=self.callback)
+        path = self.write('alerts.csv', (
+            'resource,event,severity,tags,timeout,attributes.region\n'
+            'web01,node_down,major,"london, linux",3600,EU\n'
+            'web02,node_up,normal,,,US\n'
+        ))
+
+        result = self.runner.invoke(import_cmd, [path], obj=self.obj)
+
+        self.assertEqual(result.exit_code, 0, result.stderr)
+        self.assertEqual(len(self.received), 2)
+        web01, web02 = sorted(self.received, key=lambda a: a['resource'])
+        self.assertEqual(web01['tags'], ['london', 'linux'])
+        self.assertEqual(web01['timeout'], 3600)
+        self.assertEqual(web01['attributes'], {'region': 'EU'})
+        self.assertEqual((web02['severity'], web02['tags'], web02['timeout']), ('normal', [], None))
+
+    @requests_mock.mock()
+    def test_import_json_resume(self, m):
+        m.post('http://localhost:8080/alert', json=self.callback)
+        path = self.write('alerts.json', json.dumps([{'resource': f'web0{i}', 'event': 'node_down'} for i in range(5)]))
+        with open(default_checkpoint(path), 'w') as f:
+            f.write('3')
+
+        result = self.runner.invoke(import_cmd, ['--format', 'json', '--resume', path], obj=self.obj)
+
+        self.assertEqual(result.exit_code, 0, result.stderr)
+        self.assertEqual(sorted(a['resource'] for a in self.received), ['web03', 'web04'])
+
+    @requests_mock.mock()
+    def test_import_csv_resume(self, m):
+        m.post('http://localhost:8080/alert', json=self.callback)
+        header = 'resource,event\n'
+        rows = [f'web0{i},node_down\n' for i in range(5)]
+        path = self.write('alerts.csv', header + ''.join(rows))
+        checkpoint = os.path.join(self.tmpdir, 'import.checkpoint')
+        with open(checkpoint, 'w') as f:
+            f.write(str(len(header) + len(rows[0]) + len(rows[1])))
+
+        result = self.runner.invoke(import_cmd, ['--checkpoint', checkpoint, '--resume', path], obj=self.obj)
+
+        self.assertEqual(result.exit_code, 0, result.stderr)
+        self.assertEqual(sorted(a['resource'] for a in self.received), ['web02', 'web03', 'web04'])
+        self.assertFalse(os.path.exists(checkpoint))
+
+    @requests_mock.mock()
+    def test_checkpoint_not_writable(self, m):
+        m.post('http://localhost:8080/alert', json=self.callback)
+        path = self.write('alerts.ndjson', ''.join(json.dumps({'resource': f'web{i:02d}', 'event': 'node_down'}) + '\n'
+                                                   for i in range(20)))
+        checkpoint = os.path.join(self.tmpdir, 'missing', 'import.checkpoint')
+
+        clock = itertools.count(step=0.5)  # a checkpoint is due after every record
+        with mock.patch('alertaclient.commands.cmd_import.time.perf_counter', lambda: next(clock)):
+            result = self.runner.invoke(import_cmd, ['--checkpoint', checkpoint, '-c', '1', path], obj=self.obj)
+
+        self.assertEqual(result.exit_code, 0, result.stderr)
+        self.assertEqual(result.stderr.count('WARNING: Progress will not be saved'), 1)
+        self.assertEqual(len(self.received), 20)
+
+    @requests_mock.mock()
+    def test_interrupted(self, m):
+        def interrupt(request, context):
+            raise KeyboardInterrupt
+        m.post('http://localhost:8080/alert', json=interrupt)
+        path = self.write('alerts.ndjson', json.dumps({'resource': 'web01', 'event': 'node_down'}) + '\n')
+        checkpoint = os.path.join(self.tmpdir, 'missing', 'import.checkpoint')
+
+        result = self.runner.invoke(import_cmd, ['--checkpoint', checkpoint, path], obj=self.obj)
+
+        self.assertEqual(result.exit_code, 1)
+        self.assertNotIsInstance(result.exception, OSError)  # not from saving the checkpoint again
+        self.assertNotIn('Use --resume', result.stderr)
@@ -0,0 +1,47 @@
+import json
+import unittest
+from datetime import datetime, timedelta
+
+from alertaclient.utils import (CustomJsonEncoder, JsonCodec, OrjsonCodec,
+                                get_json_codec, orjson)
+
+
+class JsonCodecTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.data = {
+            'resource': 'web01',
+            'event': 'HttpError',
+            'service': ['Web', 'Ñetwork'],
+            'attributes': {'region': 'EU', 'nested': {'empty': [], 'none': None}},
+            'createTime': datetime(2021, 4, 18, 12, 30, 45, 123456),
+            'timeout': timedelta(hours=2),
+            'value': 3.5,
+            'rawData': 'line1\nline2'
+        }
+        self.codecs = [JsonCodec()]
+        if orjson is not None:
+            self.codecs.append(OrjsonCodec())
+
+    def test_datetime_encoding(self):
+        for codec in self.codecs:
+            decoded = codec.loads(codec.encode(self.data))
+            self.assertEqual(decoded['createTime'], '2021-04-18T12:30:45.123Z', codec.name)
+            self.assertEqual(decoded['timeout'], 7200, codec.name)
+            self.assertEqual(decoded, json.loads(json.dumps(self.data, cls=CustomJsonEncoder)), codec.name)
+
+    def test_pretty_output(self):
+        expected = json.dumps(self.data, cls=CustomJsonEncoder, sort_keys=True, indent=4, ensure_ascii=False)
+        for codec in self.codecs:
+            self.assertEqual(codec.dumps(self.data, sort_keys=True, indent=4), expected, codec.name)
+
+    def test_fallback(self):
+        for codec in self.codecs:
+            self.assertEqual(codec.loads(codec.encode({'big': 2 ** 70})), {'big': 2 ** 70}, codec.name)
+            with self.assertRaises(TypeError):
+                codec.encode({'obj': object()})
+
+    def test_get_json_codec(self):
+        self.assertIsInstance(get_json_codec('json'), JsonCodec)
+        with self.assertRaises(ValueError):
+            get_json_codec('yaml')
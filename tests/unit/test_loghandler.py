@@ -0,0 +1,112 @@
+import logging
+import threading
+import time
+import unittest
+from unittest import mock
+
+from alertaclient.loghandler import AlertaLogHandler
+
+
+class FakeClient:
+
+    def __init__(self, block=None):
+        self.alerts = []
+        self.block = block
+
+    def send_alert(self, resource, event, **kwargs):
+        if self.block:
+            self.block.wait()
+        self.alerts.append(dict(kwargs, resource=resource, event=event))
+
+
+class AlertaLogHandlerTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.client = FakeClient()
+        self.logger = logging.getLogger('myapp.db')
+        self.logger.propagate = False
+        self.addCleanup(setattr, self.logger, 'propagate', True)
+
+    def add_handler(self, handler):
+        self.logger.addHandler(handler)
+        self.addCleanup(self.logger.removeHandler, handler)
+        self.addCleanup(handler.close)
+        return handler
+
+    def test_send_record(self):
+        handler = self.add_handler(AlertaLogHandler(self.client, resource='db01', environment='Production',
+                                                    service=['Database'], attributes={'region': 'EU'}))
+        self.logger.info('not sent')
+        try:
+            1 / 0
+        except ZeroDivisionError:
+            self.logger.exception('Query failed for %s', 'users')
+        self.logger.critical('Disk full', extra={'alerta': {'event': 'DiskFull', 'value': '100%'}})
+        self.assertTrue(handler.flush(timeout=2))
+
+        disk_full, query_failed = sorted(self.client.alerts, key=lambda a: a['event'])
+        self.assertEqual((disk_full['resource'], disk_full['severity'], disk_full['value']), ('db01', 'critical', '100%'))
+        self.assertEqual((query_failed['event'], query_failed['severity']), ('myapp.db', 'major'))
+        self.assertEqual(query_failed['text'], 'Query failed for users')
+        self.assertEqual(query_failed['environment'], 'Production')
+        self.assertEqual(query_failed['service'], ['Database'])
+        self.assertEqual(query_failed['attributes']['region'], 'EU')
+        self.assertEqual(query_failed['attributes']['function'], 'test_send_record')
+        self.assertIn('ZeroDivisionError', query_failed['raw_data'])
+        self.assertEqual(query_failed['origin'], 'python/db01')
+
+    def test_repeats_merged(self):
+        handler = self.add_handler(AlertaLogHandler(self.client, window=60))
+        for i in range(50):
+            self.logger.warning('Slow query took %dms', 100 + i)
+        handler.flush(timeout=2)
+
+        self.assertEqual(len(self.client.alerts), 2)
+        first, latest = self.client.alerts
+        self.assertEqual(first['text'], 'Slow query took 100ms')
+        self.assertEqual(latest['text'], 'Slow query took 149ms')
+        self.assertEqual(latest['attributes']['repeats'], 49)
+
+    def test_never_blocks(self):
+        block = threading.Event()
+        self.addCleanup(block.set)
+        handler = self.add_handler(AlertaLogHandler(FakeClient(block), window=0, maxsize=10, batch_size=1))
+
+        start = time.monotonic()
+        for i in range(200):
+            self.logger.error('Request %d failed', i, extra={'alerta': {'resource': f'web{i}'}})
+        self.assertLess(time.monotonic() - start, 1.0)
+        self.assertGreater(handler.sender.dropped, 0)
+
+        block.set()
+        handler.close()
+        with mock.patch.object(logging, 'raiseExceptions', False):
+            self.logger.error('after close')  # reported by handleError, not raised
+
+    def test_close_when_api_down(self):
+        block = threading.Event()
+        self.addCleanup(block.set)
+        handler = self.add_handler(AlertaLogHandler(FakeClient(block), window=0, shutdown_timeout=0.1))
+        for i in range(100):
+            self.logger.error('Request %d failed', i, extra={'alerta': {'resource': f'web{i}'}})
+
+        start = time.monotonic()
+        self.assertFalse(handler.flush())
+        handler.close()
+        self.assertLess(time.monotonic() - start, 1.0)
+
+        # the batch being sent is dropped once the request in flight returns
+        block.set()
+        handler.sender._workers[0].join(2)
+        self.assertEqual(handler.sender.sent + handler.sender.dropped, 100)
+        self.assertEqual(handler.sender.sent, 1)
+
+    def test_ignore_own_records(self):
+        handler = AlertaLogHandler(self.client)
+        self.addCleanup(handler.close)
+        logging.getLogger('alerta.client').addHandler(handler)
+        self.addCleanup(logging.getLogger('alerta.client').removeHandler, handler)
+
+        logging.getLogger('alerta.client').error('Failed to send alert')
+        handler.flush(timeout=2)
+        self.assertEqual(self.client.alerts, [])
@@ -0,0 +1,59 @@
+import unittest
+
+import requests_mock
+
+from alertaclient.api import Client
+from alertaclient.exceptions import UnknownError
+from alertaclient.metrics import (HistogramCollector, LatencyHistogram,
+                                  path_template)
+
+
+class MetricsTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.client = Client()
+
+    def test_path_template(self):
+        self.assertEqual(path_template('/alert/d1340d76-2277-4d47-937f-571bc1da6411/action'), '/alert/{id}/action')
+        self.assertEqual(path_template('/alert/d1340d76/note/7a1f2b3c-7e3c-4d2f-9a57-5e2f2a1b8c9d'), '/alert/{id}/note/{id}')
+        self.assertEqual(path_template('/key/NGLxwf3f4-8LlYN4qLjVEagUPsysn0kb9fAkAs1l'), '/key/{id}')
+        self.assertEqual(path_template('/alerts/top10/count?page=1'), '/alerts/top10/count')
+        self.assertEqual(path_template('/management/status'), '/management/status')
+
+    def test_histogram(self):
+        h = LatencyHistogram()
+        for ms in range(1, 101):
+            h.record(ms / 1000)
+        self.assertEqual(h.count, 100)
+        self.assertAlmostEqual(h.percentile(50), 0.050, delta=0.050 * 0.05)
+        self.assertAlmostEqual(h.percentile(95), 0.095, delta=0.095 * 0.05)
+        self.assertAlmostEqual(h.percentile(99), 0.099, delta=0.099 * 0.05)
+        self.assertEqual(h.percentile(100), 0.1)
+
+    @requests_mock.mock()
+    def test_hooks(self, m):
+        m.put('http://localhost:8080/alert/d1340d76/action', text='{"status": "ok"}')
+        m.put('http://localhost:8080/alert/7a1f2b3c/action', text='{"status": "error", "message": "not found"}')
+
+        events = []
+        self.client.http.hooks.add('before_request', lambda info: events.append(('before', info.endpoint)))
+        self.client.http.hooks.add('after_response', lambda info: events.append(('after', info.status, info.bytes_sent > 0)))
+        self.client.http.hooks.add('on_error', lambda info: events.append(('error', str(info.error))))
+        self.client.http.hooks.add('after_response', lambda info: 1 / 0)  # ignored
+        collector = self.client.http.hooks.register(HistogramCollector())
+
+        self.client.action('d1340d76', 'ack')
+        with self.assertRaises(UnknownError):
+            self.client.action('7a1f2b3c', 'ack')
+
+        self.assertEqual(events, [
+            ('before', 'PUT /alert/{id}/action'),
+            ('after', 200, True),
+            ('before', 'PUT /alert/{id}/action'),
+            ('error', 'not found')
+        ])
+        report = collector.report()
+        self.assertEqual(report[0]['endpoint'], 'PUT /alert/{id}/action')
+        self.assertEqual(report[0]['count'], 2)
+        self.assertEqual(report[0]['errors'], 1)
+        self.assertIn('PUT /alert/{id}/action', collector.format())
@@ -0,0 +1,172 @@
+import os
+import re
+import tempfile
+import threading
+import time
+import unittest
+from unittest import mock
+from urllib.parse import parse_qs, urlparse
+
+import requests_mock
+from click.testing import CliRunner
+
+from alertaclient.api import Client
+from alertaclient.commands.cmd_close import cli as close_cmd
+from alertaclient.config import Config
+from alertaclient.pager import Pager
+
+
+class FakeAlerts:
+    """Open alerts, paged like the Alerta API. Closing an alert removes it from the results."""
+
+    def __init__(self, n):
+        self.open = [f'{i:05d}' for i in range(n)]
+        self.pages_fetched = []
+
+    def alerts(self, request, context):
+        params = parse_qs(urlparse(request.url).query)
+        page, page_size = int(params['page'][0]), int(params['page-size'][0])
+        self.pages_fetched.append(page)
+        items = self.open[(page - 1) * page_size:page * page_size]
+        pages = -(-len(self.open) // page_size)
+        return {
+            'status': 'ok',
+            'alerts': [{'id': id, 'resource': f'web{id}', 'event': 'node_down'} for id in items],
+            'total': len(self.open),
+            'page': page,
+            'pageSize': page_size,
+            'pages': pages,
+            'more': page < pages
+        }
+
+    def count(self, request, context):
+        return {'status': 'ok', 'total': len(self.open), 'severityCounts': {}, 'statusCounts': {}}
+
+    def close(self, request, context):
+        self.open.remove(request.path.split('/')[2])
+        return {'status': 'ok'}
+
+
+class PagingTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.client = Client()
+        self.fake = FakeAlerts(120)
+
+    @requests_mock.mock()
+    def test_iter_alerts(self, m):
+        m.get('http://localhost:8080/alerts', json=self.fake.alerts)
+
+        alerts = self.client.iter_alerts(page_size=50)
+        self.assertEqual(next(alerts).id, '00000')
+        self.assertEqual(self.fake.pages_fetched, [1])  # lazy
+        self.assertEqual([a.id for a in alerts], self.fake.open[1:])
+        self.assertEqual(self.fake.pages_fetched, [1, 2, 3])
+
+    @requests_mock.mock()
+    def test_iter_alerts_reverse(self, m):
+        m.get('http://localhost:8080/alerts', json=self.fake.alerts)
+
+        ids = [a.id for a in self.client.iter_alerts(page_size=50, read_ahead=True, reverse=True)]
+        self.assertEqual(self.fake.pages_fetched, [1, 3, 2])
+        self.assertEqual(ids, self.fake.open[100:] + self.fake.open[50:100] + self.fake.open[:50])
+
+    @requests_mock.mock()
+    def test_iter_without_more(self, m):
+        history = [{'id': f'h{i}', 'resource': 'web01', 'event': 'node_down'} for i in range(100)]
+
+        def callback(request, context):
+            params = parse_qs(urlparse(request.url).query)
+            page, page_size = int(params['page'][0]), int(params['page-size'][0])
+            return {'status': 'ok', 'history': history[(page - 1) * page_size:page * page_size]}
+
+        m.get('http://localhost:8080/alerts/history', json=callback)
+        self.assertEqual(len(list(self.client.iter_history(page_size=25))), 100)
+        self.assertEqual(m.call_count, 5)  # last page is empty
+
+        # a server that does not page heartbeats returns all of them every time
+        heartbeats = [{'id': f'hb{i}', 'origin': f'app/web{i}'} for i in range(80)]
+        m.get('http://localhost:8080/heartbeats', json={'status': 'ok', 'heartbeats': heartbeats, 'total': 80})
+        self.assertEqual(len(list(self.client.iter_heartbeats(page_size=50))), 80)
+
+    @requests_mock.mock()
+    def test_server_ignores_page(self, m):
+        heartbeats = [{'id': f'hb{i}', 'origin': f'app/web{i}'} for i in range(50)]
+        m.get('http://localhost:8080/heartbeats', json={'status': 'ok', 'heartbeats': heartbeats, 'total': 50})
+        self.assertEqual(len(list(self.client.iter_heartbeats(page_size=50))), 50)
+        self.assertEqual(m.call_count, 1)
+
+        # total is the whole result set but every page is the first
+        m.get('http://localhost:8080/heartbeats', json={'status': 'ok', 'heartbeats': heartbeats, 'total': 500})
+        for reverse in (False, True):
+            pager = Pager(self.client.http, '/heartbeats', 'heartbeats', page_size=50, prefetch=2, reverse=reverse)
+            self.assertEqual([hb for page in pager for hb in page], heartbeats)
+            self.assertLessEqual(pager.requests, 4)
+
+    @requests_mock.mock()
+    def test_close_all_pages(self, m):
+        m.get('http://localhost:8080/alerts', json=self.fake.alerts)
+        m.get('http://localhost:8080/alerts/count', json=self.fake.count)
+        m.put(re.compile(r'http://localhost:8080/alert/\d+/action'), json=self.fake.close)
+
+        obj = Config(config_file=None).options
+        obj['client'] = self.client
+        with tempfile.TemporaryDirectory() as home, mock.patch.dict(os.environ, {'HOME': home}):
+            result = CliRunner().invoke(close_cmd, ['--filter', 'status=open'], obj=obj)
+
+        self.assertEqual(result.exit_code, 0, result.output)
+        self.assertEqual(self.fake.open, [])  # not just the first page
+
+
+class FakeHTTPClient:
+
+    DEFAULT_PAGE_SIZE = 50
+
+    def __init__(self, total, latency=0.02, report_pages=True):
+        self.items = list(range(total))
+        self.latency = latency
+        self.report_pages = report_pages
+        self.lock = threading.Lock()
+        self.active = self.max_active = 0
+
+    def get(self, path, query=None, page=1, page_size=None):
+        with self.lock:
+            self.active += 1
+            self.max_active = max(self.active, self.max_active)
+        time.sleep(self.latency)
+        with self.lock:
+            self.active -= 1
+        r = {'status': 'ok', 'items': self.items[(page - 1) * page_size:page * page_size]}
+        if self.report_pages:
+            r['pages'] = -(-len(self.items) // page_size)
+        return r
+
+
+class PagerTestCase(unittest.TestCase):
+
+    def test_prefetch(self):
+        http = FakeHTTPClient(total=1000, latency=0.02)
+        pager = Pager(http, '/items', 'items', page_size=50, prefetch=4)
+
+        start = time.monotonic()
+        items = [i for page in pager for i in page]
+        self.assertLess(time.monotonic() - start, 20 * 0.02 / 2)
+        self.assertEqual(items, http.items)
+        self.assertEqual(http.max_active, 4)
+        self.assertEqual((pager.requests, pager.wasted), (20, 0))  # never past the last page
+
+    def test_prefetch_stops_at_short_page(self):
+        http = FakeHTTPClient(total=520, latency=0.01, report_pages=False)
+        pager = Pager(http, '/items', 'items', page_size=50, prefetch=4)
+
+        self.assertEqual([i for page in pager for i in page], http.items)
+        self.assertEqual(http.active, 0)
+        self.assertLessEqual(pager.wasted, 4)
+        self.assertEqual(pager.requests, 11 + pager.wasted)
+
+    def test_single_page(self):
+        http = FakeHTTPClient(total=30)
+        pager = Pager(http, '/items', 'items', page_size=50, prefetch=8)
+
+        self.assertEqual(list(pager), [http.items])
+        self.assertEqual(pager.requests, 1)
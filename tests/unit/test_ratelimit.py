@@ -0,0 +1,93 @@
+import unittest
+from unittest import mock
+
+import requests_mock
+
+from alertaclient.api import Client
+from alertaclient.ratelimit import RateLimiter, TokenBucket
+
+
+class FakeClock:
+    """Stands in for the time module: sleep() advances monotonic() without waiting."""
+
+    def __init__(self, now=100.0):
+        self.now = now
+        self.slept = []
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.slept.append(seconds)
+        self.now += seconds
+
+
+class TokenBucketTestCase(unittest.TestCase):
+
+    @mock.patch('alertaclient.ratelimit.time')
+    def test_bucket(self, mock_time):
+        mock_time.monotonic.return_value = 100.0
+        bucket = TokenBucket(rate=10, burst=3)
+
+        self.assertEqual([bucket.reserve() for _ in range(3)], [0.0, 0.0, 0.0])
+        self.assertAlmostEqual(bucket.reserve(), 0.1)
+        self.assertAlmostEqual(bucket.reserve(), 0.2)  # waiting callers queue up
+        self.assertAlmostEqual(bucket.tokens, -2.0)
+        self.assertAlmostEqual(bucket.wait_time, 0.3)
+
+        mock_time.monotonic.return_value = 101.0
+        self.assertAlmostEqual(bucket.tokens, 3.0)  # never more than burst
+        self.assertEqual(bucket.wait_time, 0.0)
+
+        stats = bucket.serialize()
+        self.assertEqual((stats['acquired'], stats['throttled']), (5, 2))
+        self.assertAlmostEqual(stats['waited'], 0.3)
+
+    def test_smooths_bursts(self):
+        clock = FakeClock()
+        with mock.patch('alertaclient.ratelimit.time', clock):
+            bucket = TokenBucket(rate=100, burst=5)
+            waits = [bucket.acquire() for _ in range(15)]
+        self.assertAlmostEqual(clock.now - 100.0, 0.1)
+        self.assertEqual(waits[:5], [0.0] * 5)
+        self.assertEqual([round(w, 6) for w in waits[5:]], [0.01] * 10)
+
+
+class RateLimiterTestCase(unittest.TestCase):
+
+    @requests_mock.mock()
+    def test_client_rate_limit(self, m):
+        m.post('http://localhost:8080/heartbeat', status_code=201, json={'status': 'ok', 'heartbeat': {
+            'id': '4a0b87cd-9786-48f8-9994-59a9209ff0b2', 'origin': 'app/web01', 'createTime': '2017-10-02T23:54:05.214Z',
+            'receiveTime': '2017-10-02T23:54:05.214Z'}})
+        m.get('http://localhost:8080/alerts', json={'status': 'ok', 'alerts': [], 'total': 0})
+
+        clock = FakeClock()
+        throttled = []
+        with mock.patch('alertaclient.ratelimit.time', clock):
+            client = Client(rate_limit=RateLimiter(write=20, burst=1))
+            client.http.hooks.add('after_response', lambda info: throttled.append(info.timings['throttle']))
+
+            for _ in range(10):
+                client.get_alerts()
+            self.assertEqual(throttled, [0.0] * 10)  # reads are unlimited
+            self.assertEqual(clock.slept, [])
+
+            for _ in range(4):
+                client.heartbeat(origin='app/web01')
+        self.assertEqual(throttled[10], 0.0)
+        self.assertEqual([round(t, 6) for t in throttled[11:]], [0.05] * 3)
+        self.assertEqual([round(t, 6) for t in clock.slept], [0.05] * 3)
+
+        stats = client.http.rate_limiter.serialize()
+        self.assertEqual(list(stats), ['write'])
+        self.assertEqual(stats['write']['acquired'], 4)
+        self.assertEqual(stats['write']['throttled'], 3)
+
+    def test_from_value(self):
+        self.assertIsNone(RateLimiter.from_value(None))
+        limiter = RateLimiter.from_value(5)
+        self.assertEqual(limiter.buckets['read'].rate, 5.0)
+        self.assertEqual(limiter.buckets['write'].burst, 5.0)
+        self.assertFalse(RateLimiter())
+        self.assertEqual(RateLimiter.operation('put'), 'write')
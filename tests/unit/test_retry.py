@@ -0,0 +1,93 @@
+import unittest
+from unittest import mock
+
+import requests
+import requests_mock
+
+from alertaclient.api import Client
+from alertaclient.exceptions import UnknownError
+from alertaclient.retry import Retry
+
+
+class RetryTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.client = Client(retry=Retry(total=3, backoff_factor=0.1, jitter=False))
+
+        self.alert = """
+            {
+              "alert": {
+                "event": "node_down",
+                "id": "d1340d76-2277-4d47-937f-571bc1da6411",
+                "resource": "net01",
+                "status": "open"
+              },
+              "id": "d1340d76-2277-4d47-937f-571bc1da6411",
+              "status": "ok"
+            }
+        """
+        self.bad_gateway = '<html><body><h1>502 Bad Gateway</h1></body></html>'
+
+    @mock.patch('alertaclient.api.time.sleep')
+    @requests_mock.mock()
+    def test_retry_idempotent(self, sleep, m):
+        m.put('http://localhost:8080/alert/foo/action', [
+            {'status_code': 503, 'text': self.bad_gateway},
+            {'status_code': 502, 'text': self.bad_gateway},
+            {'status_code': 200, 'text': '{"status": "ok"}'}
+        ])
+        r = self.client.action('foo', 'ack')
+        self.assertEqual(r['status'], 'ok')
+        self.assertEqual(m.call_count, 3)
+        self.assertEqual([c.args[0] for c in sleep.call_args_list], [0.1, 0.2])
+
+        stats = self.client.http.retry_stats.serialize()
+        self.assertEqual(stats['retries'], 2)
+        self.assertEqual(stats['retriedRequests'], 1)
+        self.assertEqual(stats['reasons'], {'503': 1, '502': 1})
+
+    @mock.patch('alertaclient.api.time.sleep')
+    @requests_mock.mock()
+    def test_retry_exhausted(self, sleep, m):
+        m.get('http://localhost:8080/alerts', status_code=502, text=self.bad_gateway)
+        with self.assertRaises(UnknownError) as e:
+            self.client.get_alerts()
+        self.assertIn('502', str(e.exception))
+        self.assertEqual(m.call_count, 4)
+        self.assertEqual(self.client.http.retry_stats.exhausted, 1)
+
+    @mock.patch('alertaclient.api.time.sleep')
+    @requests_mock.mock()
+    def test_no_retry_post(self, sleep, m):
+        m.post('http://localhost:8080/blackout', status_code=503, text=self.bad_gateway)
+        with self.assertRaises(UnknownError):
+            self.client.create_blackout(environment='Production')
+        self.assertEqual(m.call_count, 1)
+        sleep.assert_not_called()
+
+    @mock.patch('alertaclient.api.time.sleep')
+    @requests_mock.mock()
+    def test_send_alert_opt_in(self, sleep, m):
+        m.post('http://localhost:8080/alert', [
+            {'exc': requests.exceptions.ConnectionError},
+            {'status_code': 429, 'headers': {'Retry-After': '2'}, 'text': '{}'},
+            {'status_code': 201, 'text': self.alert}
+        ])
+        id, alert, message = self.client.send_alert(resource='net01', event='node_down')
+        self.assertEqual(alert.resource, 'net01')
+        self.assertEqual([c.args[0] for c in sleep.call_args_list], [0.1, 2.0])
+        self.assertEqual(self.client.http.retry_stats.reasons, {'ConnectionError': 1, '429': 1})
+
+    @mock.patch('alertaclient.api.time.sleep')
+    @requests_mock.mock()
+    def test_retry_after_too_long(self, sleep, m):
+        m.get('http://localhost:8080/alerts/count', status_code=503, headers={'Retry-After': '3600'}, text=self.bad_gateway)
+        with self.assertRaises(UnknownError):
+            self.client.get_count()
+        self.assertEqual(m.call_count, 1)
+
+    def test_backoff(self):
+        retry = Retry(backoff_factor=0.5, backoff_max=3.0, jitter=False)
+        self.assertEqual([retry.backoff(n) for n in range(5)], [0.5, 1.0, 2.0, 3.0, 3.0])
+        retry = Retry(backoff_factor=0.5, backoff_max=3.0, jitter=True)
+        self.assertTrue(all(0 <= retry.backoff(n) <= 3.0 for n in range(10)))
@@ -0,0 +1,90 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+import requests
+import requests_mock
+from click.testing import CliRunner
+
+from alertaclient.api import Client
+from alertaclient.commands.cmd_send import cli as send_cmd
+from alertaclient.config import Config
+from alertaclient.retry import Retry
+from alertaclient.spool import Spool
+
+
+class SendTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        config = Config(config_file=None, config_override={'spool_file': ''})
+        self.obj = config.options
+        self.obj['client'] = Client(retry=Retry(total=0))
+        self.runner = CliRunner(env={'TERM': 'xterm'}, mix_stderr=False)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def callback(self, request, context):
+        body = json.loads(request.body)
+        if body['event'] == 'bad':
+            context.status_code = 400
+            return {'status': 'error', 'message': 'invalid event'}
+        context.status_code = 201
+        return {'status': 'ok', 'id': body['resource'], 'alert': dict(body, id=body['resource'], repeat=False,
+                                                                      previousSeverity='normal')}
+
+    @requests_mock.mock()
+    def test_send_stdin(self, m):
+        m.post('http://localhost:8080/alert', json=self.callback)
+
+        lines = [json.dumps({'resource': f'web{i:02d}', 'event': 'bad' if i == 5 else 'node_down',
+                             'severity': 'major'}) for i in range(30)]
+        lines.insert(10, '{not json')
+        lines.insert(20, '')
+        failed_file = os.path.join(self.tmpdir, 'failed.json')
+
+        result = self.runner.invoke(send_cmd, ['--concurrency', '4', '--failed-file', failed_file],
+                                    input='\n'.join(lines) + '\n', obj=self.obj)
+
+        self.assertEqual(result.exit_code, 1, result.stderr)
+        output = result.stdout.splitlines()
+        self.assertEqual(output, [f'web{i:02d} (normal -> major)' for i in range(30) if i != 5])
+        self.assertIn('ERROR: line 6: invalid event', result.stderr)
+        self.assertIn('ERROR: line 11: JSON parse failure', result.stderr)
+        self.assertIn('29 alerts sent, 2 failed in', result.stderr)
+        self.assertIn('alerts/s, p95 latency', result.stderr)
+
+        with open(failed_file) as f:
+            self.assertEqual(f.read().splitlines(), [lines[5], '{not json'])
+
+    @requests_mock.mock()
+    def test_send_stdin_ok(self, m):
+        m.post('http://localhost:8080/alert', json=self.callback)
+        result = self.runner.invoke(send_cmd, input='{"resource": "web01", "event": "node_down"}\n', obj=self.obj)
+        self.assertEqual(result.exit_code, 0, result.stderr)
+        self.assertEqual(result.stdout, 'web01 (normal -> None)\n')
+
+    @requests_mock.mock()
+    def test_send_stdin_spool(self, m):
+        self.obj['spool_file'] = os.path.join(self.tmpdir, 'missing', 'spool')  # cannot be created
+        m.post('http://localhost:8080/alert', json=self.callback)
+        result = self.runner.invoke(send_cmd, input='{"resource": "web01", "event": "node_down"}\n', obj=self.obj)
+        self.assertEqual(result.exit_code, 0, result.stderr)
+
+        failed_file = os.path.join(self.tmpdir, 'failed.json')
+        m.post('http://localhost:8080/alert', exc=requests.exceptions.ConnectionError)
+        result = self.runner.invoke(send_cmd, ['--failed-file', failed_file],
+                                    input='{"resource": "web01", "event": "node_down"}\n' * 2, obj=self.obj)
+        self.assertEqual(result.exit_code, 1)
+        self.assertEqual(result.stderr.count('Alerts not spooled'), 1)
+        with open(failed_file) as f:
+            self.assertEqual(len(f.read().splitlines()), 2)
+
+        self.obj['spool_file'] = os.path.join(self.tmpdir, 'alerta.spool')
+        result = self.runner.invoke(send_cmd, input='{"resource": "web01", "event": "node_down"}\n', obj=self.obj)
+        self.assertEqual(result.exit_code, 1)
+        with Spool(self.obj['spool_file']) as spool:
+            self.assertEqual(len(spool), 1)
@@ -0,0 +1,125 @@
+import threading
+import time
+import unittest
+
+from alertaclient.sender import BufferedSender
+
+
+class FakeClient:
+
+    def __init__(self):
+        self.alerts = []
+        self.lock = threading.Lock()
+
+    def send_alert(self, resource, event, **kwargs):
+        if event == 'slow':
+            time.sleep(0.1)
+        if event == 'fail':
+            raise ConnectionError('connection refused')
+        with self.lock:
+            self.alerts.append((resource, event, kwargs.get('severity')))
+
+
+class BufferedSenderTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.client = FakeClient()
+
+    def wait_for(self, predicate, timeout=2.0):
+        deadline = time.monotonic() + timeout
+        while not predicate() and time.monotonic() < deadline:
+            time.sleep(0.005)
+        return predicate()
+
+    @staticmethod
+    def take(sender, n=10):
+        with sender._lock:
+            return [a['resource'] for a in sender._take(n)]
+
+    def test_flush_on_size(self):
+        with BufferedSender(self.client, batch_size=5, flush_interval=60) as sender:
+            for i in range(4):
+                sender.send_alert(f'web{i}', 'node_down')
+            time.sleep(0.05)
+            self.assertEqual(self.client.alerts, [])
+            self.assertEqual(sender.queued, 4)
+            sender.send_alert('web4', 'node_down')
+            self.assertTrue(self.wait_for(lambda: len(self.client.alerts) == 5))
+
+    def test_flush_on_interval(self):
+        with BufferedSender(self.client, batch_size=100, flush_interval=0.05, workers=1) as sender:
+            sender.send_alert('web01', 'node_down')
+            sender.send_alert('web02', 'node_down')
+            self.assertTrue(self.wait_for(lambda: len(self.client.alerts) == 2))
+            self.assertEqual([a[0] for a in self.client.alerts], ['web01', 'web02'])
+
+    def test_flush_and_close(self):
+        sender = BufferedSender(self.client, batch_size=100, flush_interval=60)
+        sender.send_alert('web01', 'node_down')
+        self.assertTrue(sender.flush(timeout=2))
+        self.assertEqual(len(self.client.alerts), 1)
+
+        sender.send_alert('web02', 'node_down')
+        sender.close()
+        self.assertEqual(len(self.client.alerts), 2)
+        self.assertEqual(sender.serialize()['sent'], 2)
+        with self.assertRaises(RuntimeError):
+            sender.send_alert('web03', 'node_down')
+
+    def test_drop_oldest(self):
+        sender = BufferedSender(self.client, maxsize=3, workers=0, policy='drop_oldest')
+        for i in range(5):
+            self.assertTrue(sender.send_alert(f'web{i}', 'node_down', severity='minor' if i else 'critical'))
+        self.assertEqual(sender.queued, 3)
+        self.assertEqual(sender.dropped, 2)
+        self.assertEqual(self.take(sender), ['web2', 'web3', 'web4'])
+
+    def test_drop_lowest_severity(self):
+        sender = BufferedSender(self.client, maxsize=3, workers=0, policy='drop_lowest_severity')
+        sender.send_alert('web01', 'node_down', severity='critical')
+        sender.send_alert('web02', 'node_down', severity='warning')
+        sender.send_alert('web03', 'node_down', severity='major')
+        self.assertFalse(sender.send_alert('web04', 'node_down', severity='informational'))
+        self.assertTrue(sender.send_alert('web05', 'node_down', severity='minor'))
+        self.assertTrue(sender.send_alert('web06', 'node_down', severity='critical'))
+        self.assertEqual(sender.dropped, 3)
+        self.assertEqual(self.take(sender), ['web01', 'web03', 'web06'])
+
+    def test_block(self):
+        sender = BufferedSender(self.client, maxsize=2, workers=0, policy='block', block_timeout=0.05)
+        self.assertTrue(sender.send_alert('web01', 'node_down'))
+        self.assertTrue(sender.send_alert('web02', 'node_down'))
+        start = time.monotonic()
+        self.assertFalse(sender.send_alert('web03', 'node_down'))
+        self.assertGreaterEqual(time.monotonic() - start, 0.05)
+
+        sender.block_timeout = 5
+        threading.Timer(0.05, self.take, args=(sender, 1)).start()
+        self.assertTrue(sender.send_alert('web04', 'node_down'))
+        self.assertEqual(sender.serialize()['dropped'], 1)
+
+    def test_errors(self):
+        errors = []
+        with BufferedSender(self.client, on_error=lambda alert, e: errors.append((alert['resource'], e))) as sender:
+            sender.send_alert('web01', 'fail')
+            sender.send_alert('web02', 'node_down')
+        self.assertEqual(sender.failed, 1)
+        self.assertEqual(sender.sent, 1)
+        self.assertEqual(errors[0][0], 'web01')
+        self.assertIsInstance(errors[0][1], ConnectionError)
+
+    def test_close_timeout(self):
+        errors = []
+        sender = BufferedSender(self.client, batch_size=5, workers=1, shutdown_timeout=0.05,
+                                on_error=lambda alert, e: errors.append(e))
+        for i in range(20):
+            sender.send_alert(f'web{i:02d}', 'slow')
+
+        start = time.monotonic()
+        sender._close_at_exit()
+        self.assertLess(time.monotonic() - start, 0.5)
+        self.assertTrue(self.wait_for(lambda: sender.serialize()['inFlight'] == 0))
+        self.assertEqual(sender.sent + sender.dropped, 20)
+        self.assertGreaterEqual(sender.dropped, 15)
+        self.assertEqual(len(errors), sender.dropped)
+        self.assertIsInstance(errors[0], TimeoutError)
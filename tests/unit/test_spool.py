@@ -0,0 +1,136 @@
+import json
+import os
+import shutil
+import tempfile
+import time
+import unittest
+from datetime import datetime
+
+import requests
+import requests_mock
+from click.testing import CliRunner
+
+from alertaclient.api import Client
+from alertaclient.commands.cmd_send import cli as send_cmd
+from alertaclient.commands.cmd_spool import cli as spool_cmd
+from alertaclient.config import Config
+from alertaclient.retry import Retry
+from alertaclient.spool import Spool
+
+
+class SpoolTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmpdir, 'alerta.spool')
+        self.spool = Spool(self.path)
+        self.client = Client(retry=Retry(total=0))
+
+    def tearDown(self):
+        self.spool.close()
+        shutil.rmtree(self.tmpdir)
+
+    def callback(self, request, context):
+        body = json.loads(request.body)
+        if body['event'] == 'bad':
+            context.status_code = 400
+            return {'status': 'error', 'message': 'invalid alert'}
+        context.status_code = 201
+        return {'status': 'ok', 'id': body['resource'], 'alert': dict(body, id=body['resource'])}
+
+    def test_append(self):
+        self.spool.append({'resource': 'web01', 'event': 'node_down', 'create_time': datetime(2020, 1, 25, 12, 32, 50)})
+        self.spool.append({'resource': 'web02', 'event': 'node_down'})
+        self.assertEqual(len(self.spool), 2)
+
+        rows = self.spool.peek()
+        self.assertEqual([r[2]['resource'] for r in rows], ['web01', 'web02'])
+        self.assertEqual(rows[0][2]['create_time'], '2020-01-25T12:32:50.000Z')
+        self.assertTrue(rows[1][2]['create_time'].endswith('Z'))
+
+        # survives reopening
+        self.spool.close()
+        self.spool = Spool(self.path)
+        self.assertEqual(self.spool.status()['count'], 2)
+        self.assertEqual(self.spool.purge(), 2)
+        self.assertEqual(len(self.spool), 0)
+
+    @requests_mock.mock()
+    def test_replay(self, m):
+        m.post('http://localhost:8080/alert', json=self.callback)
+        for i in range(5):
+            self.spool.append({'resource': f'web0{i}', 'event': 'bad' if i == 2 else 'node_down',
+                               'create_time': '2020-01-25T12:32:5%d.000Z' % i})
+
+        stats = self.spool.replay(self.client, concurrency=2, max_attempts=2)
+        self.assertEqual(stats, {'sent': 4, 'failed': 1, 'rejected': 0, 'remaining': 1})
+        bodies = [r.json() for r in m.request_history]
+        self.assertEqual(sorted(b['createTime'] for b in bodies)[0], '2020-01-25T12:32:50.000Z')
+        self.assertEqual(self.spool.peek()[0][1], 1)  # attempts
+
+        stats = self.spool.replay(self.client, max_attempts=2)
+        self.assertEqual(stats, {'sent': 0, 'failed': 0, 'rejected': 1, 'remaining': 0})
+
+    @requests_mock.mock()
+    def test_replay_stops_when_api_down(self, m):
+        m.post('http://localhost:8080/alert', exc=requests.exceptions.ConnectionError)
+        for i in range(50):
+            self.spool.append({'resource': f'web{i:02d}', 'event': 'node_down'})
+
+        stats = self.spool.replay(self.client, concurrency=1)
+        self.assertEqual(stats['sent'], 0)
+        self.assertEqual(stats['remaining'], 50)
+        self.assertLess(len(m.request_history), 5)
+
+    @requests_mock.mock()
+    def test_replay_rate(self, m):
+        m.post('http://localhost:8080/alert', json=self.callback)
+        for i in range(6):
+            self.spool.append({'resource': f'web0{i}', 'event': 'node_down'})
+
+        start = time.monotonic()
+        stats = self.spool.replay(self.client, rate=50)
+        self.assertGreaterEqual(time.monotonic() - start, 0.1)
+        self.assertEqual(stats['sent'], 6)
+
+    @requests_mock.mock()
+    def test_spool_commands(self, m):
+        config = Config(config_file=None, config_override={'spool_file': self.path})
+        obj = config.options
+        obj['client'] = self.client
+        runner = CliRunner(env={'TERM': None, 'PS1': None})  # don't read alerts from stdin
+
+        m.post('http://localhost:8080/alert', exc=requests.exceptions.ConnectTimeout)
+        result = runner.invoke(send_cmd, ['-r', 'web01', '-e', 'node_down', '-E', 'Production'], obj=obj)
+        self.assertEqual(result.exit_code, 1)
+        self.assertIn('spooled', result.output)
+        self.assertEqual(len(self.spool), 1)
+
+        result = runner.invoke(spool_cmd, ['status'], obj=obj)
+        self.assertEqual(result.exit_code, 0, result.output)
+        self.assertIn('alerts: 1', result.output)
+
+        m.post('http://localhost:8080/alert', json=self.callback)
+        result = runner.invoke(spool_cmd, ['replay'], obj=obj)
+        self.assertEqual(result.exit_code, 0, result.output)
+        self.assertIn('1 sent', result.output)
+        self.assertEqual(m.last_request.json()['environment'], 'Production')
+
+        self.spool.append({'resource': 'web02', 'event': 'node_down'})
+        result = runner.invoke(spool_cmd, ['purge', '--yes'], obj=obj)
+        self.assertEqual(result.exit_code, 0, result.output)
+        self.assertEqual(len(self.spool), 0)
+
+    @requests_mock.mock()
+    def test_spool_not_writable(self, m):
+        config = Config(config_file=None, config_override={'spool_file': os.path.join(self.tmpdir, 'missing', 'spool')})
+        obj = config.options
+        obj['client'] = self.client
+        runner = CliRunner(env={'TERM': None, 'PS1': None}, mix_stderr=False)
+
+        m.post('http://localhost:8080/alert', exc=requests.exceptions.ConnectTimeout)
+        result = runner.invoke(send_cmd, ['-r', 'web01', '-e', 'node_down'], obj=obj)
+        self.assertEqual(result.exit_code, 1)
+        self.assertIsInstance(result.exception, SystemExit)  # not an sqlite3 error
+        self.assertIn('ERROR: ', result.stderr)
+        self.assertIn('Alert not spooled', result.stderr)
@@ -0,0 +1,51 @@
+import json
+import unittest
+from datetime import datetime
+
+import requests_mock
+
+from alertaclient.api import Client
+from alertaclient.template import AlertTemplate
+from alertaclient.utils import JsonCodec, get_json_codec
+
+
+class AlertTemplateTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.client = Client()
+        self.static = dict(environment='Production', service=['Web', 'Mail'], group='Network', tags=['london'],
+                           attributes={'region': 'EU'}, origin='app/web01', type='exceptionAlert', timeout=3600)
+        self.create_time = datetime(2020, 1, 2, 3, 4, 5, 678901)
+
+    @requests_mock.mock()
+    def test_same_body_as_send_alert(self, m):
+        m.post('http://localhost:8080/alert', status_code=201, json={'status': 'ok', 'id': 'abc'})
+
+        self.client.send_alert('web01', 'node_down', severity='major', value='DOWN', text='web01 is down',
+                               create_time=self.create_time, **self.static)
+        template = AlertTemplate(**self.static)
+        id, _, _ = self.client.send_alert_template(template, 'web01', 'node_down', severity='major', value='DOWN',
+                                                   text='web01 is down', create_time=self.create_time)
+
+        self.assertEqual(id, 'abc')
+        expected, actual = (json.loads(r.body) for r in m.request_history)
+        self.assertEqual(actual, expected)
+        self.assertEqual(len(actual), 18)
+        self.assertEqual(actual['createTime'], '2020-01-02T03:04:05.678Z')
+
+    def test_encode(self):
+        template = AlertTemplate(severity='warning', raw_data='trap', **self.static)
+        for codec in (JsonCodec(), get_json_codec()):
+            body = json.loads(template.encode('web01', 'cpu', value='97%', codec=codec))
+            self.assertEqual(body['severity'], 'warning')
+            self.assertEqual(body['rawData'], 'trap')
+            self.assertEqual(body['service'], ['Web', 'Mail'])
+            self.assertIsNone(body['id'])
+            datetime.strptime(body['createTime'], '%Y-%m-%dT%H:%M:%S.%fZ')
+
+            body = json.loads(template.encode('web01', 'cpu', severity='critical', text='été', codec=codec))
+            self.assertEqual((body['severity'], body['text']), ('critical', 'été'))
+
+    def test_not_static(self):
+        with self.assertRaises(ValueError):
+            AlertTemplate(resource='web01', environment='Production')
@@ -0,0 +1,109 @@
+import json
+import socketserver
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from urllib.parse import parse_qsl, urlsplit
+
+from alertaclient.api import Client
+from alertaclient.metrics import HistogramCollector
+
+try:
+    from http.server import ThreadingHTTPServer
+except ImportError:  # Python 3.6
+    class ThreadingHTTPServer(socketserver.ThreadingMixIn, HTTPServer):
+        daemon_threads = True
+
+
+class EchoHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        self.reply({
+            'status': 'ok',
+            'path': url.path,
+            'query': parse_qsl(url.query),
+            'requestId': self.headers['X-Request-ID'],
+            'authorization': self.headers['Authorization']
+        })
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        self.reply({
+            'status': 'ok',
+            'heartbeat': {
+                'id': self.headers['X-Request-ID'],
+                'origin': body['origin'],
+                'tags': body['tags'],
+                'timeout': body['timeout'],
+                'createTime': '2017-10-02T23:54:05.214Z',
+                'receiveTime': '2017-10-02T23:54:05.214Z'
+            }
+        }, status=201)
+
+    def reply(self, data, status=200):
+        body = json.dumps(data).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class ThreadSafetyTestCase(unittest.TestCase):
+
+    THREADS = 32
+    REQUESTS = 20  # per thread
+
+    def setUp(self):
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), EchoHandler)
+        self.server.daemon_threads = True
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.headers = {'X-Team': 'ops'}
+        self.client = Client(endpoint='http://127.0.0.1:%d' % self.server.server_port, key='demo-key',
+                             headers=self.headers, pool_maxsize=self.THREADS)
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_shared_client(self):
+        collector = self.client.http.hooks.register(HistogramCollector())
+        query = [('status', 'open')]
+
+        def worker(n):
+            results = []
+            for i in range(self.REQUESTS):
+                r = self.client.http.get('/alerts', query, page=n + 1, page_size=i + 1)
+                results.append((n, i, r))
+                hb = self.client.heartbeat(origin=f'worker/{n}', tags=[str(i)], timeout=n + 1)
+                results.append((n, i, hb))
+            return results
+
+        with ThreadPoolExecutor(max_workers=self.THREADS) as executor:
+            results = [r for rs in executor.map(worker, range(self.THREADS)) for r in rs]
+
+        request_ids = set()
+        for n, i, r in results:
+            if isinstance(r, dict):
+                self.assertEqual(r['query'], [['status', 'open'], ['page', str(n + 1)], ['page-size', str(i + 1)]])
+                self.assertEqual(r['authorization'], 'Key demo-key')
+                request_ids.add(r['requestId'])
+            else:
+                self.assertEqual(r.origin, f'worker/{n}')
+                self.assertEqual(r.tags, [str(i)])
+                self.assertEqual(r.timeout, n + 1)
+                request_ids.add(r.id)
+
+        total = self.THREADS * self.REQUESTS * 2
+        self.assertEqual(len(results), total)
+        self.assertEqual(len(request_ids), total)  # unique per request
+        self.assertEqual(query, [('status', 'open')])  # not mutated
+        self.assertEqual(self.headers, {'X-Team': 'ops'})
+        self.assertEqual(sum(r['count'] for r in collector.report()), total)
+        self.assertEqual(self.client.http.retry_stats.requests, total)